@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2011 - 2014 Björn Larsson
+
+# This file is part of pytvdbapi.
+#
+# pytvdbapi is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pytvdbapi is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pytvdbapi.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+.. versionadded:: 0.6
+
+The command line interface of pytvdbapi, run as ``python -m pytvdbapi``.
+
+The *prefetch* command warms the local caches by loading a list of shows
+concurrently. It reads one show per line from a file, or from stdin, where
+each line is a TVDB series id, an IMDB id (e.g. *tt0773262*) or a show name
+to search for. Empty lines and lines starting with *#* are ignored::
+
+    python -m pytvdbapi prefetch --api-key B43FF87DE395DF56 --workers 8 shows.txt
+
+The progress and a summary with the throughput and all failures are
+written to stderr. The exit status is 1 if any of the shows failed to load.
+"""
+
+from __future__ import print_function
+
+import argparse
+import logging
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+
+from pytvdbapi import error
+from pytvdbapi.__init__ import __NAME__, version
+from pytvdbapi.api import TVDB
+from pytvdbapi.cache import BoundedFileCache
+from pytvdbapi.loader import PooledLoader
+from pytvdbapi.scheduler import RequestScheduler
+from pytvdbapi.utils import concurrent_map
+
+__all__ = ['main', 'prefetch', 'read_shows', 'PrefetchResult']
+
+logger = logging.getLogger(__name__)
+
+
+class PrefetchResult(object):
+    """
+    The outcome of a :func:`prefetch` run.
+    """
+
+    def __init__(self):
+        self.loaded, self.failed = 0, list()
+        self.bytes, self.elapsed = 0, 0.0
+
+    @property
+    def rate(self):
+        """The number of shows processed per second"""
+        return (self.loaded + len(self.failed)) / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        """
+        :return: A human readable summary of the run
+        """
+        return u"Loaded {0} shows, {1} failed, in {2:.1f}s ({3:.1f} shows/s, {4:.1f} kB/s)".format(
+            self.loaded, len(self.failed), self.elapsed, self.rate,
+            self.bytes / 1024.0 / self.elapsed if self.elapsed else 0.0)
+
+
+def _id_type(line):
+    """
+    :return: The id type of the show reference *line*, *tvdb*, *imdb* or None for a show name
+    """
+    if re.match(r"^\d+$", line):
+        return 'tvdb'
+    elif re.match(r"^tt\d+$", line):
+        return 'imdb'
+    return None
+
+
+def read_shows(lines):
+    """
+    :param lines: An iterable of lines
+    :return: A list of the show references found in *lines*
+    """
+    shows = list()
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            shows.append(line)
+    return shows
+
+
+def prefetch(api, shows, language, workers=4, actors=True, banners=True, out=None):
+    """
+    :param api: The :class:`pytvdbapi.api.TVDB` instance to load the shows with
+    :param shows: A list of show references, series ids, IMDB ids or names
+    :param language: The language to load the shows in
+    :param workers: The number of shows to load concurrently
+    :param actors: If True, the actors are loaded for each show
+    :param banners: If True, the banners are loaded for each show
+    :param out: The stream to write the progress to, None to not report the progress
+    :return: A :class:`PrefetchResult`
+
+    Loads the full data of all *shows* through *api*, filling its caches.
+    """
+    result, lock = PrefetchResult(), threading.Lock()
+
+    def _count(url, elapsed, response, size, exception):  # pylint: disable=W0613
+        """Sums up the bytes loaded"""
+        with lock:
+            result.bytes += size
+
+    def _load(reference):
+        """Loads a single show, returns a tuple (reference, exception)"""
+        try:
+            id_type = _id_type(reference)
+            if id_type is None:
+                found = api.search(reference, language)
+                if len(found) == 0:
+                    raise error.TVDBNotFoundError(u"No show named {0} found".format(reference))
+                series_id, id_type = found[0].id, 'tvdb'
+            else:
+                series_id = reference
+
+            show = api.get_series(series_id, language, id_type)
+            if id_type != 'tvdb' and not show.seasons:  # Only the basic data was loaded from the server
+                show.update()
+
+            if actors:
+                show.load_actors()
+            if banners:
+                show.load_banners()
+        except error.PytvdbapiError as _error:
+            return reference, _error
+        except Exception as _error:  # pylint: disable=W0703
+            logger.exception(u"Unexpected error loading {0}".format(reference))
+            return reference, _error
+        return reference, None
+
+    api.loader.add_listener(_count)
+
+    start = time.time()
+    try:
+        loaded = concurrent_map(_load, shows, workers, ordered=False)
+        for done, (reference, exception) in enumerate(loaded, 1):
+            if exception is None:
+                result.loaded += 1
+            else:
+                result.failed.append((reference, exception))
+
+            if out is not None:
+                status = u"ok" if exception is None else u"FAILED: {0}".format(exception)
+                print(u"[{0}/{1}] {2} {3} ({4:.1f} shows/s)".format(
+                    done, len(shows), reference, status, done / max(time.time() - start, 1e-6)), file=out)
+    finally:
+        api.loader.remove_listener(_count)
+
+    result.elapsed = time.time() - start
+    return result
+
+
+def _parser():
+    """
+    :return: The :class:`argparse.ArgumentParser` for the command line
+    """
+    parser = argparse.ArgumentParser(prog="python -m {0}".format(__NAME__))
+    parser.add_argument('--version', action='version', version=version())
+    commands = parser.add_subparsers(dest='command')
+
+    command = commands.add_parser('prefetch', help="Load shows into the local caches")
+    command.add_argument('file', nargs='?', default='-',
+                         help="The file to read the shows from, one per line. Defaults to stdin.")
+    command.add_argument('--api-key', default=os.environ.get('PYTVDBAPI_API_KEY'),
+                         help="The API key to use, defaults to $PYTVDBAPI_API_KEY")
+    command.add_argument('--language', default=u"en", help="The language to load the shows in")
+    command.add_argument('--cache-dir', default=os.path.join(tempfile.gettempdir(), __NAME__),
+                         help="The cache directory to fill")
+    command.add_argument('--cache-size', type=int, default=None,
+                         help="Use a size bounded cache of this number of bytes")
+    command.add_argument('--record-cache', action='store_true', help="Also fill the parsed data cache")
+    command.add_argument('--store', default=None, help="Also fill this SQLite store")
+    command.add_argument('--workers', type=int, default=4, help="The number of shows to load concurrently")
+    command.add_argument('--rate-limit', type=float, default=None,
+                         help="The maximum number of requests per second")
+    command.add_argument('--no-actors', dest='actors', action='store_false', help="Do not load the actors")
+    command.add_argument('--no-banners', dest='banners', action='store_false', help="Do not load the banners")
+    command.add_argument('--quiet', action='store_true', help="Only report the summary")
+
+    return parser
+
+
+def main(argv=None):
+    """
+    :param argv: The command line arguments, defaults to *sys.argv*
+    :return: The exit status
+    """
+    options = _parser().parse_args(argv)
+
+    if options.command != 'prefetch':
+        _parser().print_help(sys.stderr)
+        return 2
+    elif not options.api_key:
+        print(u"An API key is required, use --api-key or set $PYTVDBAPI_API_KEY", file=sys.stderr)
+        return 2
+
+    cache = options.cache_dir
+    if options.cache_size is not None:
+        cache = BoundedFileCache(cache, max_size=options.cache_size)
+
+    scheduler = None
+    if options.rate_limit is not None:
+        scheduler = RequestScheduler(options.rate_limit, burst=options.workers)
+
+    loader = PooledLoader(cache, pool_size=options.workers, scheduler=scheduler)
+    api = TVDB(options.api_key, cache_dir=options.cache_dir, record_cache=options.record_cache,
+               store=options.store, loader=loader)
+
+    if options.file == '-':
+        shows = read_shows(sys.stdin)
+    else:
+        with open(options.file, 'r') as handle:
+            shows = read_shows(handle)
+
+    result = prefetch(api, shows, options.language, options.workers, options.actors, options.banners,
+                      out=None if options.quiet else sys.stderr)
+
+    print(result.summary(), file=sys.stderr)
+    for reference, exception in result.failed:
+        print(u"  {0}: {1}".format(reference, exception), file=sys.stderr)
+
+    return 1 if result.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,330 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2011 - 2014 Björn Larsson
+
+# This file is part of pytvdbapi.
+#
+# pytvdbapi is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pytvdbapi is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pytvdbapi.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+The implementation of :mod:`pytvdbapi.aio`, kept in a module of its own as it
+uses syntax requiring Python 3.5 or later.
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from pytvdbapi import error, tracing
+from pytvdbapi.__init__ import __NAME__
+from pytvdbapi._compat import make_unicode
+from pytvdbapi.api import TVDB, Search, SERIES_ELEMENTS, EPISODE_ELEMENTS
+from pytvdbapi.cache import BoundedFileCache
+from pytvdbapi.loader import PooledLoader
+from pytvdbapi.scheduler import Priority, RequestScheduler
+from pytvdbapi.urls import series, actors, banners
+from pytvdbapi.utils import unicode_arguments, deprecate_episode_id
+
+__all__ = ['AsyncLoader', 'AsyncTVDB']
+
+# Module logger object
+logger = logging.getLogger(__name__)
+
+
+class AsyncLoader(object):
+    """
+    :param loader: The :class:`pytvdbapi.loader.BaseLoader` to use for loading data. It has to be
+        safe to use from multiple threads, e.g. a :class:`pytvdbapi.loader.PooledLoader`.
+    :param max_workers: The maximum number of requests to run concurrently
+
+    An awaitable loader running the requests of a blocking loader in a pool of
+    worker threads. A custom asynchronous loader should provide the same
+    :func:`load` coroutine.
+    """
+
+    def __init__(self, loader, max_workers=16):
+        self.loader = loader
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    async def load(self, url, cache=True, priority=Priority.NORMAL):
+        """
+        :param url: The URL to be loaded
+        :param cache: Optional. Set if the cache should be ignored or not.
+        :param priority: Optional. The :class:`pytvdbapi.scheduler.Priority` of the request.
+        :return: A file like object representing the loaded file content
+        :raise: ConnectionError if the url could not be loaded
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            self.executor, tracing.bind(functools.partial(self.loader.load, url, cache, priority)))
+
+    async def load_validated(self, url, cache=True, priority=Priority.NORMAL):
+        """
+        :return: A tuple *(validator, data)*
+
+        The awaitable counterpart of :func:`pytvdbapi.loader.BaseLoader.load_validated`.
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            self.executor, tracing.bind(functools.partial(self.loader.load_validated, url, cache, priority)))
+
+    def close(self):
+        """
+        Shuts down the worker threads. The loader can not be used after it has been closed.
+        """
+        self.executor.shutdown(wait=True)
+
+
+class AsyncTVDB(object):
+    """
+    :param api_key: The API key to use to communicate with the server
+    :param kwargs:
+
+    The asynchronous entry point for the API. It supports the same keyword
+    arguments as :class:`pytvdbapi.api.TVDB` with the following additions and
+    changes:
+
+    * **loader** (default=None) An :class:`AsyncLoader` to use for loading data. If
+      not provided, an :class:`AsyncLoader` around a :class:`pytvdbapi.loader.PooledLoader`
+      will be created.
+
+    * **max_workers** (default=16) The maximum number of concurrent requests, used
+      when creating the default loader.
+
+    The underlying :class:`pytvdbapi.api.TVDB` instance is available through the
+    *tvdb* attribute. The :class:`pytvdbapi.api.Show` instances returned are
+    linked to it, so lazily loaded data accessed outside of the event loop is
+    loaded in a blocking manner just as before. Use :func:`update`,
+    :func:`load_actors` and :func:`load_banners` to load it without blocking.
+    """
+
+    @unicode_arguments
+    def __init__(self, api_key, **kwargs):
+        self.loader = kwargs.pop('loader', None)
+
+        if self.loader is None:
+            max_workers = kwargs.pop('max_workers', 16)
+            kwargs.setdefault('cache_dir', make_unicode(os.path.join(tempfile.gettempdir(), __NAME__)))
+            scheduler = None
+            if kwargs.get('rate_limit', None) is not None:
+                scheduler = RequestScheduler(kwargs['rate_limit'], kwargs.get('burst', 1))
+
+            cache = kwargs['cache_dir']
+            if kwargs.get('cache_size', None) is not None:
+                cache = BoundedFileCache(cache, max_size=kwargs['cache_size'])
+
+            blocking = PooledLoader(cache,
+                                    timeout=kwargs.get('timeout', None),
+                                    pool_size=max_workers,
+                                    scheduler=scheduler)
+            self.loader = AsyncLoader(blocking, max_workers=max_workers)
+        else:
+            kwargs.pop('max_workers', None)
+
+        kwargs['loader'] = self.loader.loader
+        self.tvdb = TVDB(api_key, **kwargs)
+
+    @property
+    def config(self):
+        """The configuration of the underlying :class:`pytvdbapi.api.TVDB` instance"""
+        return self.tvdb.config
+
+    async def _run(self, func, *args):  # pylint: disable=R0201
+        """
+        :return: The value returned by calling *func* with *args* in a worker thread
+
+        Used for the parsing and the store accesses, so they do not block the event loop.
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, tracing.bind(functools.partial(func, *args)))
+
+    async def _load_mirrors(self):
+        """Loads the list of mirrors, if not already loaded, without blocking the event loop"""
+        if self.tvdb._mirrors is None:  # pylint: disable=W0212
+            await self._run(lambda: self.tvdb.mirrors)
+
+    async def _load_parsed(self, url, elements, cache=True, priority=Priority.NORMAL):
+        """
+        :return: The *elements* parsed from the data loaded from *url*, see
+            :func:`pytvdbapi.api.TVDB._load_parsed`
+        """
+        data = await self.loader.load(url, cache, priority)
+        return await self._run(self.tvdb._parse, data, elements)  # pylint: disable=W0212
+
+    async def _load_records(self, url, cache=True, priority=Priority.NORMAL):
+        """
+        :return: The parsed full series data loaded from *url*, see :func:`pytvdbapi.api.TVDB._load_records`
+        """
+        if self.tvdb.record_cache is None:
+            return await self._load_parsed(url, SERIES_ELEMENTS, cache, priority)
+
+        validator, data = await self.loader.load_validated(url, cache, priority)
+        return await self._run(self.tvdb._cached_records, url, validator, data)  # pylint: disable=W0212
+
+    @unicode_arguments
+    async def search(self, show, language, cache=True):
+        """
+        :return: A :class:`pytvdbapi.api.Search` instance
+
+        The awaitable counterpart of :func:`pytvdbapi.api.TVDB.search`.
+        """
+        url = self.tvdb._search_url(show, language)  # pylint: disable=W0212
+
+        if (show, language) not in self.tvdb.search_buffer or not cache:
+            with self.tvdb.tracer.span('search', url=url):
+                data = await self._load_parsed(url, ('Series',), cache, Priority.INTERACTIVE)
+                self.tvdb._set_search(show, language, data['Series'])  # pylint: disable=W0212
+
+        return Search(self.tvdb.search_buffer[(show, language)], show, language)
+
+    @unicode_arguments
+    async def get_series(self, series_id, language, id_type='tvdb', cache=True):
+        """
+        :return: A :class:`pytvdbapi.api.Show` instance
+
+        The awaitable counterpart of :func:`pytvdbapi.api.TVDB.get_series`.
+        """
+        await self._load_mirrors()
+        url, series_id = self.tvdb._series_url(series_id, language, id_type)  # pylint: disable=W0212
+
+        with self.tvdb.tracer.span('get_series', url=url):
+            if self.tvdb.store is not None and cache:
+                show, missing = await self._run(
+                    self.tvdb._stored_show, series_id, language, id_type)  # pylint: disable=W0212
+                if show is not None:
+                    loaders = {'Actor': self.load_actors, 'Banner': self.load_banners}
+                    await asyncio.gather(*[loaders[element](show) for element in missing])
+                    return show
+
+            try:
+                data = await self._load_records(url, cache)
+            except error.TVDBNotFoundError:
+                raise error.TVDBIdError(u"Series id {0} not found".format(series_id))
+
+            if id_type == 'tvdb':
+                await self._run(self.tvdb._save_series, language, data)  # pylint: disable=W0212
+
+            show = await self._run(self.tvdb._make_show, data, language, False)  # pylint: disable=W0212
+            await self._load_extras(show)
+            return show
+
+    @unicode_arguments
+    @deprecate_episode_id
+    async def get_episode(self, language, method="id", cache=True, **kwargs):
+        """
+        :return: A :class:`pytvdbapi.api.Episode` instance
+
+        The awaitable counterpart of :func:`pytvdbapi.api.TVDB.get_episode`.
+        """
+        await self._load_mirrors()
+        url = self.tvdb._episode_url(language, method, **kwargs)  # pylint: disable=W0212
+
+        with self.tvdb.tracer.span('get_episode', url=url):
+            if self.tvdb.store is not None and cache:
+                data = await self._run(functools.partial(self.tvdb.store.load_episode, language, method,
+                                                         **kwargs))
+                if data is not None:
+                    return self.tvdb._make_episode(data)  # pylint: disable=W0212
+
+            data = await self._load_parsed(url, EPISODE_ELEMENTS, cache)
+            data = self.tvdb._parse_episode(data)  # pylint: disable=W0212
+            await self._run(self.tvdb._save_episode, language, data)  # pylint: disable=W0212
+            return self.tvdb._make_episode(data)  # pylint: disable=W0212
+
+    @unicode_arguments
+    async def get_episode_by_air_date(self, series_id, language, air_date, cache=True):
+        """
+        :return: A :class:`pytvdbapi.api.Episode` instance
+
+        The awaitable counterpart of :func:`pytvdbapi.api.TVDB.get_episode_by_air_date`.
+        """
+        await self._load_mirrors()
+        url = self.tvdb._air_date_url(series_id, language, air_date)  # pylint: disable=W0212
+
+        with self.tvdb.tracer.span('get_episode_by_air_date', url=url):
+            if self.tvdb.store is not None and cache:
+                data = await self._run(
+                    self.tvdb.store.load_episode_by_air_date, series_id, language, air_date)
+                if data is not None:
+                    return self.tvdb._make_episode(data)  # pylint: disable=W0212
+
+            data = await self._load_parsed(url, EPISODE_ELEMENTS, cache)
+            data = self.tvdb._parse_episode(data, check_error=True)  # pylint: disable=W0212
+            await self._run(self.tvdb._save_episode, language, data)  # pylint: disable=W0212
+            return self.tvdb._make_episode(data)  # pylint: disable=W0212
+
+    async def update(self, show):
+        """
+        :param show: The :class:`pytvdbapi.api.Show` to update
+
+        The awaitable counterpart of :func:`pytvdbapi.api.Show.update`, loading the full
+        data set for *show*.
+        """
+        await self._load_mirrors()
+        url = show._url(series)  # pylint: disable=W0212
+
+        with self.tvdb.tracer.span('populate_data', url=url, seriesid=show.id):
+            data = await self._load_records(url)
+            await self._run(self.tvdb._save_series, show.lang, data)  # pylint: disable=W0212
+
+            await self._run(show._set_data, data)  # pylint: disable=W0212
+            await self._load_extras(show)
+
+    async def load_actors(self, show):
+        """
+        :param show: The :class:`pytvdbapi.api.Show` to load the actors for
+
+        The awaitable counterpart of :func:`pytvdbapi.api.Show.load_actors`.
+        """
+        await self._load_mirrors()
+        url = show._url(actors)  # pylint: disable=W0212
+
+        with self.tvdb.tracer.span('load_actors', url=url):
+            data = (await self._load_parsed(url, ('Actor',)))['Actor']
+            await self._run(self.tvdb._save_extras, show.id, 'Actor', data)  # pylint: disable=W0212
+            show._set_actors(data)  # pylint: disable=W0212
+
+    async def load_banners(self, show):
+        """
+        :param show: The :class:`pytvdbapi.api.Show` to load the banners for
+
+        The awaitable counterpart of :func:`pytvdbapi.api.Show.load_banners`.
+        """
+        await self._load_mirrors()
+        url = show._url(banners)  # pylint: disable=W0212
+
+        with self.tvdb.tracer.span('load_banners', url=url):
+            data = (await self._load_parsed(url, ('Banner',)))['Banner']
+            await self._run(self.tvdb._save_extras, show.id, 'Banner', data)  # pylint: disable=W0212
+            show._set_banners(data)  # pylint: disable=W0212
+
+    async def _load_extras(self, show):
+        """Concurrently loads the actors and banners for *show* if configured to do so"""
+        pending = list()
+        if self.config.get('actors', False):
+            pending.append(self.load_actors(show))
+        if self.config.get('banners', False):
+            pending.append(self.load_banners(show))
+
+        if pending:
+            await asyncio.gather(*pending)
+
+    def close(self):
+        """
+        Releases the resources held by the loader.
+        """
+        self.loader.close()
@@ -27,8 +27,10 @@ with a shared code base. Strongly inspired/copied by the approach taken by werkz
 # pylint: skip-file
 
 import sys
+from collections import MutableMapping
 
-__all__ = ['implements_to_string', 'make_unicode', 'make_bytes', 'text_type', 'string_types']
+__all__ = ['implements_to_string', 'make_unicode', 'make_bytes', 'text_type', 'string_types',
+           'SlottedMutableMapping']
 
 PY2 = sys.version_info[0] == 2
 PY3 = sys.version_info[0] == 3
@@ -83,12 +85,35 @@ if PY2:
             return data.encode(encoding, error)
         raise TypeError('Expected bytes')
 
+    class SlottedMutableMapping(object):
+        """
+        A base class for mutable mappings using __slots__. The Python 2 ABCs do
+        not define __slots__, so their subclasses always get a __dict__. This
+        class copies the mixin methods of MutableMapping instead and is
+        registered as one.
+        """
+        __slots__ = ()
+        __hash__ = None
+
+    for __name in ('__contains__', 'keys', 'items', 'values', 'get', '__eq__', '__ne__', 'iterkeys',
+                   'itervalues', 'iteritems', 'pop', 'popitem', 'clear', 'update', 'setdefault'):
+        for __base in MutableMapping.__mro__:
+            if __name in vars(__base):
+                setattr(SlottedMutableMapping, __name, vars(__base)[__name])
+                break
+    del __name, __base
+
+    MutableMapping.register(SlottedMutableMapping)
+
 else:  # Python 3 implementation
     text_type = str
     string_types = (str, )
     int_types = (int, )
     implements_to_string = __identity
 
+    # The Python 3 ABCs define __slots__, so their subclasses can do without a __dict__
+    SlottedMutableMapping = MutableMapping
+
     def make_unicode(data, encoding='utf-8', error='strict'):
         """"""
         if isinstance(data, bytes):
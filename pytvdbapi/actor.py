@@ -21,7 +21,7 @@
 
 from pytvdbapi.error import TVDBAttributeError
 from pytvdbapi._compat import implements_to_string
-from pytvdbapi.utils import InsensitiveDictionary
+from pytvdbapi.xmlhelpers import make_record
 
 __all__ = ['Actor']
 
@@ -64,8 +64,8 @@ class Actor(object):
     def __init__(self, mirror, data, show):
         self.mirror, self.show = mirror, show
 
-        # pylint: disable=W0142
-        self.data = InsensitiveDictionary(ignore_case=show.api.config['ignore_case'], **data)
+        config = show.api.config
+        self.data = make_record(data, config['ignore_case'], config.get('compact', False))
         self.data['image_url'] = self.mirror + u"/banners/" + self.Image
 
     def __getattr__(self, item):
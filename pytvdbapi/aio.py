@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2011 - 2014 Björn Larsson
+
+# This file is part of pytvdbapi.
+#
+# pytvdbapi is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pytvdbapi is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pytvdbapi.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+.. versionadded:: 0.6
+
+An :mod:`asyncio` based interface to the API, allowing a single event loop to
+keep many requests in flight at the same time. This module requires Python 3.5
+or later.
+
+The :class:`AsyncTVDB` class provides awaitable counterparts of the functions
+found on :class:`pytvdbapi.api.TVDB`. The objects returned are the regular
+:class:`pytvdbapi.api.Show` and :class:`pytvdbapi.api.Episode` objects.
+
+Basic usage::
+
+    import asyncio
+    from pytvdbapi.aio import AsyncTVDB
+
+    async def main():
+        db = AsyncTVDB("B43FF87DE395DF56")
+        shows = await asyncio.gather(db.get_series(79349, "en"), db.get_series(81189, "en"))
+        await db.update(shows[0])
+
+    asyncio.get_event_loop().run_until_complete(main())
+"""
+
+import sys
+
+if sys.version_info < (3, 5):
+    raise ImportError(u"pytvdbapi.aio requires Python 3.5 or later")
+
+from pytvdbapi._aio import AsyncLoader, AsyncTVDB  # noqa pylint: disable=W0611
+
+__all__ = ['AsyncLoader', 'AsyncTVDB']
@@ -54,12 +54,17 @@ Basic usage::
     ...
 """
 from __future__ import absolute_import, print_function
-from collections import Sequence
+from collections import MutableMapping, Sequence
+from io import BytesIO
 
 import logging
+import multiprocessing
 import tempfile
 import os
+import threading
+import time
 import datetime
+import weakref
 
 # pylint: disable=E0611, F0401
 try:
@@ -67,18 +72,146 @@ try:
 except ImportError:
     from urllib.parse import quote
 
+try:
+    from concurrent.futures import ProcessPoolExecutor
+except ImportError:  # pragma: no cover
+    ProcessPoolExecutor = None
+
 
 from pytvdbapi.actor import Actor
 from pytvdbapi.banner import Banner
+from pytvdbapi.columns import EpisodeTable, EpisodeRow
 from pytvdbapi.urls import (mirrors, search, zap2itid, imdbid, series, episode, airdate, absolute_order,
                             dvd_order, default_order, actors, banners)
-from pytvdbapi.utils import unicode_arguments, deprecate_episode_id, InsensitiveDictionary
-from pytvdbapi._compat import implements_to_string, make_bytes, make_unicode, text_type, int_types
-from pytvdbapi import error
+from pytvdbapi.utils import unicode_arguments, deprecate_episode_id, concurrent_map, write_file
+from pytvdbapi._compat import (implements_to_string, make_bytes, make_unicode, text_type, int_types,
+                               string_types)
+from pytvdbapi import error, tracing
 from pytvdbapi.__init__ import __NAME__
+from pytvdbapi.cache import BoundedFileCache, RecordCache
 from pytvdbapi.loader import Loader
+from pytvdbapi.metrics import Metrics
 from pytvdbapi.mirror import MirrorList, TypeMask
-from pytvdbapi.xmlhelpers import parse_xml, generate_tree, has_element
+from pytvdbapi.scheduler import Priority, RequestScheduler
+from pytvdbapi.store import Store
+from pytvdbapi.sync import Synchronizer
+from pytvdbapi.xmlhelpers import (generate_tree, get_parser, parse_data, compact_records, make_record,
+                                  intern_records)
+
+
+def _projection(fields, episode_fields, episodes):
+    """
+    :param fields: The series fields to keep or None to keep all fields
+    :param episode_fields: The episode fields to keep or None to keep all fields
+    :param episodes: If False, the episodes are skipped
+    :return: A tuple *(elements, fields)* with the elements to parse and the
+        fields to keep for them, see :func:`pytvdbapi.xmlhelpers.iterparse_xml`,
+        or None if all data should be kept.
+    """
+    if fields is None and episode_fields is None and episodes:
+        return None
+
+    elements = SERIES_ELEMENTS if episodes else ('Series',)
+    projected = dict()
+    for element, keep in (('Series', fields), ('Episode', episode_fields)):
+        if keep is not None:
+            projected[element] = frozenset(keep).union(REQUIRED_FIELDS[element])
+    return elements, projected
+
+
+def _process_pool(processes):
+    """
+    :param processes: The number of worker processes, defaults to the number of CPUs
+    :return: A started :class:`concurrent.futures.ProcessPoolExecutor`
+
+    The workers are started from a forkserver, or spawned, where supported, so
+    they do not inherit locks held by other threads of the calling process.
+    Otherwise the workers are forked before returning, the caller should start
+    its threads after that.
+    """
+    pool = None
+    methods = getattr(multiprocessing, 'get_all_start_methods', lambda: ())()
+    for method in ('forkserver', 'spawn'):
+        if method in methods:
+            context = multiprocessing.get_context(method)
+            try:
+                pool = ProcessPoolExecutor(max_workers=processes, mp_context=context)
+            except TypeError:  # pragma: no cover, mp_context was added in Python 3.7
+                pass
+            break
+
+    if pool is None:  # pragma: no cover
+        pool = ProcessPoolExecutor(max_workers=processes)
+
+    pool.submit(int).result()
+    return pool
+
+
+def _intern_series(data):
+    """
+    :param data: A dictionary holding the parsed full series data,
+        see :func:`pytvdbapi.xmlhelpers.parse_series`
+    :return: *data* with the values interned, see :func:`pytvdbapi.xmlhelpers.intern_records`
+    """
+    for records in data.values():
+        intern_records(records)
+    return data
+
+
+def _series_records(data):
+    """
+    :param data: A dictionary holding the parsed full series data,
+        see :func:`pytvdbapi.xmlhelpers.parse_series`
+    :return: A generator of tuples *(element, data)* as returned by :func:`pytvdbapi.xmlhelpers.iterparse_xml`
+    """
+    for element in ('Series', 'Episode'):
+        for record in data[element]:
+            yield element, record
+
+
+class _EpisodeViews(MutableMapping):
+    """
+    The episodes of a :class:`Season` kept in a :class:`pytvdbapi.columns.EpisodeTable`,
+    mapping the episode numbers to :class:`Episode` views. A view is created
+    when the episode is first accessed and kept, so the same instance is
+    returned every time.
+
+    An episode added to the season is added to the table and turned into a
+    view of its row. The row of an episode replaced or removed stays in the
+    table but no longer belongs to the season.
+    """
+
+    def __init__(self, season, table):
+        self.season, self.table = season, table
+        self.rows, self.views = dict(), dict()
+
+    def add(self, number, index):
+        """Adds the row *index* of the table as episode *number*"""
+        self.rows[number] = index
+        self.views.pop(number, None)
+
+    def __getitem__(self, item):
+        try:
+            return self.views[item]
+        except KeyError:
+            view = Episode(self.table.row(self.rows[item]), self.season, self.season.show.config)
+            return self.views.setdefault(item, view)
+
+    def __setitem__(self, key, value):
+        data = value.data
+        if not isinstance(data, EpisodeRow) or data.table is not self.table:
+            data = value.data = self.table.row(self.table.append(data))
+        self.rows[key], self.views[key] = data.index, value
+
+    def __delitem__(self, key):
+        del self.rows[key]
+        self.views.pop(key, None)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self):
+        return len(self.rows)
 
 
 @implements_to_string
@@ -143,12 +276,15 @@ class Show(Sequence):
 
     data = {}
 
-    def __init__(self, data, api, language, config, full_data=None):
+    def __init__(self, data, api, language, config, full_data=None, projection=None):
         self.api, self.lang, self.config = api, language, config
         self.seasons = dict()
+        self.projection = projection
+        self.episode_table = None
 
         self.ignore_case = self.config.get('ignore_case', False)
-        self.data = InsensitiveDictionary(ignore_case=self.ignore_case, **data)  # pylint: disable=W0142
+        # The full series data added by _set_data may be unconverted
+        self.data = make_record(data, self.ignore_case, self.config.get('compact', False), lazy=True)
 
         self.data['actor_objects'] = list()
         self.data['banner_objects'] = list()
@@ -162,21 +298,21 @@ class Show(Sequence):
         except KeyError:
             raise error.TVDBAttributeError(u"Show has no attribute named {0}".format(item))
 
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.api._track(self)  # pylint: disable=W0212
+
     def __dir__(self):
         attributes = [d for d in list(self.__dict__.keys())
-                      if d not in ('data', 'config', 'ignore_case', 'seasons')]
+                      if d not in ('data', 'config', 'ignore_case', 'seasons', 'projection', 'episode_table')]
         return list(self.data.keys()) + attributes
 
     def __iter__(self):
-        if not self.seasons:
-            self._populate_data()
-
+        self._load_seasons()
         return iter(sorted(list(self.seasons.values()), key=lambda season: season.season_number))
 
     def __len__(self):
-        if not len(self.seasons):
-            self._populate_data()
-
+        self._load_seasons()
         return len(self.seasons)
 
     def __reversed__(self):
@@ -184,8 +320,7 @@ class Show(Sequence):
             yield self[i]
 
     def __getitem__(self, item):
-        if len(self.seasons) == 0:
-            self._populate_data()
+        self._load_seasons()
 
         if isinstance(item, int):
             try:
@@ -211,8 +346,18 @@ class Show(Sequence):
         """
         self._populate_data()
 
+    def _load_seasons(self):
+        """
+        Loads the full series data if no seasons have been loaded, unless the
+        show was loaded without the episodes, see :func:`TVDB.get_series`.
+        """
+        if not self.seasons and (self.projection is None or 'Episode' in self.projection[0]):
+            self._populate_data()
+
     def _populate_data(self, data=None):
         """
+        :param data: The full series data, see :func:`_set_data`. Loaded from the server if None.
+
         Populates the Show object with data. This will hit the network to
         download the XML data from `thetvdb.com <http://thetvdb.com>`_.
         :class:`Season` and `:class:Episode` objects will be created and
@@ -224,30 +369,22 @@ class Show(Sequence):
         """
         logger.debug(u"Populating season data from URL.")
 
-        if data is None:
-            context = {'mirror': self.api.mirrors.get_mirror(TypeMask.XML).url,
-                       'api_key': self.config['api_key'],
-                       'seriesid': self.id,
-                       'language': self.lang}
-            url = series.format(**context)
-            data = self.api.loader.load(url)
-            data = generate_tree(data)
-
-        episodes = [d for d in parse_xml(data, "Episode")]
-
-        show_data = parse_xml(data, "Series")
-        assert len(show_data) == 1, u"Should only have 1 Show section"
-
-        self.data.update(InsensitiveDictionary(show_data[0], ignore_case=self.ignore_case))
+        with self.api.tracer.span('populate_data', seriesid=self.id) as span:
+            if data is None:
+                url = self._url(series)
+                span.set(url=url)
 
-        for episode_data in episodes:
-            season_nr = int(episode_data['SeasonNumber'])
-            if season_nr not in self.seasons:
-                self.seasons[season_nr] = Season(season_nr, self)
+                data = self.api._series_data(url, projection=self.projection)  # pylint: disable=W0212
+                if self.projection is None:
+                    self.api._save_series(self.lang, data)  # pylint: disable=W0212
 
-            episode_instance = Episode(episode_data, self.seasons[season_nr], self.config)
-            self.seasons[season_nr].append(episode_instance)
+            self._set_data(data)
+            self._load_extras()
 
+    def _load_extras(self):
+        """
+        Loads the actors and banners data if configured to do so.
+        """
         # If requested, load the extra actors data
         if self.config.get('actors', False):
             self.load_actors()
@@ -256,6 +393,78 @@ class Show(Sequence):
         if self.config.get('banners', False):
             self.load_banners()
 
+    def _records(self, rows):
+        """
+        :param rows: A list of the parsed data of the objects to create
+        :return: *rows* as :class:`pytvdbapi.xmlhelpers.CompactRecord` instances
+            if configured to use them, otherwise *rows* unchanged
+        """
+        if self.config.get('compact', False):
+            return compact_records(rows, self.ignore_case)
+        return rows
+
+    def _url(self, template):
+        """
+        :param template: One of the url templates from :mod:`pytvdbapi.urls`
+        :return: The url for this show formatted from *template*
+        """
+        context = {'mirror': self.api.mirrors.get_mirror(TypeMask.XML).url,
+                   'api_key': self.config['api_key'],
+                   'seriesid': self.id,
+                   'language': self.lang}
+        return template.format(**context)
+
+    def _set_data(self, data):
+        """
+        :param data: A dictionary holding the parsed full series data,
+            see :func:`pytvdbapi.xmlhelpers.parse_series`, or an iterator of
+            the parsed *Series* and *Episode* elements, see
+            :func:`pytvdbapi.xmlhelpers.iterparse_xml`
+
+        Updates the show attributes and creates the :class:`Season` and
+        :class:`Episode` objects from the full series data. The elements are
+        consumed one at a time when given as an iterator.
+
+        If configured to keep the episodes column wise, the episodes are added
+        to a new :class:`pytvdbapi.columns.EpisodeTable` instead.
+        """
+        table = None
+        if self.config.get('columnar', False):
+            table = self.episode_table = EpisodeTable(self.ignore_case)
+            for season in self.seasons.values():
+                season.episodes = _EpisodeViews(season, table)
+
+        if isinstance(data, dict):
+            assert len(data['Series']) == 1, u"Should only have 1 Show section"
+            if table is None:
+                data = {'Series': data['Series'], 'Episode': self._records(data['Episode'])}
+            stage, records = 'build', _series_records(data)
+        else:
+            stage, records = 'iterparse', data
+
+        with tracing.span(stage, element='Episode') as span:
+            count = 0
+            for element, record in records:
+                if element == 'Series':
+                    self.data.update_record(record)
+                    continue
+
+                season_nr = int(record['SeasonNumber'])
+                if season_nr not in self.seasons:
+                    self.seasons[season_nr] = Season(season_nr, self)
+                    if table is not None:
+                        self.seasons[season_nr].episodes = _EpisodeViews(self.seasons[season_nr], table)
+
+                if table is not None:
+                    index = table.append(record)
+                    self.seasons[season_nr].episodes.add(int(table.value(index, 'EpisodeNumber')), index)
+                else:
+                    episode_instance = Episode(record, self.seasons[season_nr], self.config)
+                    self.seasons[season_nr].append(episode_instance)
+                count += 1
+
+            span.set(count=count)
+
     def load_actors(self):
         """
         .. versionadded:: 0.4
@@ -271,21 +480,25 @@ class Show(Sequence):
           :class:`TVDB` for information on how to use the *actors* keyword
           argument.
         """
-        context = {'mirror': self.api.mirrors.get_mirror(TypeMask.XML).url,
-                   'api_key': self.config['api_key'],
-                   'seriesid': self.id}
-        url = actors.format(**context)
-
+        url = self._url(actors)
         logger.debug(u'Loading Actors data from {0}'.format(url))
 
-        data = generate_tree(self.api.loader.load(url))
+        with self.api.tracer.span('load_actors', url=url):
+            data = self.api._load_parsed(url, ('Actor',))['Actor']  # pylint: disable=W0212
+            self.api._save_extras(self.id, 'Actor', data)  # pylint: disable=W0212
+            self._set_actors(data)
+
+    def _set_actors(self, data):
+        """
+        :param data: A list holding the parsed actors data
 
+        Generates all the :class:`pytvdbapi.actor.Actor` objects.
+        """
         mirror = self.api.mirrors.get_mirror(TypeMask.BANNER).url
 
-        # generate all the Actor objects
-        # pylint: disable=W0201
-        self.actor_objects = [Actor(mirror, d, self)
-                              for d in parse_xml(data, 'Actor')]
+        with tracing.span('build', element='Actor', count=len(data)):
+            # pylint: disable=W0201
+            self.actor_objects = [Actor(mirror, d, self) for d in self._records(data)]
 
     def load_banners(self):
         """
@@ -302,56 +515,107 @@ class Show(Sequence):
           :class:`TVDB` for information on how to use the *banners* keyword
           argument.
         """
-        context = {'mirror': self.api.mirrors.get_mirror(TypeMask.XML).url,
-                   'api_key': self.config['api_key'],
-                   'seriesid': self.id}
-
-        url = banners.format(**context)
+        url = self._url(banners)
         logger.debug(u'Loading Banner data from {0}'.format(url))
 
-        data = generate_tree(self.api.loader.load(url))
+        with self.api.tracer.span('load_banners', url=url):
+            data = self.api._load_parsed(url, ('Banner',))['Banner']  # pylint: disable=W0212
+            self.api._save_extras(self.id, 'Banner', data)  # pylint: disable=W0212
+            self._set_banners(data)
+
+    def _set_banners(self, data):
+        """
+        :param data: A list holding the parsed banners data
+
+        Generates all the :class:`pytvdbapi.banner.Banner` objects.
+        """
         mirror = self.api.mirrors.get_mirror(TypeMask.BANNER).url
 
-        # pylint: disable=W0201
-        self.banner_objects = [Banner(mirror, b, self) for b in parse_xml(data, "Banner")]
+        with tracing.span('build', element='Banner', count=len(data)):
+            # pylint: disable=W0201
+            self.banner_objects = [Banner(mirror, b, self) for b in self._records(data)]
 
-    def find(self, key):
+    def find(self, key, field=None):
         """
         .. versionadded:: 0.5
+        .. versionchanged:: 0.6 Added the *field* parameter
 
         :param key: A callable taking an :class:`Episode` instance as argument and returns a boolean
+        :param field: If given, *key* is called with the value of this attribute instead, for the
+            episodes having it
+        :raises: :class:`pytvdbapi.error.TypeError`
         :returns: An :class:`Episode` instance or None
 
         Finds the first :class:`Episode` for witch :code:`key` returns :code:`True`.
 
+        When the episodes are kept column wise, see :class:`TVDB`, matching on a
+        *field* only reads the values of that field and only creates the
+        :class:`Episode` found.
+
         .. note::
             The order in which the :class:`Episode` instances are searched is not guaranteed and the first
             match found is not necessarily the first one in a chronological sense.
 
         .. seealso:: :func:`Season.find` for information on finding an episode in a specific season
         """
+        if field is not None:
+            return next(self._select(key, field), None)
+
         for season in self:
             _episode = season.find(key=key)
             if _episode is not None:
                 return _episode
         return None
 
-    def filter(self, key):
+    def filter(self, key, field=None):
         """
         .. versionadded:: 0.5
+        .. versionchanged:: 0.6 Added the *field* parameter
 
         :param key: A callable taking an :class:`Episode` instance as argument and returns a boolean
+        :param field: If given, *key* is called with the value of this attribute instead, for the
+            episodes having it, see :func:`find`
+        :raises: :class:`pytvdbapi.error.TypeError`
         :returns: A list of 0 or more :class:`Episode` instances
 
         Finds all :class:`Episode` instances for witch :code:`key` returns :code:`True`.
 
         .. seealso:: :func:`Season.filter` for information on filtering episodes in a specific season
         """
+        if field is not None:
+            return list(self._select(key, field))
+
         result = list()
         for season in self:
             result.extend(season.filter(key=key))
         return result
 
+    def _select(self, key, field):
+        """
+        :return: A generator of the :class:`Episode` instances for which *key* returns True
+            for the value of *field*
+        """
+        self._load_seasons()
+        table = self.episode_table
+
+        try:
+            if table is not None:
+                for index, value in table.scan(field):
+                    if key(value):
+                        season = self.seasons.get(int(table.value(index, 'SeasonNumber')))
+                        number = int(table.value(index, 'EpisodeNumber'))
+
+                        # Skip the rows of the episodes replaced or removed from their season
+                        if season is not None and season.episodes.rows.get(number) == index:
+                            yield season.episodes[number]
+            else:
+                for season in self:
+                    for _episode in season.episodes.values():
+                        if field in _episode.data and key(_episode.data[field]):
+                            yield _episode
+        except TypeError as _error:
+            raise error.TVDBTypeError("{0}".format(_error))
+
 
 @implements_to_string
 class Episode(object):
@@ -413,9 +677,11 @@ class Episode(object):
 
     def __init__(self, data, season, config):
         self.season, self.config = season, config
-        ignore_case = self.config.get('ignore_case', False)
 
-        self.data = InsensitiveDictionary(ignore_case=ignore_case, **data)  # pylint: disable=W0142
+        if isinstance(data, EpisodeRow):
+            self.data = data
+        else:
+            self.data = make_record(data, config.get('ignore_case', False), config.get('compact', False))
 
     def __getattr__(self, item):
         try:
@@ -440,6 +706,15 @@ __all__ = ['languages', 'Language', 'TVDB', 'Search', 'Show', 'Season', 'Episode
 # Module logger object
 logger = logging.getLogger(__name__)
 
+#: The elements parsed from the full series data
+SERIES_ELEMENTS = ('Series', 'Episode')
+
+#: The elements parsed from the episode data
+EPISODE_ELEMENTS = ('Episode', 'Error')
+
+#: The fields always kept when projecting the series data, see :func:`TVDB.get_series`
+REQUIRED_FIELDS = {'Series': ('id', 'SeriesName'), 'Episode': ('id', 'SeasonNumber', 'EpisodeNumber')}
+
 
 @implements_to_string
 class Language(object):
@@ -597,6 +872,82 @@ class TVDB(object):
     * **timeout** (default=None) When set to a number, will cause the http
     request to timeout after that number of seconds.
 
+    .. versionadded:: 0.6
+
+    * **loader** (default=None) A :class:`pytvdbapi.loader.BaseLoader` instance
+      to use for loading data from the server. If not provided,
+      a :class:`pytvdbapi.loader.Loader` using *cache_dir* and *timeout* will be
+      created. Pass a :class:`pytvdbapi.loader.PooledLoader` to reuse persistent
+      connections and to share the instance between threads.
+
+    * **rate_limit** (default=None) When set to a number, the average number of
+      requests per second sent to the server is limited to that number. Searches
+      are given priority over other requests when the limit is reached. Only used
+      if no *loader* is provided, see :class:`pytvdbapi.scheduler.RequestScheduler`.
+
+    * **burst** (default=1) The number of requests that can be sent in a burst
+      when *rate_limit* is used.
+
+    * **cache_size** (default=None) When set to a number, the server responses
+      are cached compressed in *cache_dir* using at most that number of bytes,
+      evicting the least recently used responses when the limit is reached. Only
+      used if no *loader* is provided, see :class:`pytvdbapi.cache.BoundedFileCache`.
+
+    * **record_cache** (default=False) If set to True, the data parsed from the
+      full series data is cached in *cache_dir*. As long as the server responds
+      with the same data, loading a show will use the cached data instead of
+      parsing the XML again. A :class:`pytvdbapi.cache.RecordCache` instance can
+      also be provided.
+
+    * **store** (default=None) A :class:`pytvdbapi.store.Store` instance or the
+      path of an SQLite database file. All shows and episodes loaded are written
+      to the store and :func:`get_series`, :func:`get_episode` and
+      :func:`get_episode_by_air_date` answer from it when the data is stored.
+      Use *cache=False* to bypass the store.
+
+    * **mirror_ttl** (default=86400) The number of seconds the list of mirrors
+      is kept in *cache_dir*. The list is loaded on first use rather than when
+      the instance is created, and processes sharing *cache_dir* reuse the
+      stored list until it expires. Set to 0 to always load the list from the
+      server.
+
+    * **metrics** (default=None) If set to True, metrics about the requests made
+      and the time spent processing the responses are collected in a
+      :class:`pytvdbapi.metrics.Metrics` instance available through the *metrics*
+      attribute. A :class:`pytvdbapi.metrics.Metrics` instance can also be provided.
+
+    * **lazy** (default=False) If set to True, the field values of the
+      :class:`Show`, :class:`Episode`, :class:`pytvdbapi.banner.Banner` and
+      :class:`pytvdbapi.actor.Actor` objects are kept as text and converted
+      when first accessed, see :class:`pytvdbapi.xmlhelpers.LazyDictionary`.
+      This saves the time spent converting the fields that are never used.
+
+    * **compact** (default=False) If set to True, the field values of the
+      :class:`Show`, :class:`Episode`, :class:`pytvdbapi.banner.Banner` and
+      :class:`pytvdbapi.actor.Actor` objects are kept in
+      :class:`pytvdbapi.xmlhelpers.CompactRecord` instances sharing their keys,
+      using about half the memory per object, an :class:`Episode` takes 486
+      instead of 1063 bytes in a show with 3000 episodes. The attributes are accessed
+      the same way. The fields are converted when the objects are created, so
+      *lazy* has no effect.
+
+    * **columnar** (default=False) If set to True, the episodes of a
+      :class:`Show` are kept column wise in a
+      :class:`pytvdbapi.columns.EpisodeTable`, available through its
+      *episode_table* attribute, and the :class:`Episode` instances are created
+      as views of the table when accessed. This takes much less memory per
+      episode and allows scanning a single field, see :func:`Show.filter`. The
+      fields are converted when the episodes are added, so *lazy* has no effect.
+
+    * **parser** (default=None) The name of the parser backend to parse the
+      responses with, *lxml*, *expat* or *etree*, or a
+      :class:`pytvdbapi.xmlhelpers.Parser` instance. By default the fastest
+      backend available is used, see :func:`pytvdbapi.xmlhelpers.get_parser`.
+
+    The work done is reported as spans to the hooks added to the
+    :class:`pytvdbapi.tracing.Tracer` available through the *tracer* attribute,
+    see :mod:`pytvdbapi.tracing`.
+
     """
 
     @unicode_arguments
@@ -614,13 +965,138 @@ class TVDB(object):
         self.config['actors'] = kwargs.get('actors', False)
         self.config['banners'] = kwargs.get('banners', False)
         self.config['ignore_case'] = kwargs.get('ignore_case', False)
+        self.config['lazy'] = kwargs.get('lazy', False)
+        self.config['compact'] = kwargs.get('compact', False)
+        self.config['columnar'] = kwargs.get('columnar', False)
+        self.parser = get_parser(kwargs.get('parser', None))
+
+        # Create the loader object to use, unless one is provided
+        self.loader = kwargs.get('loader', None)
+        if self.loader is None:
+            scheduler = None
+            if kwargs.get('rate_limit', None) is not None:
+                scheduler = RequestScheduler(kwargs['rate_limit'], kwargs.get('burst', 1))
+
+            self.loader = Loader(self._create_cache(kwargs), timeout=kwargs.get('timeout', None),
+                                 scheduler=scheduler)
+
+        record_cache = kwargs.get('record_cache', False)
+        if record_cache is True:
+            record_cache = RecordCache(os.path.join(self.config['cache_dir'], u'records'))
+        self.record_cache = record_cache or None
+
+        self.store = kwargs.get('store', None)
+        if isinstance(self.store, string_types):
+            self.store = Store(self.store)
+
+        # The list of available mirrors is loaded on first use
+        self.config['mirror_ttl'] = kwargs.get('mirror_ttl', 24 * 60 * 60)
+        self._mirrors, self._mirrors_lock = None, threading.Lock()
+
+        # Keep the mirror statistics up to date
+        self.loader.add_listener(self._record_load)
+
+        self.tracer = tracing.Tracer()
+
+        metrics = kwargs.get('metrics', None)
+        if metrics is True:
+            metrics = Metrics()
+        self.metrics = metrics or None
+        if self.metrics is not None:
+            self.tracer.add_hook(self.metrics)
+
+        # The shows created, kept up to date by sync
+        self._shows = weakref.WeakValueDictionary()
+        self.synchronizer = Synchronizer(self)
+
+    def __getstate__(self):
+        # The lock and the weak references can not be pickled, they are recreated when unpickled
+        state = self.__dict__.copy()
+        del state['_mirrors_lock'], state['_shows']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._mirrors_lock = threading.Lock()
+        self._shows = weakref.WeakValueDictionary()
+
+    def _create_cache(self, kwargs):
+        """
+        :return: The cache to use for a loader created from the keyword arguments in *kwargs*
+        """
+        if kwargs.get('cache_size', None) is not None:
+            return BoundedFileCache(self.config['cache_dir'], max_size=kwargs['cache_size'])
+        return self.config['cache_dir']
 
-        # Create the loader object to use
-        self.loader = Loader(self.config['cache_dir'], timeout=kwargs.get('timeout', None))
+    @property
+    def mirrors(self):
+        """
+        The :class:`pytvdbapi.mirror.MirrorList` of the available mirrors, loaded on first use.
+        """
+        if self._mirrors is None:
+            with self._mirrors_lock:
+                if self._mirrors is None:
+                    with self.tracer.span('load_mirrors', url=mirrors.format(**self.config)):
+                        self._mirrors = MirrorList(self._load_mirrors())
+        return self._mirrors
+
+    def _load_mirrors(self):
+        """
+        :return: An element tree holding the list of mirrors
 
-        # Create the list of available mirrors
-        tree = generate_tree(self.loader.load(mirrors.format(**self.config)))
-        self.mirrors = MirrorList(tree)
+        Uses the list stored in *cache_dir* while it is younger than *mirror_ttl*,
+        otherwise loads it from the server and stores it. An expired list is
+        used if the server can not be reached.
+        """
+        path, ttl = os.path.join(self.config['cache_dir'], u'mirrors.xml'), self.config['mirror_ttl']
+
+        stored, age = None, None
+        if ttl:
+            try:
+                with open(path, 'rb') as handle:
+                    stored = generate_tree(handle)
+                age = time.time() - os.path.getmtime(path)
+            except (IOError, OSError, error.BadData):
+                stored = None
+
+        if stored is not None and age < ttl:
+            logger.debug(u"Using the stored list of mirrors")
+            return stored
+
+        try:
+            data = self.loader.load(mirrors.format(**self.config)).read()
+        except error.ConnectionError:
+            if stored is None:
+                raise
+            logger.warning(u"Unable to load the list of mirrors, using the expired list")
+            return stored
+
+        tree = generate_tree(BytesIO(data))
+        if ttl:
+            try:
+                write_file(path, data)
+            except (IOError, OSError):
+                logger.warning(u"Unable to store the list of mirrors in {0}".format(path))
+        return tree
+
+    def _record_load(self, url, elapsed, response, size, exception):  # pylint: disable=W0613
+        """Records the outcome of a load on the mirror used"""
+        if self._mirrors is not None:
+            self._mirrors.record(url, elapsed, isinstance(exception, error.ConnectionError))
+
+    def _parse(self, data, elements):
+        """
+        :param data: A file like object holding the xml data
+        :param elements: The names of the elements to parse
+        :return: The parsed elements, see :func:`pytvdbapi.xmlhelpers.Parser.parse`
+        """
+        return self.parser.parse(data, elements, self.config['lazy'])
+
+    def _load_parsed(self, url, elements, cache=True, priority=Priority.NORMAL):
+        """
+        :return: The *elements* parsed from the data loaded from *url*, see :func:`_parse`
+        """
+        return self._parse(self.loader.load(url, cache, priority), elements)
 
     @unicode_arguments
     def search(self, show, language, cache=True):
@@ -661,23 +1137,42 @@ class TVDB(object):
 
         logger.debug(u"Searching for {0} using language {1}".format(show, language))
 
-        if language != u'all' and language not in __LANGUAGES__:
-            raise error.TVDBValueError(u"{0} is not a valid language".format(language))
+        url = self._search_url(show, language)
 
         if (show, language) not in self.search_buffer or not cache:
-            context = {'series': quote(make_bytes(show)), "language": language}
-            data = generate_tree(self.loader.load(search.format(**context), cache))
-            shows = [Show(d, self, language, self.config) for d in parse_xml(data, "Series")]
-
-            self.search_buffer[(show, language)] = shows
+            with self.tracer.span('search', url=url):
+                found = self._load_parsed(url, ('Series',), cache, Priority.INTERACTIVE)['Series']
+                self._set_search(show, language, found)
 
         return Search(self.search_buffer[(show, language)], show, language)
 
+    def _search_url(self, show, language):
+        """
+        :return: The url to use for searching for *show*
+        :raise: :exc:`pytvdbapi.error.TVDBValueError`
+        """
+        if language != u'all' and language not in __LANGUAGES__:
+            raise error.TVDBValueError(u"{0} is not a valid language".format(language))
+
+        context = {'series': quote(make_bytes(show)), "language": language}
+        return search.format(**context)
+
+    def _set_search(self, show, language, found):
+        """
+        Creates the :class:`Show` instances from the parsed *Series* elements
+        of the search result and stores them in the search buffer.
+        """
+        with tracing.span('build', element='Series', count=len(found)):
+            shows = [self._track(Show(d, self, language, self.config)) for d in found]
+        self.search_buffer[(show, language)] = shows
+
     @unicode_arguments
-    def get_series(self, series_id, language, id_type='tvdb', cache=True):
+    def get_series(self, series_id, language, id_type='tvdb', cache=True, fields=None, episode_fields=None,
+                   episodes=True):
         """
         .. versionadded:: 0.4
         .. versionchanged:: 0.5 Added *id_type* parameter
+        .. versionchanged:: 0.6 Added the *fields*, *episode_fields* and *episodes* parameters
 
         :param series_id: The Show Id to fetch
         :param language: The language abbreviation to search for. E.g. "en"
@@ -685,6 +1180,9 @@ class TVDB(object):
             'zap2it')*
         :param cache: If False, the local cache will not be used and the
                     resources will be reloaded from server.
+        :param fields: The names of the show attributes to load, defaults to all attributes
+        :param episode_fields: The names of the episode attributes to load, defaults to all attributes
+        :param episodes: If False, only the show data is loaded and the show has no seasons
 
         :return: A :class:`Show()` instance
         :raise: :exc:`pytvdbapi.error.TVDBValueError`, :exc:`pytvdbapi.error.TVDBIdError`
@@ -692,6 +1190,13 @@ class TVDB(object):
         Provided a valid Show ID, the data for the show is fetched and a
         corresponding :class:`Show()` object is returned.
 
+        The *fields*, *episode_fields* and *episodes* parameters limit the data
+        kept, the other fields are skipped while parsing without being
+        converted. The fields in :data:`REQUIRED_FIELDS` are always kept. A
+        projected show is always parsed from the response, it is neither taken
+        from nor written to the record cache or the store, and keeps the
+        projection when updated.
+
         Example::
 
             >>> from pytvdbapi import api
@@ -699,6 +1204,80 @@ class TVDB(object):
             >>> show = db.get_series( 79349, "en" )  # Load Dexter
             >>> print(show.SeriesName)
             Dexter
+
+            >>> show = db.get_series(79349, "en", episode_fields=['EpisodeName'])
+            >>> print(show[1][1].EpisodeName)
+            Dexter
+        """
+        projection = _projection(fields, episode_fields, episodes)
+        return self._get_series(series_id, language, id_type, cache, Priority.NORMAL, projection)
+
+    def _get_series(self, series_id, language, id_type, cache, priority, projection=None):
+        """
+        Loads the show using a request of the provided *priority*, see :func:`get_series`.
+        """
+        url, series_id = self._series_url(series_id, language, id_type)
+
+        with self.tracer.span('get_series', url=url):
+            if self.store is not None and cache and projection is None:
+                show, missing = self._stored_show(series_id, language, id_type)
+                if show is not None:
+                    if 'Actor' in missing:
+                        show.load_actors()
+                    if 'Banner' in missing:
+                        show.load_banners()
+                    return show
+
+            try:
+                data = self._series_data(url, cache, priority, projection)
+            except error.TVDBNotFoundError:
+                raise error.TVDBIdError(u"Series id {0} not found".format(series_id))
+
+            # The other id types only provide the basic series data
+            if id_type == 'tvdb' and projection is None:
+                self._save_series(language, data)
+
+            return self._make_show(data, language, projection=projection)
+
+    def _stored_show(self, series_id, language, id_type):
+        """
+        :return: A tuple *(show, missing)* with the :class:`Show` created from the store, or None
+            if not stored, and a list of the configured extras, *Actor* and *Banner*, not stored.
+        """
+        data = self.store.load_series(series_id, language, id_type)
+        if data is None:
+            return None, []
+
+        logger.debug(u"Using stored data for series {0}".format(series_id))
+        show = self._make_show(data, language, load_extras=False)
+
+        missing = list()
+        for element, name, setter in (('Actor', 'actors', show._set_actors),  # pylint: disable=W0212
+                                      ('Banner', 'banners', show._set_banners)):  # pylint: disable=W0212
+            if not self.config.get(name, False):
+                continue
+            elif data[element] is None:
+                missing.append(element)
+            else:
+                setter(data[element])
+
+        return show, missing
+
+    def _save_series(self, language, data):
+        """Writes the full series *data* to the store, if used"""
+        if self.store is not None:
+            self.store.save_series(language, data)
+
+    def _save_extras(self, series_id, element, data):
+        """Writes the actors or banners *data* to the store, if used"""
+        if self.store is not None:
+            self.store.save_extras(series_id, element, data)
+
+    def _series_url(self, series_id, language, id_type):
+        """
+        :return: A tuple *(url, series_id)* with the url to load the series from
+            and the normalized series id.
+        :raise: :exc:`pytvdbapi.error.TVDBValueError`
         """
         if id_type not in ('tvdb', 'imdb', 'zap2it'):
             raise error.TVDBValueError("Invalid id type")
@@ -729,19 +1308,248 @@ class TVDB(object):
         url = __url__[id_type].format(**context)
         logger.debug(u'Getting series from {0}'.format(url))
 
-        try:
-            data = self.loader.load(url, cache)
-        except error.TVDBNotFoundError:
-            raise error.TVDBIdError(u"Series id {0} not found".format(series_id))
+        return url, series_id
 
-        data = generate_tree(data)
+    def _load_records(self, url, cache=True, priority=Priority.NORMAL):
+        """
+        :param url: The url to load the full series data from
+        :return: A dictionary holding the parsed series data, see :func:`pytvdbapi.xmlhelpers.parse_series`
 
-        series_data = parse_xml(data, "Series")
+        Uses the record cache, if configured, to avoid parsing the same data again.
+        """
+        if self.record_cache is None:
+            return self._load_parsed(url, SERIES_ELEMENTS, cache, priority)
 
-        if len(series) == 0:
-            raise error.BadData("Bad data received")
+        validator, data = self.loader.load_validated(url, cache, priority)
+        return self._cached_records(url, validator, data)
+
+    def _series_data(self, url, cache=True, priority=Priority.NORMAL, projection=None):
+        """
+        :param url: The url to load the full series data from
+        :param projection: The elements and fields to keep, see :func:`_projection`
+        :return: The full series data as accepted by :func:`Show._set_data`
+
+        The data is streamed from the response, see :func:`pytvdbapi.xmlhelpers.iterparse_xml`,
+        unless the full data is needed by the record cache or the store.
+        """
+        if projection is not None:
+            data = self.loader.load(url, cache, priority)
+            return self.parser.iterparse(data, projection[0], self.config['lazy'], projection[1])
+        elif self.record_cache is None and self.store is None:
+            data = self.loader.load(url, cache, priority)
+            return self.parser.iterparse(data, SERIES_ELEMENTS, self.config['lazy'])
+        return self._load_records(url, cache, priority)
+
+    def _cached_records(self, url, validator, data, parse=None):
+        """
+        :param url: The url *data* was loaded from
+        :param validator: The validator of the loaded response
+        :param data: A file like object holding the full series data
+        :param parse: The function to parse *data* with, defaults to :func:`_parse`
+        :return: The parsed data, taken from the record cache if it is up to date
+        """
+        records = self.record_cache.get(url, validator)
+
+        if records is None:
+            records = (parse or self._parse)(data, SERIES_ELEMENTS)
+            self.record_cache.set(url, validator, records)
         else:
-            return Show(series_data[0], self, language, self.config, data)
+            _intern_series(records)
+
+        return records
+
+    def _make_show(self, data, language, load_extras=True, projection=None):
+        """
+        :param data: The full series data, see :func:`Show._set_data`
+        :param load_extras: If False, the actors and banners will not be loaded even if configured
+        :param projection: The elements and fields kept in *data*, see :func:`_projection`
+        :return: A :class:`Show` instance
+        :raise: :exc:`pytvdbapi.error.BadData`
+        """
+        if isinstance(data, dict):
+            series_data = data['Series'][0] if data['Series'] else None
+        else:
+            element, series_data = next(data, (None, None))
+            if element != 'Series':
+                series_data = None
+
+        if series_data is None:
+            raise error.BadData("Bad data received")
+
+        show = Show(series_data, self, language, self.config, projection=projection)
+        show._set_data(data)  # pylint: disable=W0212
+
+        if load_extras:
+            show._load_extras()  # pylint: disable=W0212
+
+        return self._track(show)
+
+    def _track(self, show):
+        """
+        :return: *show*, registered to be kept up to date by :func:`sync`
+        """
+        self._shows[id(show)] = show
+        return show
+
+    def shows(self):
+        """
+        .. versionadded:: 0.6
+
+        :return: A list of the :class:`Show` instances created by this instance that are still in use
+        """
+        return list(self._shows.values())
+
+    def sync(self, refresh=True, languages=None):
+        """
+        .. versionadded:: 0.6
+
+        :param refresh: If True, the shows affected by the changes are reloaded
+        :param languages: The language abbreviations to remove the cached data for,
+            defaults to all languages
+        :return: A :class:`pytvdbapi.sync.Updates` instance with the changes applied
+
+        Brings the local data up to date with the changes made on the server
+        since the last call to sync, see :class:`pytvdbapi.sync.Synchronizer`.
+        The cached data for the changed series and episodes is removed and the
+        affected :class:`Show` instances created by this instance are reloaded.
+
+        The first call only records the current server time.
+        """
+        return self.synchronizer.sync(refresh, languages)
+
+    @unicode_arguments
+    def get_series_many(self, series_ids, language, id_type='tvdb', cache=True, **kwargs):
+        """
+        .. versionadded:: 0.6
+
+        :param series_ids: An iterable of Show Ids to fetch
+        :param language: The language abbreviation to search for. E.g. "en"
+        :param id_type: Information about what kind of ids are provided. Should be one of *('tvdb', 'imdb',
+            'zap2it')*
+        :param cache: If False, the local cache will not be used and the
+                    resources will be reloaded from server.
+        :param kwargs: *max_workers* (default=4), *ordered* (default=True) and *return_exceptions*
+            (default=False). See :func:`pytvdbapi.utils.concurrent_map` for a description.
+
+        :return: A generator yielding :class:`Show()` instances
+
+        Fetches several shows concurrently using a pool of *max_workers* threads and yields the
+        :class:`Show()` instances as they are loaded. If *ordered* is True they are yielded in the same
+        order as *series_ids*, otherwise as soon as they are available.
+
+        If *return_exceptions* is True, any error raised while fetching a show is yielded in place of the
+        show instead of being raised.
+
+        .. note:: To get the full benefit of the concurrency, the :class:`TVDB` instance should be created
+            using a :class:`pytvdbapi.loader.PooledLoader` with a *pool_size* of at least *max_workers*.
+
+        The requests are sent with :attr:`pytvdbapi.scheduler.Priority.BULK` priority, so when the
+        request rate is limited any other requests will be sent first.
+        """
+        def _get_series(series_id):
+            """Fetch a single show"""
+            return self._get_series(series_id, language, id_type, cache, Priority.BULK)
+
+        return concurrent_map(_get_series, series_ids, **kwargs)
+
+    @unicode_arguments
+    def ingest_series(self, series_ids, language, cache=True, processes=None, **kwargs):
+        """
+        .. versionadded:: 0.6
+
+        :param series_ids: An iterable of TVDB series ids to fetch
+        :param language: The language abbreviation to search for. E.g. "en"
+        :param cache: If False, the local cache will not be used and the
+                    resources will be reloaded from server.
+        :param processes: The number of processes parsing the data, defaults to the number of CPUs
+        :param kwargs: *max_workers* (default=4), *ordered* (default=True) and *return_exceptions*
+            (default=False). See :func:`pytvdbapi.utils.concurrent_map` for a description.
+        :return: A generator yielding :class:`Show()` instances
+        :raise: :exc:`pytvdbapi.error.PytvdbapiError` if concurrent.futures is not available
+
+        The bulk ingestion counterpart of :func:`get_series_many`. The full
+        series data is loaded by *max_workers* threads and parsed by a pool of
+        *processes* worker processes, see :func:`pytvdbapi.xmlhelpers.parse_data`,
+        so the parsing is not limited to a single CPU. The :class:`Show()`
+        instances are created from the parsed data in the calling process.
+
+        The record cache and the store are used and updated as by :func:`get_series`,
+        but the actors and banners are not loaded.
+
+        .. note:: *max_workers* should be at least *processes* to keep all processes busy.
+        """
+        if ProcessPoolExecutor is None:  # pragma: no cover
+            raise error.PytvdbapiError(u"concurrent.futures is not available, install the futures package")
+
+        # Start the pool before the threads loading the data
+        pool, lazy = _process_pool(processes), self.config['lazy']
+
+        def _parse(data, elements):
+            """Parses the file like object *data* in the process pool"""
+            return _intern_series(pool.submit(parse_data, data.read(), elements, lazy, self.parser).result())
+
+        def _ingest(series_id):
+            """Loads and parses the data of a single show"""
+            url, series_id = self._series_url(series_id, language, 'tvdb')
+
+            with self.tracer.span('ingest_series', url=url):
+                try:
+                    if self.record_cache is None:
+                        records = _parse(self.loader.load(url, cache, Priority.BULK), SERIES_ELEMENTS)
+                    else:
+                        validator, data = self.loader.load_validated(url, cache, Priority.BULK)
+                        records = self._cached_records(url, validator, data, _parse)
+                except error.TVDBNotFoundError:
+                    raise error.TVDBIdError(u"Series id {0} not found".format(series_id))
+
+                self._save_series(language, records)
+                return records
+
+        try:
+            for records in concurrent_map(_ingest, series_ids, **kwargs):
+                if isinstance(records, Exception):
+                    yield records
+                else:
+                    yield self._make_show(records, language, load_extras=False)
+        finally:
+            pool.shutdown(wait=True)
+
+    @unicode_arguments
+    def get_episodes_many(self, queries, language, method="id", cache=True, **kwargs):
+        """
+        .. versionadded:: 0.6
+
+        :param queries: An iterable of episode ids, or dictionaries with the keyword arguments to pass to
+            :func:`get_episode` for each episode.
+        :param language: The language abbreviation to search for. E.g. "en"
+        :param method: (default=id) Specify what method should be used to get the episodes.
+        :param cache: If False, the local cache will not be used and the
+                    resources will be reloaded from server.
+        :param kwargs: *max_workers* (default=4), *ordered* (default=True) and *return_exceptions*
+            (default=False). See :func:`pytvdbapi.utils.concurrent_map` for a description.
+
+        :return: A generator yielding :class:`Episode()` instances
+
+        Fetches several episodes concurrently, the episode counterpart of :func:`get_series_many`.
+
+        Example::
+
+            >>> from pytvdbapi import api
+            >>> db = api.TVDB("B43FF87DE395DF56")
+            >>> queries = [{'seasonnumber': 2, 'episodenumber': n, 'seriesid': 79349} for n in (1, 2)]
+            >>> for ep in db.get_episodes_many(queries, "en", "default"):
+            ...     print(ep.EpisodeName)
+            It's Alive!
+            Waiting to Exhale
+        """
+        def _get_episode(query):
+            """Fetch a single episode"""
+            if not isinstance(query, dict):
+                query = {'episodeid': query}
+
+            return self._get_episode(language, method, cache, Priority.BULK, **query)
+
+        return concurrent_map(_get_episode, queries, **kwargs)
 
     @unicode_arguments
     @deprecate_episode_id
@@ -813,6 +1621,29 @@ class TVDB(object):
         .. Note:: When the :class:`Episode()` is loaded using :func:`get_episode()`
             the *season* attribute used to link the episode with a season will be None.
         """
+        return self._get_episode(language, method, cache, Priority.NORMAL, **kwargs)
+
+    def _get_episode(self, language, method, cache, priority, **kwargs):
+        """
+        Loads the episode using a request of the provided *priority*, see :func:`get_episode`.
+        """
+        url = self._episode_url(language, method, **kwargs)
+
+        with self.tracer.span('get_episode', url=url):
+            if self.store is not None and cache:
+                data = self.store.load_episode(language, method, **kwargs)
+                if data is not None:
+                    return self._make_episode(data)
+
+            data = self._parse_episode(self._load_parsed(url, EPISODE_ELEMENTS, cache, priority))
+            self._save_episode(language, data)
+            return self._make_episode(data)
+
+    def _episode_url(self, language, method, **kwargs):
+        """
+        :return: The url to load the episode from using *method*
+        :raise: :exc:`pytvdbapi.error.TVDBValueError`
+        """
         methods = {"default": default_order, "dvd": dvd_order, "absolute": absolute_order, "id": episode}
 
         if language != 'all' and language not in __LANGUAGES__:
@@ -835,16 +1666,38 @@ class TVDB(object):
             raise error.TVDBValueError("Missing arguments for method {0}".format(method))
 
         logger.debug(u'Getting episode from {0}'.format(url))
+        return url
 
-        data = self.loader.load(url, cache)
-        data = generate_tree(data)
+    def _parse_episode(self, data, check_error=False):  # pylint: disable=R0201
+        """
+        :param data: The parsed *Episode* and *Error* elements of the episode data
+        :param check_error: If True, check *data* for an *Error* element
+        :return: The parsed data of the episode
+        :raise: :exc:`pytvdbapi.error.TVDBNotFoundError`, :exc:`pytvdbapi.error.BadData`
+        """
+        # The xml has an "Error" element in it if no episode was found
+        if check_error and data['Error']:
+            raise error.TVDBNotFoundError(u"".format())
 
-        episodes = parse_xml(data, "Episode")
+        episodes = data['Episode']
 
         if len(episodes) == 0:
             raise error.BadData("Bad data received")
         else:
-            return Episode(episodes[0], None, self.config)
+            return episodes[0]
+
+    def _make_episode(self, data):
+        """
+        :param data: The parsed data of the episode
+        :return: An :class:`Episode` instance not linked to a season
+        """
+        with tracing.span('build', element='Episode', count=1):
+            return Episode(data, None, self.config)
+
+    def _save_episode(self, language, data):
+        """Writes the episode *data* to the store, if used"""
+        if self.store is not None:
+            self.store.save_episode(language, data)
 
     @unicode_arguments
     def get_episode_by_air_date(self, series_id, language, air_date, cache=True):
@@ -865,6 +1718,23 @@ class TVDB(object):
         .. Note:: When the :class:`Episode()` is loaded using :func:`get_episode_by_air_date`
             the *season* attribute used to link the episode with a season will be None.
         """
+        url = self._air_date_url(series_id, language, air_date)
+
+        with self.tracer.span('get_episode_by_air_date', url=url):
+            if self.store is not None and cache:
+                data = self.store.load_episode_by_air_date(series_id, language, air_date)
+                if data is not None:
+                    return self._make_episode(data)
+
+            data = self._parse_episode(self._load_parsed(url, EPISODE_ELEMENTS, cache), check_error=True)
+            self._save_episode(language, data)
+            return self._make_episode(data)
+
+    def _air_date_url(self, series_id, language, air_date):
+        """
+        :return: The url to load the episode aired on *air_date* from
+        :raise: :exc:`pytvdbapi.error.TVDBValueError`
+        """
         if type(air_date) not in (datetime.date,):
             raise error.TVDBValueError("air_date should be of type datetime.date")
         elif language != 'all' and language not in __LANGUAGES__:
@@ -875,21 +1745,7 @@ class TVDB(object):
 
         url = airdate.format(**context)
         logger.debug(u'Getting episode from {0}'.format(url))
-
-        data = self.loader.load(url, cache)
-
-        data = generate_tree(data)
-
-        # The xml has an "Error" element in it if no episode was found
-        if has_element(data, 'Error'):
-            raise error.TVDBNotFoundError(u"".format())
-
-        episodes = parse_xml(data, "Episode")
-
-        if len(episodes) == 0:
-            raise error.BadData("Bad data received")
-        else:
-            return Episode(episodes[0], None, self.config)
+        return url
 
 
 @implements_to_string
@@ -26,7 +26,7 @@ be stored as a property of the related Show instance.
 
 from pytvdbapi import error
 from pytvdbapi._compat import implements_to_string
-from pytvdbapi.utils import InsensitiveDictionary
+from pytvdbapi.xmlhelpers import make_record
 
 
 @implements_to_string
@@ -138,8 +138,8 @@ class Banner(object):
     def __init__(self, mirror, data, show):
         self.mirror, self.show = mirror, show
 
-        # pylint: disable=W0142
-        self.data = InsensitiveDictionary(ignore_case=show.api.config['ignore_case'], **data)
+        config = show.api.config
+        self.data = make_record(data, config['ignore_case'], config.get('compact', False))
         self.data['banner_url'] = self.mirror + u"/banners/" + self.BannerPath
 
     def __str__(self):
@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2011 - 2014 Björn Larsson
+
+# This file is part of pytvdbapi.
+#
+# pytvdbapi is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pytvdbapi is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pytvdbapi.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+.. versionadded:: 0.6
+
+A module providing caches for the server responses and the data parsed from them.
+"""
+
+import hashlib
+import heapq
+import itertools
+import logging
+import os
+import threading
+import zlib
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+try:
+    from urllib.parse import urlsplit
+except ImportError:
+    from urlparse import urlsplit
+
+from pytvdbapi import error
+from pytvdbapi._compat import make_bytes
+from pytvdbapi.utils import write_file
+
+__all__ = ['BoundedFileCache', 'RecordCache']
+
+logger = logging.getLogger(__name__)
+
+# Markers for the stored entries
+_RAW, _COMPRESSED = b'R', b'Z'
+
+
+class BoundedFileCache(object):
+    """
+    :param path: The directory to store the cache in
+    :param max_size: The maximum number of bytes stored in the cache
+    :param compress: If True, the stored responses are compressed
+
+    A file based cache implementing the cache interface used by httplib2,
+    storing at most *max_size* bytes. When the limit is reached, the least
+    recently used entries are evicted.
+
+    The entries are stored in two levels of subdirectories named by the hash of
+    the key, so no single directory grows too large. The access order survives
+    a restart since it is kept in the modification time of the files.
+
+    The cache is safe to share between threads and between the connections of
+    a :class:`pytvdbapi.loader.PooledLoader`.
+    """
+
+    def __init__(self, path, max_size=100 * 1024 * 1024, compress=True):
+        if max_size < 0:
+            raise error.TVDBValueError(u"max_size should not be negative")
+
+        self.path, self.max_size, self.compress = os.path.abspath(path), max_size, compress
+        self.size = 0
+
+        self._lock = threading.Lock()
+        self._entries = dict()  # Maps the file name to a tuple (last access, size)
+        self._accesses = list()  # A heap of (last access, name), may hold outdated accesses
+        self._counter = itertools.count()
+
+        self._scan()
+
+    def __getstate__(self):
+        # The index is rebuilt from the cache directory when unpickled
+        return {'path': self.path, 'max_size': self.max_size, 'compress': self.compress}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'], state['max_size'], state['compress'])
+
+    def _scan(self):
+        """Builds the index of the entries already stored in the cache directory"""
+        found = list()
+        for root, _, files in os.walk(self.path):
+            for name in files:
+                if len(name) != 40:  # Not a cache entry
+                    continue
+                try:
+                    stat = os.stat(os.path.join(root, name))
+                except OSError:  # pragma: no cover
+                    continue
+                found.append((stat.st_mtime, name, stat.st_size))
+
+        for _, name, size in sorted(found):
+            self._touch(name, size)
+            self.size += size
+
+        logger.debug(u"Found {0} cache entries using {1} bytes".format(len(self._entries), self.size))
+
+    def _touch(self, name, size):
+        """
+        Marks the entry *name* of *size* bytes as the most recently used. Must be called holding the lock.
+        """
+        access = next(self._counter)
+        self._entries[name] = (access, size)
+        heapq.heappush(self._accesses, (access, name))
+
+        # Drop the outdated accesses once they dominate the heap
+        if len(self._accesses) > 2 * len(self._entries) + 64:
+            self._accesses = [(a, n) for n, (a, _) in self._entries.items()]
+            heapq.heapify(self._accesses)
+
+    def _file(self, name):
+        """
+        :return: The path of the file storing the entry *name*
+        """
+        return os.path.join(self.path, name[:2], name[2:4], name)
+
+    @staticmethod
+    def _name(key):
+        """
+        :return: The file name to store the entry for *key* in
+        """
+        return hashlib.sha1(make_bytes(key)).hexdigest()
+
+    def get(self, key):
+        """
+        :param key: The key to get the value for
+        :return: The stored value or None if the key is not in the cache
+        """
+        name = self._name(key)
+        path = self._file(name)
+
+        try:
+            with open(path, 'rb') as handle:
+                data = handle.read()
+            os.utime(path, None)
+        except (IOError, OSError):
+            return None
+
+        with self._lock:
+            if name in self._entries:
+                self._touch(name, self._entries[name][1])
+
+        if data[:1] == _COMPRESSED:
+            return zlib.decompress(data[1:])
+        return data[1:]
+
+    def set(self, key, value):
+        """
+        :param key: The key to store the value under
+        :param value: The value to store, bytes
+
+        Stores *value* in the cache, evicting the least recently used entries if needed.
+        """
+        name = self._name(key)
+        path = self._file(name)
+
+        value = make_bytes(value)
+        if self.compress:
+            data = _COMPRESSED + zlib.compress(value)
+        else:
+            data = _RAW + value
+
+        write_file(path, data)
+
+        with self._lock:
+            self.size += len(data) - self._entries.pop(name, (None, 0))[1]
+            self._touch(name, len(data))
+            evicted = self._evict()
+
+        for entry in evicted:
+            self._remove(entry)
+
+    def _evict(self):
+        """
+        :return: The names of the entries removed from the index to get within the size limit
+
+        Must be called holding the lock.
+        """
+        evicted = list()
+        while self.size > self.max_size and self._entries:
+            access, name = heapq.heappop(self._accesses)
+            if self._entries.get(name, (None,))[0] != access:
+                continue  # Outdated access
+
+            self.size -= self._entries.pop(name)[1]
+            evicted.append(name)
+
+        if evicted:
+            logger.debug(u"Evicted {0} cache entries".format(len(evicted)))
+        return evicted
+
+    def _remove(self, name):
+        """Removes the file storing the entry *name*"""
+        try:
+            os.remove(self._file(name))
+        except OSError:
+            pass
+
+    def delete(self, key):
+        """
+        :param key: The key to remove from the cache
+        """
+        name = self._name(key)
+
+        with self._lock:
+            self.size -= self._entries.pop(name, (None, 0))[1]
+
+        self._remove(name)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RecordCache(object):
+    """
+    :param path: The directory to store the cache in
+
+    A file based cache for the data parsed from the server responses. The
+    parsed data is stored compressed together with the validator of the
+    response it was parsed from, see :func:`pytvdbapi.loader.response_validator`.
+    As long as the server returns the same content, the parsed data can be
+    used directly without parsing the XML again.
+
+    The entries are keyed by the path and query of the url, so the same
+    resource loaded from different mirrors share the entry.
+
+    .. note:: The entries are stored using :mod:`pickle`, only use a directory
+        that is not writable by others.
+    """
+
+    #: The suffix of the cache entry files
+    suffix = '.records'
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+
+    def _file(self, url):
+        """
+        :return: The path of the file storing the entry for *url*
+        """
+        parts = urlsplit(url)
+        name = hashlib.sha1(make_bytes(u"{0}?{1}".format(parts.path, parts.query))).hexdigest()
+        return os.path.join(self.path, name[:2], name + self.suffix)
+
+    def get(self, url, validator):
+        """
+        :param url: The url the data was loaded from
+        :param validator: The validator of the response loaded from *url*
+        :return: The stored data or None if no data parsed from the same response is stored
+        """
+        try:
+            with open(self._file(url), 'rb') as handle:
+                stored, records = pickle.loads(zlib.decompress(handle.read()))
+        except (IOError, OSError):
+            return None
+        except Exception:  # pylint: disable=W0703
+            logger.warning(u"Ignoring corrupt cache entry for {0}".format(url))
+            return None
+
+        if stored != validator:
+            return None
+
+        logger.debug(u"Using cached data for {0}".format(url))
+        return records
+
+    def set(self, url, validator, records):
+        """
+        :param url: The url the data was loaded from
+        :param validator: The validator of the response loaded from *url*
+        :param records: The data parsed from the response, any picklable object
+
+        Stores *records*, replacing any data previously stored for *url*.
+        """
+        write_file(self._file(url), zlib.compress(pickle.dumps((validator, records), 2)))
+
+    def delete(self, url):
+        """
+        :param url: The url to remove the stored data for
+        """
+        try:
+            os.remove(self._file(url))
+        except OSError:
+            pass
@@ -0,0 +1,389 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2011 - 2014 Björn Larsson
+
+# This file is part of pytvdbapi.
+#
+# pytvdbapi is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pytvdbapi is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pytvdbapi.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+.. versionadded:: 0.6
+
+A module for keeping the episodes of a show column wise.
+
+An :class:`EpisodeTable` holds one column per field instead of one
+dictionary per episode. The integer, float and date fields are kept in
+:mod:`array` columns, the dates as their ordinal, and the other fields in
+lists, so each episode takes a fraction of the memory. The
+:class:`pytvdbapi.api.Episode` instances are created on first access as
+views of a row, see :class:`EpisodeRow`, and scanning a field, see
+:func:`EpisodeTable.scan`, only touches the column of that field.
+
+The table is used by :class:`pytvdbapi.api.Show` when the *columnar*
+keyword is given to :class:`pytvdbapi.api.TVDB`::
+
+    from pytvdbapi import api
+
+    db = api.TVDB("B43FF87DE395DF56", columnar=True)
+    show = db.get_series(79349, "en")
+
+    ratings = show.episode_table.column('Rating')
+    finales = show.filter(lambda rating: rating > 9.0, field='Rating')
+"""
+
+import array
+import datetime
+import logging
+from pytvdbapi._compat import string_types, SlottedMutableMapping
+from pytvdbapi.xmlhelpers import INTERN_TABLE, convert_field
+
+__all__ = ['EpisodeTable', 'EpisodeRow']
+
+logger = logging.getLogger(__name__)
+
+try:
+    array.array('q')
+    _INT_CODE = 'q'
+except ValueError:  # pragma: no cover
+    _INT_CODE = 'l'
+
+
+class _Missing(object):
+    """The type of :data:`_MISSING`, unpickled as the same instance"""
+
+    __slots__ = ()
+
+    def __reduce__(self):
+        return '_MISSING'
+
+    def __repr__(self):
+        return '_MISSING'
+
+
+#: Marks a field missing from a row in the list columns
+_MISSING = _Missing()
+
+# The codes of the empty and missing values in the typed columns, by type
+_INT_EMPTY = -2 ** (8 * array.array(_INT_CODE).itemsize - 1)
+_INT_MAX = -_INT_EMPTY - 1
+_CODES = {int: (_INT_EMPTY, _INT_EMPTY + 1), float: (float('nan'), float('-inf')), datetime.date: (0, -1)}
+
+
+def _is_blank(value):
+    """:return: True if *value* is missing or an empty string"""
+    return value is _MISSING or (isinstance(value, string_types) and not value)
+
+
+def _kind(value):
+    """:return: The type of the typed column able to hold *value*, or None"""
+    kind = type(value)
+    return kind if kind in (int, float, datetime.date) else None
+
+
+class _TypedColumn(object):
+    """
+    A column holding the values of a single type in an array, with codes
+    marking the empty and missing values.
+    """
+
+    __slots__ = ('kind', 'values', 'empty', 'missing')
+
+    def __init__(self, kind):
+        self.kind, (self.empty, self.missing) = kind, _CODES[kind]
+        self.values = array.array('d' if kind is float else _INT_CODE)
+
+    def __getstate__(self):
+        # Needed to pickle a class with __slots__ using the protocols before 2
+        return self.kind, self.values
+
+    def __setstate__(self, state):
+        self.kind, self.values = state
+        self.empty, self.missing = _CODES[self.kind]
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index):
+        return self._decode(self.values[index])
+
+    def __iter__(self):
+        decode = self._decode
+        return (decode(code) for code in self.values)
+
+    def _encode(self, value):
+        """:return: The code for *value* or None if it can not be held by the column"""
+        if value is _MISSING:
+            return self.missing
+        elif isinstance(value, string_types) and not value:
+            return self.empty
+        elif type(value) is not self.kind:
+            return None
+        elif self.kind is datetime.date:
+            return value.toordinal()
+        elif self.kind is int and value <= self.missing:
+            return None
+        return value
+
+    def _decode(self, code):
+        """:return: The value for *code*"""
+        if code == self.missing:
+            return _MISSING
+        elif code == self.empty or code != code:  # The empty float is NaN, never equal to itself
+            return u""
+        elif self.kind is datetime.date:
+            return datetime.date.fromordinal(code)
+        return code
+
+    def store(self, index, value):
+        """
+        :param index: The row, at most the length of the column
+        :param value: The value to store
+        :return: False if *value* can not be held by the column
+        """
+        code = self._encode(value)
+        if code is None:
+            return False
+
+        try:
+            if index == len(self.values):
+                self.values.append(code)
+            else:
+                self.values[index] = code
+        except OverflowError:
+            return False
+        return True
+
+
+class EpisodeTable(object):
+    """
+    .. versionadded:: 0.6
+
+    :param ignore_case: If True, the field names are case insensitive
+
+    Holds the data of the episodes of a show, one column per field. The
+    columns of the fields holding only integers, floats or dates, and empty
+    strings, are arrays. A column is turned into a list when a value of
+    another type is stored in it.
+    """
+
+    def __init__(self, ignore_case=False):
+        self.ignore_case = ignore_case
+        self.columns = dict()
+        self._fields, self._blank, self._length = list(), set(), 0
+
+    def __len__(self):
+        return self._length
+
+    def _key(self, field):
+        """:return: The name of the column holding *field*"""
+        if self.ignore_case:
+            try:
+                return field.lower()
+            except AttributeError:
+                return field
+        return field
+
+    def append(self, record):
+        """
+        :param record: A dictionary or a :class:`pytvdbapi.xmlhelpers.RawRecord`
+            with the data of an episode
+        :return: The index of the row added
+
+        The values of a :class:`pytvdbapi.xmlhelpers.RawRecord` are converted
+        when added, see :func:`pytvdbapi.xmlhelpers.convert_field`.
+        """
+        index, element = self._length, getattr(record, 'element', None)
+        columns, blank = self.columns, self._blank
+        self._length += 1
+
+        for field, value in record.items():
+            if element is not None:
+                value = convert_field(element, field, value)
+            key = self._key(field)
+
+            # Fast paths for appending to the existing columns
+            column = columns.get(key)
+            kind = column.__class__
+            if kind is _TypedColumn and type(value) is column.kind and len(column.values) == index:
+                if value.__class__ is datetime.date:
+                    column.values.append(value.toordinal())
+                    continue
+                elif value.__class__ is float or column.missing < value <= _INT_MAX:
+                    column.values.append(value)
+                    continue
+            elif kind is list and key not in blank and len(column) == index:
+                column.append(value)
+                continue
+
+            self._store(index, key, value)
+
+        if len(record) < len(self._fields) or self.ignore_case:
+            for key in self._fields:  # Mark the fields not in *record* as missing
+                if len(columns[key]) == index:
+                    self._store(index, key, _MISSING)
+        return index
+
+    def _store(self, index, key, value):
+        """Stores *value* in the column *key* of the row *index*, adding the column if needed"""
+        column = self.columns.get(key)
+        if column is None:
+            key = INTERN_TABLE.intern(key)
+            column = self.columns[key] = [_MISSING] * min(index, self._length)
+            self._fields.append(key)
+            self._blank.add(key)
+
+        if isinstance(column, _TypedColumn):
+            if column.store(index, value):
+                return
+            column = self.columns[key] = list(column)
+        elif key in self._blank and _kind(value) is not None:
+            typed = _TypedColumn(_kind(value))
+            for position, blank in enumerate(column):
+                typed.store(position, blank)
+            if typed.store(index, value):
+                self.columns[key] = typed
+                self._blank.discard(key)
+                return
+
+        if index == len(column):
+            column.append(value)
+        else:
+            column[index] = value
+
+        if key in self._blank and not _is_blank(value):
+            self._blank.discard(key)
+
+    def value(self, index, field):
+        """
+        :param index: The index of the row
+        :param field: The name of the field
+        :return: The value of *field* in the row *index*
+        :raise: KeyError if the row has no such field
+        """
+        value = self.columns[self._key(field)][index]
+        if value is _MISSING:
+            raise KeyError(field)
+        return value
+
+    def set(self, index, field, value):
+        """
+        :param index: The index of the row
+        :param field: The name of the field
+        :param value: The new value of *field* in the row *index*
+        """
+        key = self._key(field)
+        if key not in self.columns:
+            self._store(self._length - 1, key, _MISSING)  # Add the column for all rows
+        self._store(index, key, value)
+
+    def delete(self, index, field):
+        """
+        :param index: The index of the row
+        :param field: The name of the field to remove from the row *index*
+        :raise: KeyError if the row has no such field
+        """
+        self.value(index, field)
+        self._store(index, self._key(field), _MISSING)
+
+    def fields(self, index):
+        """
+        :param index: The index of the row
+        :return: A list of the fields of the row *index*
+        """
+        return [key for key in self._fields if self.columns[key][index] is not _MISSING]
+
+    def row(self, index):
+        """
+        :param index: The index of the row
+        :return: An :class:`EpisodeRow` view of the row *index*
+        """
+        return EpisodeRow(self, index)
+
+    def scan(self, field):
+        """
+        :param field: The name of the field
+        :return: A generator of tuples *(index, value)* for the rows having *field*
+
+        Only the column of *field* is read, so scanning is much cheaper than
+        going through the episodes.
+        """
+        column = self.columns.get(self._key(field), ())
+        for index, value in enumerate(column):
+            if value is not _MISSING:
+                yield index, value
+
+    def column(self, field, default=None):
+        """
+        :param field: The name of the field
+        :param default: The value for the rows not having *field*
+        :return: A list of the values of *field* in all rows
+        """
+        column = self.columns.get(self._key(field))
+        if column is None:
+            return [default] * self._length
+        return [default if value is _MISSING else value for value in column]
+
+
+class EpisodeRow(SlottedMutableMapping):
+    """
+    .. versionadded:: 0.6
+
+    :param table: The :class:`EpisodeTable` holding the data
+    :param index: The index of the row
+
+    A mapping of the fields of a row in an :class:`EpisodeTable`, used as
+    the data of the :class:`pytvdbapi.api.Episode` views. It holds no data of
+    its own, so the views are cheap to create.
+    """
+
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table, index):
+        self.table, self.index = table, index
+
+    def __reduce__(self):
+        return EpisodeRow, (self.table, self.index)
+
+    def __getitem__(self, item):
+        return self.table.value(self.index, item)
+
+    def __setitem__(self, key, value):
+        self.table.set(self.index, key, value)
+
+    def __delitem__(self, key):
+        self.table.delete(self.index, key)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def keys(self):
+        """
+        :return: A list of the fields of the row
+        """
+        return self.table.fields(self.index)
+
+    def items(self):
+        """
+        :return: A list of all items of the row
+        """
+        return [(key, self.table.value(self.index, key)) for key in self.keys()]
+
+    def values(self):
+        """
+        :return: A list of the values of the row
+        """
+        return [self.table.value(self.index, key) for key in self.keys()]
@@ -18,41 +18,306 @@
 # along with pytvdbapi.  If not, see <http://www.gnu.org/licenses/>.
 
 """
-A module providing the default loader to use to load urls.
+A module providing the loaders used to load urls.
+
+A loader is any object implementing the :class:`BaseLoader` interface. The
+default :class:`Loader` uses a single httplib2 connection object while the
+:class:`PooledLoader` keeps a pool of persistent connections that can be
+shared between threads. The :class:`RecordingLoader` and :class:`ReplayLoader`
+can be used to record the responses into a corpus directory and later serve
+them without any network access.
 """
 
+import hashlib
+import json
 import logging
 import os
+import threading
+import time
 import zipfile
 from io import BytesIO
 
+# pylint: disable=F0401
+try:
+    from queue import Queue, Empty
+except ImportError:
+    from Queue import Queue, Empty
+
+# pylint: disable=F0401
+try:
+    from urlparse import urlsplit, urlunsplit
+except ImportError:
+    from urllib.parse import urlsplit, urlunsplit
+
 import httplib2
 
-from pytvdbapi import error
+from pytvdbapi import error, tracing
+from pytvdbapi._compat import string_types
+from pytvdbapi.scheduler import Priority
+from pytvdbapi.utils import SingleFlight
 
 
+__all__ = ['canonical_url', 'current_priority', 'response_validator', 'BaseLoader', 'Loader', 'PooledLoader',
+           'RecordingLoader', 'ReplayLoader']
+
 # Module logger object
 logger = logging.getLogger(__name__)
 
+# The priority of the load in progress in the current thread
+_state = threading.local()
+
+
+def canonical_url(url):
+    """
+    :param url: The url to normalize
+    :return: *url* with the scheme and host in lower case and without any fragment
+
+    Two urls with the same canonical url refer to the same resource.
+    """
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, parts.query, ''))
+
+
+def current_priority():
+    """
+    :return: The :class:`pytvdbapi.scheduler.Priority` of the load in progress in the current thread
+
+    Makes the priority passed to :func:`BaseLoader.load` available to the
+    :func:`BaseLoader.fetch` implementation.
+    """
+    return getattr(_state, 'priority', Priority.NORMAL)
+
+
+def response_validator(response, content):
+    """
+    :param response: The response headers
+    :param content: The response body as bytes
+    :return: A string identifying the version of the response content
+
+    Uses the *ETag* or *Last-Modified* header sent by the server if available,
+    otherwise a digest of *content*. Two responses for the same url with the
+    same validator have the same content.
+    """
+    if response.get('etag'):
+        return u'etag:{0}'.format(response['etag'])
+    elif response.get('last-modified'):
+        return u'modified:{0}:{1}'.format(response['last-modified'], len(content))
+    else:
+        return u'sha1:{0}'.format(hashlib.sha1(content).hexdigest())
+
+
+def _source(response):
+    """
+    :return: Where *response* was taken from, *cache*, *revalidated* or *network*
+    """
+    if not getattr(response, 'fromcache', False):
+        return u"network"
+
+    # httplib2 keeps the status of the 304 response in the headers of the cached response
+    return u"revalidated" if response.get('status') == '304' else u"cache"
 
-class Loader(object):
+
+class BaseLoader(object):
+    """
+    .. versionadded:: 0.6
+
+    The interface used by :class:`pytvdbapi.api.TVDB` to load data from the
+    server. A custom loader should subclass this class and implement the
+    :func:`fetch` function, the unpacking of the response into a file like
+    object is handled by :func:`load`.
     """
+
+    def fetch(self, url, cache=True):
+        """
+        :param url: The URL to be loaded
+        :param cache: Optional. Set if the cache should be ignored or not.
+        :return: A tuple *(response, content)* where *response* is a dictionary
+            like object holding the response headers and *content* the raw
+            response body as bytes.
+        :raise: ConnectionError if the url could not be loaded, TVDBNotFoundError
+            if the server does not have the requested data.
+        """
+        raise NotImplementedError("Not implemented")
+
+    #: The functions called with the outcome of each load, see :func:`add_listener`
+    listeners = ()
+
+    def add_listener(self, listener):
+        """
+        :param listener: A callable to call after each load
+
+        Registers a function to be called after each call to :func:`load`. It is
+        called as *listener(url, elapsed, response, size, exception)* where
+        *elapsed* is the time in seconds spent fetching the data, *response* the
+        response headers, *size* the size of the response body in bytes and
+        *exception* the :class:`pytvdbapi.error.PytvdbapiError` raised by
+        :func:`fetch`, if any. *response* is None if an exception was raised.
+        """
+        self.listeners = tuple(self.listeners) + (listener,)
+
+    def remove_listener(self, listener):
+        """
+        :param listener: A callable registered with :func:`add_listener`
+
+        Stops calling *listener* after each load.
+        """
+        self.listeners = tuple(l for l in self.listeners if l is not listener)
+
+    def _notify(self, url, elapsed, response, size, exception):
+        """Calls all registered listeners"""
+        for listener in self.listeners:
+            listener(url, elapsed, response, size, exception)
+
+    def load(self, url, cache=True, priority=Priority.NORMAL):
+        """
+        .. versionchanged:: 0.6 Added the *priority* parameter
+
+        :param url: The URL to be loaded
+        :param cache: Optional. Set if the cache should be ignored or not.
+        :param priority: Optional. The :class:`pytvdbapi.scheduler.Priority` of the request, used
+            by loaders limiting the request rate.
+        :return: A file like object representing the loaded file content
+        :raise: ConnectionError if the url could not be loaded
+
+        Zip responses are unpacked and the contained xml file is returned as a
+        stream decompressing the data as it is read, so the unpacked content is
+        never held in memory as a whole while it is parsed.
+        """
+        response, content = self._load(url, cache, priority)
+        return self._unpack(url, response, content)
+
+    def load_validated(self, url, cache=True, priority=Priority.NORMAL):
+        """
+        :param url: The URL to be loaded
+        :param cache: Optional. Set if the cache should be ignored or not.
+        :param priority: Optional. The :class:`pytvdbapi.scheduler.Priority` of the request.
+        :return: A tuple *(validator, data)* where *validator* identifies the version of the
+            loaded content, see :func:`response_validator`, and *data* is the file like
+            object returned by :func:`load`.
+        :raise: ConnectionError if the url could not be loaded
+        """
+        response, content = self._load(url, cache, priority)
+        return response_validator(response, content), self._unpack(url, response, content)
+
+    def invalidate(self, url):  # pylint: disable=R0201,W0613
+        """
+        :param url: The URL to remove the cached data for
+
+        Removes any cached response for *url*, so the next load fetches the data
+        from the server. Loaders without a cache do nothing.
+        """
+        return None
+
+    def _load(self, url, cache, priority):
+        """
+        :return: The tuple *(response, content)* returned by :func:`fetch`
+
+        Fetches the data, notifying the listeners of the outcome.
+        """
+        previous, _state.priority = current_priority(), priority
+
+        with tracing.span('load', url=url) as span:
+            start = time.time()
+            try:
+                response, content = self.fetch(url, cache)
+            except error.PytvdbapiError as _error:
+                self._notify(url, time.time() - start, None, 0, _error)
+                raise
+            finally:
+                _state.priority = previous
+            self._notify(url, time.time() - start, response, len(content), None)
+
+            span.set(size=len(content), source=_source(response))
+            return response, content
+
+    def _unpack(self, url, response, content):
+        """
+        :return: A file like object with the content, unpacked if it is a zip file
+        """
+        if response.get('content-type') == "application/zip":
+            zip_file = zipfile.ZipFile(BytesIO(content))
+            filename = os.path.splitext(os.path.basename(url))[0]
+            return zip_file.open('{0}.xml'.format(filename))
+        else:
+            return BytesIO(content)
+
+
+class Loader(BaseLoader):
+    """
+    :param cache_path: The directory to use for caching the server requests, or a cache object
+        implementing the httplib2 cache interface such as :class:`pytvdbapi.cache.BoundedFileCache`
+    :param timeout: When set to a number, will cause the http request to timeout after that number of seconds
+    :param scheduler: A :class:`pytvdbapi.scheduler.RequestScheduler` limiting the rate of the
+        requests sent to the server
+
     An object for loading data from a provided url.
     Uses httplib2 to do the heavy lifting.
+
+    The loader is safe to use from multiple threads but will only perform one
+    request at a time, use :class:`PooledLoader` for concurrent requests.
     """
 
-    def __init__(self, cache_path, timeout=None):
-        self.http = httplib2.Http(cache=os.path.abspath(cache_path),
-                                  timeout=timeout)
+    def __init__(self, cache_path, timeout=None, scheduler=None):
+        self.cache_path, self.timeout = cache_path, timeout
+        self.scheduler = scheduler
+        self.http = self._create_http()
+
+        # httplib2.Http is not thread safe, serialize the requests made through it
+        self._http_lock = threading.Lock()
+        self._flights = SingleFlight()
 
-    def load(self, url, cache=True):
+    def __getstate__(self):
+        # The locks can not be pickled, they are recreated when unpickled
+        state = self.__dict__.copy()
+        del state['_http_lock'], state['_flights']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._http_lock = threading.Lock()
+        self._flights = SingleFlight()
+
+    def _create_http(self):
+        """
+        :return: A new :class:`httplib2.Http` instance using the loader configuration
+        """
+        cache = self.cache_path
+        if isinstance(cache, string_types):
+            cache = os.path.abspath(cache)
+        return httplib2.Http(cache=cache, timeout=self.timeout)
+
+    def invalidate(self, url):
+        cache = self.http.cache
+        if cache is not None:
+            cache.delete(httplib2.urlnorm(url)[-1])
+
+    def _request(self, url, headers):
+        """
+        :param url: The URL to request
+        :param headers: A dictionary with the request headers
+        :return: A tuple *(response, content)* as returned by :func:`httplib2.Http.request`
+        """
+        with self._http_lock:
+            return self.http.request(url, headers=headers)
+
+    def fetch(self, url, cache=True):
         """
         :param url: The URL to be loaded
         :param cache: Optional. Set if the cache should be ignored or not.
-        :return: A file like object representing the loaded file content
+        :return: A tuple *(response, content)*
         :raise: ConnectionError if the url could not be loaded
 
+        Concurrent requests for the same url are coalesced, only the first one
+        will hit the network and the others will wait for and share its response.
         """
+        return self._flights.do((canonical_url(url), cache), self._fetch, url, cache)
+
+    def _fetch(self, url, cache):
+        """
+        Loads the data from *url*, see :func:`fetch`
+        """
+        if self.scheduler is not None:
+            self.scheduler.acquire(current_priority())
 
         logger.debug(u"Loading data from {0}".format(url))
 
@@ -62,7 +327,7 @@ class Loader(object):
             header['cache-control'] = u'no-cache'
 
         try:
-            response, content = self.http.request(url, headers=header)
+            response, content = self._request(url, header)
         except (httplib2.RelativeURIError, httplib2.ServerNotFoundError):
             raise error.ConnectionError(u"Unable to connect to {0}".format(url))
 
@@ -71,9 +336,159 @@ class Loader(object):
         elif response.status not in [200, 304]:  # pragma: no cover
             raise error.ConnectionError(u"Bad status returned from server. {0}".format(response.status))
 
-        if response['content-type'] == "application/zip":
-            zip_file = zipfile.ZipFile(BytesIO(content))
-            filename = os.path.splitext(os.path.basename(url))[0]
-            return zip_file.open('{0}.xml'.format(filename))
-        else:
-            return BytesIO(content)
+        return response, content
+
+
+class PooledLoader(Loader):
+    """
+    .. versionadded:: 0.6
+
+    :param cache_path: The directory to use for caching the server requests, or a cache object
+        implementing the httplib2 cache interface such as :class:`pytvdbapi.cache.BoundedFileCache`
+    :param timeout: When set to a number, will cause the http request to timeout after that number of seconds
+    :param pool_size: The maximum number of connection objects to keep in the pool
+    :param scheduler: A :class:`pytvdbapi.scheduler.RequestScheduler` limiting the rate of the
+        requests sent to the server
+
+    A thread safe loader keeping a pool of :class:`httplib2.Http` instances. Each
+    instance keeps its connections alive and reuses them for all subsequent
+    requests to the same host, so a long running process only pays for the
+    connection setup once per pooled instance and host.
+
+    New instances are created on demand until *pool_size* is reached, after that
+    a thread wanting to load data will wait for an instance to be returned to
+    the pool.
+    """
+
+    def __init__(self, cache_path, timeout=None, pool_size=4, scheduler=None):
+        if pool_size < 1:
+            raise error.TVDBValueError(u"pool_size should be at least 1")
+
+        super(PooledLoader, self).__init__(cache_path, timeout, scheduler)
+
+        self.pool_size = pool_size
+        self._created = 1
+        self._lock = threading.Lock()
+        self._pool = Queue()
+        self._pool.put(self.http)
+
+    def __getstate__(self):
+        state = super(PooledLoader, self).__getstate__()
+        del state['_lock'], state['_pool']
+        state['_created'] = 1
+        return state
+
+    def __setstate__(self, state):
+        super(PooledLoader, self).__setstate__(state)
+        self._lock = threading.Lock()
+        self._pool = Queue()
+        self._pool.put(self.http)
+
+    def _acquire(self):
+        """
+        :return: A :class:`httplib2.Http` instance from the pool, creating a new
+            one if the pool is empty and not yet full.
+        """
+        try:
+            return self._pool.get_nowait()
+        except Empty:
+            with self._lock:
+                create = self._created < self.pool_size
+                if create:
+                    self._created += 1
+
+            if create:
+                logger.debug(u"Growing connection pool to {0}".format(self._created))
+                return self._create_http()
+            return self._pool.get()
+
+    def _request(self, url, headers):
+        http = self._acquire()
+        try:
+            return http.request(url, headers=headers)
+        finally:
+            self._pool.put(http)
+
+
+def _corpus_path(path, url):
+    """
+    :return: The base path, without extension, of the corpus entry for *url*
+    """
+    return os.path.join(path, hashlib.sha1(url.encode('utf-8')).hexdigest())
+
+
+class RecordingLoader(BaseLoader):
+    """
+    .. versionadded:: 0.6
+
+    :param loader: The :class:`BaseLoader` to load the data with
+    :param path: The corpus directory to record the responses into
+
+    Loads all data through *loader* and records every url together with the
+    response content type and body into the corpus directory. Urls the server
+    reports as not found are recorded as well. The corpus can then be served
+    by a :class:`ReplayLoader`.
+    """
+
+    def __init__(self, loader, path):
+        self.loader, self.path = loader, path
+
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path)
+
+    def _record(self, url, meta, content):
+        """Writes the corpus entry for *url*"""
+        base = _corpus_path(self.path, url)
+
+        with open(base + '.data', 'wb') as handle:
+            handle.write(content)
+
+        # Write the meta data last, it marks the entry as complete
+        with open(base + '.json', 'w') as handle:
+            json.dump(dict(meta, url=url), handle, sort_keys=True)
+
+    def fetch(self, url, cache=True):
+        try:
+            response, content = self.loader.fetch(url, cache)
+        except error.TVDBNotFoundError:
+            self._record(url, {'status': 404}, b'')
+            raise
+
+        logger.debug(u"Recording response from {0}".format(url))
+        self._record(url, {'status': 200, 'content-type': response.get('content-type')}, content)
+        return response, content
+
+    def invalidate(self, url):
+        self.loader.invalidate(url)
+
+
+class ReplayLoader(BaseLoader):
+    """
+    .. versionadded:: 0.6
+
+    :param path: The corpus directory to load the responses from
+
+    Serves the responses recorded by a :class:`RecordingLoader` without any
+    network access. It raises :class:`pytvdbapi.error.ConnectionError` when
+    asked for an url that is not part of the corpus.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def fetch(self, url, cache=True):
+        base = _corpus_path(self.path, url)
+
+        try:
+            with open(base + '.json', 'r') as handle:
+                meta = json.load(handle)
+        except IOError:
+            raise error.ConnectionError(u"{0} is not part of the corpus".format(url))
+
+        if meta['status'] == 404:
+            raise error.TVDBNotFoundError(u"Data not found")
+
+        with open(base + '.data', 'rb') as handle:
+            content = handle.read()
+
+        return {'content-type': meta['content-type']}, content
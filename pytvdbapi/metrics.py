@@ -0,0 +1,312 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2011 - 2014 Björn Larsson
+
+# This file is part of pytvdbapi.
+#
+# pytvdbapi is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pytvdbapi is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pytvdbapi.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+.. versionadded:: 0.6
+
+A module for collecting metrics about the requests made and the time spent
+processing the responses.
+
+The metrics are collected from the spans described in :mod:`pytvdbapi.tracing`
+and grouped by the url template, from :mod:`pytvdbapi.urls`, the request was
+made with. For each template the number of requests, errors,
+cache hits, revalidated responses (304) and bytes loaded are counted, and
+the network latency and the time spent in the *generate_tree*, *parse_xml*,
+*build* and *iterparse* stages are kept in histograms with fixed buckets. Recording a
+sample is cheap and uses constant memory, so the metrics can be left on.
+
+Basic usage::
+
+    from pytvdbapi import api
+
+    db = api.TVDB("B43FF87DE395DF56", metrics=True)
+    show = db.get_series(79349, "en")
+
+    print(db.metrics.snapshot()['series']['latency']['p90'])
+    print(db.metrics.prometheus())
+"""
+
+import bisect
+import logging
+import re
+import threading
+from string import Formatter
+
+from pytvdbapi import urls
+from pytvdbapi._compat import string_types
+from pytvdbapi.tracing import Hook
+
+__all__ = ['STAGES', 'Histogram', 'Metrics', 'template_name']
+
+logger = logging.getLogger(__name__)
+
+#: The processing stages timed
+STAGES = ('generate_tree', 'parse_xml', 'build', 'iterparse')
+
+#: The default histogram bucket bounds, in seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+#: The name used for urls not matching any template
+OTHER = u"other"
+
+
+def _compile_templates():
+    """
+    :return: A list of tuples *(name, regex)* matching the urls created from the templates in
+        :mod:`pytvdbapi.urls`
+    """
+    templates = list()
+    for name in sorted(vars(urls)):
+        value = getattr(urls, name)
+        if name.startswith('_') or not isinstance(value, string_types):
+            continue
+
+        pattern = u"".join(re.escape(literal) + (u".*?" if field is not None else u"")
+                           for literal, field, _, _ in Formatter().parse(value))
+        templates.append((name, re.compile(u"^" + pattern + u"$")))
+    return templates
+
+
+_TEMPLATES = _compile_templates()
+
+
+def template_name(url):
+    """
+    :param url: A url
+    :return: The name of the template in :mod:`pytvdbapi.urls` *url* was created from,
+        or *other* if it does not match any template
+    """
+    if url is None:
+        return OTHER
+
+    for name, regex in _TEMPLATES:
+        if regex.match(url):
+            return name
+    return OTHER
+
+
+class Histogram(object):
+    """
+    :param buckets: The upper bounds of the buckets
+
+    A histogram counting the observed values in buckets with fixed bounds.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # The last bucket holds the values above all bounds
+        self.count, self.sum, self.max = 0, 0.0, 0.0
+
+    def observe(self, value):
+        """
+        :param value: The value to add
+        """
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def percentile(self, fraction):
+        """
+        :param fraction: The percentile to estimate, as a fraction between 0 and 1
+        :return: The estimated value or None if no values have been observed
+
+        The value is interpolated within the bucket holding the percentile.
+        """
+        if self.count == 0:
+            return None
+
+        rank, seen = fraction * self.count, 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / count, self.max)
+            seen += count
+        return self.max  # pragma: no cover
+
+    def snapshot(self):
+        """
+        :return: A dictionary with the count, sum and the 50th, 90th and 99th percentiles
+        """
+        return {'count': self.count, 'sum': self.sum,
+                'p50': self.percentile(0.5), 'p90': self.percentile(0.9), 'p99': self.percentile(0.99)}
+
+
+class _Endpoint(object):
+    """The metrics collected for a single url template"""
+
+    def __init__(self, buckets):
+        self.requests, self.errors, self.cache_hits, self.not_modified, self.bytes = 0, 0, 0, 0, 0
+        self.latency = Histogram(buckets)
+        self.stages = dict((stage, Histogram(buckets)) for stage in STAGES)
+
+
+class Metrics(Hook):
+    """
+    :param buckets: The upper bounds, in seconds, of the histogram buckets
+
+    Collects the metrics for the loads and the processing of the responses
+    from the *load*, *generate_tree*, *parse_xml*, *build* and *iterparse* spans, see
+    :mod:`pytvdbapi.tracing`. Add the instance as a hook to a
+    :class:`pytvdbapi.tracing.Tracer` to collect the metrics of its spans.
+
+    The latency histogram only holds the loads that reached the server,
+    including the revalidated ones, so the cache hits do not hide the
+    network latency.
+
+    The metrics are safe to record from multiple threads.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._endpoints = dict()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _endpoint(self, name):
+        """
+        :return: The :class:`_Endpoint` for the template *name*. Must be called holding the lock.
+        """
+        try:
+            return self._endpoints[name]
+        except KeyError:
+            endpoint = self._endpoints[name] = _Endpoint(self.buckets)
+            return endpoint
+
+    def finish(self, span):
+        """
+        :param span: The :class:`pytvdbapi.tracing.Span` closed
+
+        Records the metrics of *span*.
+        """
+        if span.name == 'load':
+            self._record_load(span)
+        elif span.name in STAGES:
+            self.observe(span.lookup('url'), span.name, span.duration)
+
+    def _record_load(self, span):
+        """Records the outcome of the load described by *span*"""
+        attributes = span.attributes
+        name = template_name(attributes.get('url'))
+
+        with self._lock:
+            endpoint = self._endpoint(name)
+            endpoint.requests += 1
+            endpoint.bytes += attributes.get('size', 0)
+
+            if 'error' in attributes:
+                endpoint.errors += 1
+            elif attributes.get('source') == u"cache":
+                endpoint.cache_hits += 1
+            else:
+                if attributes.get('source') == u"revalidated":
+                    endpoint.not_modified += 1
+                endpoint.latency.observe(span.duration)
+
+    def observe(self, url, stage, elapsed):
+        """
+        :param url: The url of the response processed
+        :param stage: The processing stage, one of :data:`STAGES`
+        :param elapsed: The time in seconds spent in *stage*
+        """
+        name = template_name(url)
+        with self._lock:
+            self._endpoint(name).stages[stage].observe(elapsed)
+
+    def reset(self):
+        """
+        Discards all collected metrics.
+        """
+        with self._lock:
+            self._endpoints = dict()
+
+    def snapshot(self):
+        """
+        :return: A dictionary mapping the template names to a dictionary of the metrics collected
+
+        The metrics of each template are *requests*, *errors*, *cache_hits*,
+        *not_modified* and *bytes* and the histograms *latency*,
+        *generate_tree*, *parse_xml*, *build* and *iterparse*, see :func:`Histogram.snapshot`.
+        """
+        with self._lock:
+            result = dict()
+            for name, endpoint in self._endpoints.items():
+                data = {'requests': endpoint.requests, 'errors': endpoint.errors,
+                        'cache_hits': endpoint.cache_hits, 'not_modified': endpoint.not_modified,
+                        'bytes': endpoint.bytes, 'latency': endpoint.latency.snapshot()}
+                for stage, histogram in endpoint.stages.items():
+                    data[stage] = histogram.snapshot()
+                result[name] = data
+            return result
+
+    def prometheus(self, prefix=u"pytvdbapi"):
+        """
+        :param prefix: The prefix of the metric names
+        :return: The metrics in the Prometheus text exposition format
+        """
+        lines = list()
+
+        def _counter(name, description, attribute):
+            """Adds the lines of a counter"""
+            lines.append(u"# HELP {0}_{1} {2}".format(prefix, name, description))
+            lines.append(u"# TYPE {0}_{1} counter".format(prefix, name))
+            for template in sorted(self._endpoints):
+                lines.append(u'{0}_{1}{{endpoint="{2}"}} {3}'.format(
+                    prefix, name, template, getattr(self._endpoints[template], attribute)))
+
+        def _histogram(name, labels, histogram):
+            """Adds the lines of a histogram"""
+            seen = 0
+            for bound, count in zip(self.buckets + (u"+Inf",), histogram.counts):
+                seen += count
+                bound = bound if isinstance(bound, string_types) else u"{0:g}".format(bound)
+                lines.append(u'{0}_{1}_bucket{{{2},le="{3}"}} {4}'.format(prefix, name, labels, bound, seen))
+            lines.append(u"{0}_{1}_sum{{{2}}} {3!r}".format(prefix, name, labels, histogram.sum))
+            lines.append(u"{0}_{1}_count{{{2}}} {3}".format(prefix, name, labels, histogram.count))
+
+        with self._lock:
+            _counter(u"requests_total", u"The number of loads", 'requests')
+            _counter(u"errors_total", u"The number of failed loads", 'errors')
+            _counter(u"cache_hits_total", u"The number of loads served from the cache", 'cache_hits')
+            _counter(u"not_modified_total", u"The number of cached responses revalidated", 'not_modified')
+            _counter(u"bytes_total", u"The number of bytes loaded", 'bytes')
+
+            lines.append(u"# HELP {0}_latency_seconds The time spent loading from the server".format(prefix))
+            lines.append(u"# TYPE {0}_latency_seconds histogram".format(prefix))
+            for template in sorted(self._endpoints):
+                _histogram(u"latency_seconds", u'endpoint="{0}"'.format(template),
+                           self._endpoints[template].latency)
+
+            lines.append(u"# HELP {0}_stage_seconds The time spent processing the responses".format(prefix))
+            lines.append(u"# TYPE {0}_stage_seconds histogram".format(prefix))
+            for template in sorted(self._endpoints):
+                for stage in STAGES:
+                    _histogram(u"stage_seconds", u'endpoint="{0}",stage="{1}"'.format(template, stage),
+                               self._endpoints[template].stages[stage])
+
+        return u"\n".join(lines) + u"\n"
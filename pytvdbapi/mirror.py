@@ -24,7 +24,8 @@ A module for the management of thetvdb.com_ mirror servers.
 """
 
 import logging
-import random
+import threading
+import time
 
 from pytvdbapi import error
 from pytvdbapi.xmlhelpers import parse_xml
@@ -44,50 +45,170 @@ class TypeMask(object):
 
 
 class Mirror(object):
-    """Stores data about a pytvdbapi.com mirror server"""
+    """
+    Stores data about a pytvdbapi.com mirror server
+
+    .. versionchanged:: 0.6 Added the *latency* and *error_rate* statistics
+
+    The *latency* is an exponentially weighted moving average of the time in
+    seconds it takes to load data from the mirror, it is None until the first
+    successful load. The *error_rate* is the corresponding average of the
+    fraction of loads that failed, as of the time *updated* of the last load.
+    """
 
     def __init__(self, mirror_id, url, type_mask):
         self.mirror_id = mirror_id
         self.url = url
         self.type_mask = int(type_mask)
 
+        self.latency, self.error_rate = None, 0.0
+        self.updated = None
+
     def __repr__(self):
         return "<{0} ({1}:{2})>".format("Mirror", self.url, self.type_mask)
 
+    def current_error_rate(self, now, half_life):
+        """
+        :param now: The current time
+        :param half_life: The time in seconds it takes for the error rate to halve
+        :return: The error rate decayed by the time passed since the last load
+
+        Lets a mirror that stopped failing become healthy again, even if no load
+        is made from it in the meantime.
+        """
+        if self.updated is None or not half_life:
+            return self.error_rate
+        return self.error_rate * 0.5 ** (max(now - self.updated, 0.0) / half_life)
+
+    def record(self, elapsed, failed, alpha, half_life=None):
+        """
+        :param elapsed: The time in seconds the load took
+        :param failed: True if the load failed
+        :param alpha: The weight given to the new sample
+        :param half_life: The half life of the error rate, see :func:`current_error_rate`
+
+        Updates the statistics for the mirror with the outcome of a load.
+        """
+        now = time.time()
+        error_rate = self.current_error_rate(now, half_life)
+        self.error_rate = error_rate + alpha * ((1.0 if failed else 0.0) - error_rate)
+        self.updated = now
+
+        if not failed:
+            if self.latency is None:
+                self.latency = elapsed
+            else:
+                self.latency += alpha * (elapsed - self.latency)
+
 
 class MirrorList(object):
     """
     Managing a list of available mirrors
 
+    .. versionchanged:: 0.6 The mirror is selected based on the recorded latency and error rate
+
+    The outcome of the loads made from the mirrors should be reported using
+    :func:`record`, :func:`get_mirror` will then prefer the fastest of the
+    healthy mirrors. A mirror is considered healthy as long as its error rate
+    is below *max_error_rate*, so a failing mirror will automatically be
+    replaced by another one. The error rate halves every *error_half_life*
+    seconds, so a mirror that has recovered will eventually be used again.
+
     .. Note: The use of a Mirror List and different mirrors has been deprecated by
         the developers at `thetvdb.com <http://thetvdb.com>`_ and they will always
         return one and the same mirror information when requested. This functionality
         could and will be removed from future versions of **pytvdbapi**.
     """
 
+    #: The weight given to new samples in the moving averages
+    alpha = 0.2
+
+    #: Mirrors with an error rate above this are considered unhealthy
+    max_error_rate = 0.5
+
+    #: The time in seconds it takes for the error rate of a mirror to halve
+    error_half_life = 300.0
+
     def __init__(self, etree):
         self.data = [
             Mirror(m['id'], m['mirrorpath'], m['typemask'])
             for m in parse_xml(etree, 'Mirror')
         ]
 
+        self._lock = threading.Lock()
+
+        # Precompute the mirrors matching each of the known type masks
+        self._index = dict()
+        for type_mask in (TypeMask.XML, TypeMask.BANNER, TypeMask.ZIP):
+            self._matching(type_mask)
+
+    def __getstate__(self):
+        # The lock can not be pickled, it is recreated when unpickled
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
     def __len__(self):
         return len(self.data)
 
     def __iter__(self):
         return iter(self.data)
 
+    def _matching(self, type_mask):
+        """
+        :return: The list of mirrors matching *type_mask*
+        """
+        type_mask = int(type_mask)
+        try:
+            return self._index[type_mask]
+        except KeyError:
+            mirrors = [m for m in self.data if m.type_mask & type_mask == type_mask]
+            self._index[type_mask] = mirrors
+            return mirrors
+
     def get_mirror(self, type_mask):
         """
         :param type_mask:
         :return: A :class:`Mirror` object
         :raise: :class:`PytvdbapiError`
 
-        Returns a random :class:`Mirror` object that matches the provided type_mask.
+        Returns the fastest healthy :class:`Mirror` object that matches the provided
+        type_mask. Mirrors that have not been used yet are preferred, so each
+        mirror gets measured. If no mirror is healthy, the one with the lowest
+        error rate is returned.
         """
-        try:
-            return random.choice(
-                [m for m in self.data if
-                 int(m.type_mask) & int(type_mask) == int(type_mask)])
-        except IndexError:
+        mirrors = self._matching(type_mask)
+        if not mirrors:
             raise error.PytvdbapiError(u"No Mirror matching {0} found".format(type_mask))
+
+        now = time.time()
+        error_rates = dict((m.mirror_id, m.current_error_rate(now, self.error_half_life)) for m in mirrors)
+
+        healthy = [m for m in mirrors if error_rates[m.mirror_id] < self.max_error_rate]
+        if not healthy:
+            return min(mirrors, key=lambda m: error_rates[m.mirror_id])
+
+        return min(healthy, key=lambda m: m.latency or 0.0)
+
+    def record(self, url, elapsed, failed=False):
+        """
+        :param url: The url that was loaded
+        :param elapsed: The time in seconds the load took
+        :param failed: True if the load failed
+
+        Records the outcome of loading *url* on the mirror it was loaded from.
+        Urls not belonging to any of the mirrors are ignored.
+        """
+        for mirror in self.data:
+            if url.startswith(mirror.url):
+                with self._lock:
+                    mirror.record(elapsed, failed, self.alpha, self.error_half_life)
+
+                if failed:
+                    logger.debug(u"Failed loading from {0}, error rate {1:.2f}".format(
+                        mirror, mirror.error_rate))
+                break
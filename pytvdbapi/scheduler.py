@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2011 - 2014 Björn Larsson
+
+# This file is part of pytvdbapi.
+#
+# pytvdbapi is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pytvdbapi is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pytvdbapi.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+.. versionadded:: 0.6
+
+A module for limiting the rate of the requests sent to the server.
+
+The :class:`RequestScheduler` implements a token bucket allowing on average
+*rate* requests per second with bursts of up to *burst* requests. Requests
+waiting for the bucket to refill are served in :class:`Priority` order, so
+an interactive search does not have to wait behind queued background
+requests.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+from pytvdbapi import error
+
+__all__ = ['Priority', 'RequestScheduler']
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(object):
+    """An enum like class with the request priorities, lower values are served first"""
+    INTERACTIVE = 0
+    NORMAL = 1
+    BULK = 2
+
+
+class RequestScheduler(object):
+    """
+    :param rate: The average number of requests allowed per second
+    :param burst: The maximum number of requests allowed in a burst
+
+    A thread safe token bucket scheduler. Each request takes one token from the
+    bucket, which is refilled with *rate* tokens per second up to *burst*
+    tokens. When the bucket is empty, the requests wait and are let through in
+    priority order, requests with the same priority in the order they arrived.
+    """
+
+    def __init__(self, rate, burst=1):
+        if rate <= 0:
+            raise error.TVDBValueError(u"rate should be larger than 0")
+        elif burst < 1:
+            raise error.TVDBValueError(u"burst should be at least 1")
+
+        self.rate, self.burst = float(rate), burst
+
+        self._tokens, self._updated = float(burst), time.time()
+        self._condition = threading.Condition()
+        self._waiting = list()
+        self._counter = itertools.count()
+
+    def __getstate__(self):
+        # Only the configuration is kept, the unpickled scheduler starts with a full bucket
+        return {'rate': self.rate, 'burst': self.burst}
+
+    def __setstate__(self, state):
+        self.__init__(state['rate'], state['burst'])
+
+    def _refill(self):
+        """Adds the tokens accumulated since the last refill"""
+        now = time.time()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, priority=Priority.NORMAL):
+        """
+        :param priority: The :class:`Priority` of the request
+
+        Blocks until the request is allowed to be sent.
+        """
+        with self._condition:
+            ticket = (priority, next(self._counter))
+            heapq.heappush(self._waiting, ticket)
+
+            try:
+                while True:
+                    self._refill()
+
+                    if self._waiting[0] != ticket:
+                        # Wait for the requests ahead of us
+                        self._condition.wait()
+                    elif self._tokens >= 1:
+                        heapq.heappop(self._waiting)
+                        self._tokens -= 1
+                        return
+                    else:
+                        self._condition.wait((1 - self._tokens) / self.rate)
+            except BaseException:
+                if ticket in self._waiting:
+                    self._waiting.remove(ticket)
+                    heapq.heapify(self._waiting)
+                raise
+            finally:
+                # Let the next request in line re-evaluate its position
+                self._condition.notify_all()
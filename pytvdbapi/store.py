@@ -0,0 +1,391 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2011 - 2014 Björn Larsson
+
+# This file is part of pytvdbapi.
+#
+# pytvdbapi is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pytvdbapi is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pytvdbapi.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+.. versionadded:: 0.6
+
+A module providing a local SQLite database for the show data.
+
+The :class:`Store` keeps the data parsed from the server indexed on series
+id, season and episode number, DVD order, absolute number, air date and IMDB
+id, so looking up data already stored is an indexed local query instead of a
+download of the full series data.
+
+Basic usage::
+
+    from pytvdbapi import api
+
+    db = api.TVDB("B43FF87DE395DF56", store="/path/to/shows.db")
+    show = db.get_series(79349, "en")  # Loaded from the server and stored
+    show = db.get_series(79349, "en")  # Loaded from the store
+"""
+
+import contextlib
+import datetime
+import logging
+import sqlite3
+import threading
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+from pytvdbapi import error
+from pytvdbapi._compat import string_types
+from pytvdbapi.xmlhelpers import convert_field, intern_records
+
+__all__ = ['Store']
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = u"""
+CREATE TABLE IF NOT EXISTS series (
+    id INTEGER NOT NULL,
+    language TEXT NOT NULL,
+    imdb_id TEXT,
+    zap2it_id TEXT,
+    data BLOB NOT NULL,
+    PRIMARY KEY (id, language)
+);
+CREATE INDEX IF NOT EXISTS series_imdb_id ON series (imdb_id);
+CREATE INDEX IF NOT EXISTS series_zap2it_id ON series (zap2it_id);
+
+CREATE TABLE IF NOT EXISTS episodes (
+    id INTEGER NOT NULL,
+    language TEXT NOT NULL,
+    series_id INTEGER NOT NULL,
+    season INTEGER,
+    episode INTEGER,
+    dvd_season INTEGER,
+    dvd_episode REAL,
+    absolute INTEGER,
+    air_date TEXT,
+    imdb_id TEXT,
+    data BLOB NOT NULL,
+    PRIMARY KEY (id, language)
+);
+CREATE INDEX IF NOT EXISTS episodes_default ON episodes (series_id, language, season, episode);
+CREATE INDEX IF NOT EXISTS episodes_dvd ON episodes (series_id, language, dvd_season, dvd_episode);
+CREATE INDEX IF NOT EXISTS episodes_absolute ON episodes (series_id, language, absolute);
+CREATE INDEX IF NOT EXISTS episodes_air_date ON episodes (series_id, language, air_date);
+CREATE INDEX IF NOT EXISTS episodes_imdb_id ON episodes (imdb_id);
+
+CREATE TABLE IF NOT EXISTS extras (
+    series_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (series_id, kind)
+);
+"""
+
+#: The tables of the database
+_TABLES = (u"series", u"episodes", u"extras")
+
+# Maps the get_episode methods to the indexed columns and the keyword arguments to match them with
+_EPISODE_QUERIES = {
+    'default': (u"season = ? AND episode = ?", ('seasonnumber', 'episodenumber'), (int, int)),
+    'dvd': (u"dvd_season = ? AND dvd_episode = ?", ('seasonnumber', 'episodenumber'), (int, float)),
+    'absolute': (u"absolute = ?", ('absolutenumber',), (int,)),
+}
+
+
+def _dumps(data):
+    """
+    :return: *data* serialized for storing in a BLOB column
+    """
+    return sqlite3.Binary(pickle.dumps(data, 2))
+
+
+def _loads(data):
+    """
+    :return: The data serialized by :func:`_dumps`, with the values interned
+    """
+    data = pickle.loads(bytes(data))
+    intern_records(data if isinstance(data, list) else [data])
+    return data
+
+
+def _value(data, key, convert):
+    """
+    :return: The value of *key* in *data* converted using *convert*, None if missing or empty
+    """
+    try:
+        return convert(data[key])
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return None
+
+
+def _date(value):
+    """
+    :return: The iso formatted date *value*, converted first if it is unconverted text
+    """
+    if isinstance(value, string_types):
+        value = convert_field('Episode', 'FirstAired', value)
+    return value.isoformat()
+
+
+class Store(object):
+    """
+    :param path: The database file to use, *:memory:* for a database kept in memory
+
+    A local SQLite database holding the parsed series, episode, actor and banner
+    data. The data is stored in the same form as returned by
+    :func:`pytvdbapi.xmlhelpers.parse_xml`, in lists of dictionaries.
+
+    The store is safe to use from multiple threads.
+
+    .. note:: The data is stored using :mod:`pickle`, only use a database file
+        that is not writable by others.
+    """
+
+    def __init__(self, path=u":memory:"):
+        self.path = path
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(_SCHEMA)
+
+    def __getstate__(self):
+        # The connection can not be pickled, the rows of a database kept in memory are pickled instead
+        state = {'path': self.path}
+        if self.path == u":memory:":
+            state['rows'] = dict((table, self._execute(u"SELECT * FROM {0}".format(table)))
+                                 for table in _TABLES)
+        return state
+
+    def __setstate__(self, state):
+        self.__init__(state['path'])
+
+        with self._transaction():
+            for table, rows in state.get('rows', dict()).items():
+                if rows:
+                    self._connection.executemany(u"INSERT INTO {0} VALUES ({1})".format(
+                        table, u", ".join(u"?" * len(rows[0]))), rows)
+
+    def close(self):
+        """
+        Closes the database, the store can not be used after it has been closed.
+        """
+        with self._lock:
+            self._connection.close()
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        """
+        A context manager holding the lock and committing the changes made, or
+        rolling them back if an exception is raised.
+        """
+        with self._lock:
+            with self._connection:
+                yield
+
+    def _execute(self, query, *args):
+        """
+        :return: The rows returned by *query*
+        """
+        with self._lock:
+            return self._connection.execute(query, args).fetchall()
+
+    def save_series(self, language, data):
+        """
+        :param language: The language of the data
+        :param data: A dictionary holding the parsed full series data,
+            see :func:`pytvdbapi.xmlhelpers.parse_series`
+
+        Stores the series and all its episodes, replacing any episodes
+        previously stored for the series in *language*.
+        """
+        series = data['Series'][0]
+        series_id = int(series['id'])
+
+        with self._transaction():
+            self._connection.execute(
+                u"INSERT OR REPLACE INTO series VALUES (?, ?, ?, ?, ?)",
+                (series_id, language, series.get('IMDB_ID') or None, series.get('zap2it_id') or None,
+                 _dumps(series)))
+            self._connection.execute(
+                u"DELETE FROM episodes WHERE series_id = ? AND language = ?", (series_id, language))
+            self._connection.executemany(
+                u"INSERT OR REPLACE INTO episodes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [self._episode_row(language, e) for e in data['Episode']])
+
+        logger.debug(u"Stored series {0} with {1} episodes".format(series_id, len(data['Episode'])))
+
+    def save_episode(self, language, data):
+        """
+        :param language: The language of the data
+        :param data: A dictionary holding the parsed episode data
+        """
+        with self._transaction():
+            self._connection.execute(
+                u"INSERT OR REPLACE INTO episodes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                self._episode_row(language, data))
+
+    @staticmethod
+    def _episode_row(language, data):
+        """
+        :return: The row to store for the episode *data*
+        """
+        return (int(data['id']), language, int(data['seriesid']),
+                _value(data, 'SeasonNumber', int), _value(data, 'EpisodeNumber', int),
+                _value(data, 'DVD_season', int), _value(data, 'DVD_episodenumber', float),
+                _value(data, 'absolute_number', int), _value(data, 'FirstAired', _date),
+                data.get('IMDB_ID') or None, _dumps(data))
+
+    def save_extras(self, series_id, element, data):
+        """
+        :param series_id: The id of the series
+        :param element: The element name of the data, *Actor* or *Banner*
+        :param data: A list of the parsed data
+        """
+        with self._transaction():
+            self._connection.execute(u"INSERT OR REPLACE INTO extras VALUES (?, ?, ?)",
+                                     (int(series_id), element, _dumps(data)))
+
+    def load_series(self, series_id, language, id_type='tvdb'):
+        """
+        :param series_id: The id of the series
+        :param language: The language of the data
+        :param id_type: The kind of id provided, one of *('tvdb', 'imdb', 'zap2it')*
+        :return: A dictionary with the series data in the form returned by
+            :func:`pytvdbapi.xmlhelpers.parse_series`, with the additional keys
+            *Actor* and *Banner* holding the stored data or None. None if the
+            series is not stored.
+        :raise: :exc:`pytvdbapi.error.TVDBValueError`
+        """
+        if id_type == 'tvdb':
+            column = u"id"
+            series_id = _value({'id': series_id}, 'id', int)
+        elif id_type == 'imdb':
+            column, series_id = u"imdb_id", u"tt{0}".format(series_id)
+        elif id_type == 'zap2it':
+            column = u"zap2it_id"
+        else:
+            raise error.TVDBValueError("Invalid id type")
+
+        rows = self._execute(
+            u"SELECT id, data FROM series WHERE {0} = ? AND language = ?".format(column), series_id, language)
+        if not rows:
+            return None
+
+        series_id, series = rows[0][0], _loads(rows[0][1])
+        episodes = self._execute(u"SELECT data FROM episodes WHERE series_id = ? AND language = ? "
+                                 u"ORDER BY season, episode", series_id, language)
+
+        data = {'Series': [series], 'Episode': [_loads(row[0]) for row in episodes]}
+        for element in ('Actor', 'Banner'):
+            data[element] = self.load_extras(series_id, element)
+
+        return data
+
+    def load_extras(self, series_id, element):
+        """
+        :param series_id: The id of the series
+        :param element: The element name of the data, *Actor* or *Banner*
+        :return: The stored list of data or None
+        """
+        rows = self._execute(u"SELECT data FROM extras WHERE series_id = ? AND kind = ?",
+                             int(series_id), element)
+        return _loads(rows[0][0]) if rows else None
+
+    def load_episode(self, language, method="id", **kwargs):
+        """
+        :param language: The language of the data
+        :param method: The method to look up the episode with, see :func:`pytvdbapi.api.TVDB.get_episode`
+        :param kwargs: The keyword arguments for *method*
+        :return: The stored episode data or None
+        """
+        if method == 'id':
+            rows = self._execute(u"SELECT data FROM episodes WHERE id = ? AND language = ?",
+                                 _value(kwargs, 'episodeid', int), language)
+        else:
+            try:
+                condition, keys, types = _EPISODE_QUERIES[method]
+            except KeyError:
+                return None
+
+            values = [_value(kwargs, key, _type) for key, _type in zip(keys, types)]
+            series_id = _value(kwargs, 'seriesid', int)
+            if series_id is None or None in values:
+                return None
+
+            rows = self._execute(
+                u"SELECT data FROM episodes WHERE series_id = ? AND language = ? AND " + condition,
+                series_id, language, *values)
+
+        return _loads(rows[0][0]) if rows else None
+
+    def load_episode_by_air_date(self, series_id, language, air_date):
+        """
+        :param series_id: The id of the series
+        :param language: The language of the data
+        :param air_date: The air date of the episode
+        :type air_date: datetime.date
+        :return: The stored episode data or None
+        """
+        if not isinstance(air_date, datetime.date):
+            return None
+
+        rows = self._execute(
+            u"SELECT data FROM episodes WHERE series_id = ? AND language = ? AND air_date = ?",
+            _value({'id': series_id}, 'id', int), language, air_date.isoformat())
+        return _loads(rows[0][0]) if rows else None
+
+    def find_episodes(self, imdb_id):
+        """
+        :param imdb_id: The IMDB id of the episode
+        :return: A list with the data of all stored episodes with *imdb_id*, in all languages
+        """
+        rows = self._execute(u"SELECT data FROM episodes WHERE imdb_id = ?", imdb_id)
+        return [_loads(row[0]) for row in rows]
+
+    def episode_series(self, episode_ids):
+        """
+        :param episode_ids: The ids of the episodes
+        :return: A set with the ids of the stored series the episodes belong to
+        """
+        series_ids = set()
+        episode_ids = [int(episode_id) for episode_id in episode_ids]
+        for start in range(0, len(episode_ids), 500):  # Stay below the SQLite limit of bound parameters
+            chunk = episode_ids[start:start + 500]
+            rows = self._execute(u"SELECT DISTINCT series_id FROM episodes WHERE id IN ({0})".format(
+                u", ".join(u"?" * len(chunk))), *chunk)
+            series_ids.update(row[0] for row in rows)
+        return series_ids
+
+    def delete_series(self, series_id):
+        """
+        :param series_id: The id of the series
+
+        Removes the series, in all languages, together with its episodes, actors and banners.
+        """
+        with self._transaction():
+            for table, column in ((u"series", u"id"), (u"episodes", u"series_id"), (u"extras", u"series_id")):
+                self._connection.execute(
+                    u"DELETE FROM {0} WHERE {1} = ?".format(table, column), (int(series_id),))
+
+    def delete_episode(self, episode_id):
+        """
+        :param episode_id: The id of the episode
+
+        Removes the episode in all languages.
+        """
+        with self._transaction():
+            self._connection.execute(u"DELETE FROM episodes WHERE id = ?", (int(episode_id),))
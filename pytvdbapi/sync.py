@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2011 - 2014 Björn Larsson
+
+# This file is part of pytvdbapi.
+#
+# pytvdbapi is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pytvdbapi is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pytvdbapi.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+.. versionadded:: 0.6
+
+A module for keeping the locally cached data up to date.
+
+The :class:`Synchronizer` uses the updates feed provided by
+`thetvdb.com <http://thetvdb.com>`_ to find the series and episodes changed
+since the last synchronization. Only the cached data for those is removed
+and only the affected :class:`pytvdbapi.api.Show` instances are reloaded, so
+the work done scales with the amount of changes rather than with the amount
+of data cached.
+
+Basic usage::
+
+    from pytvdbapi import api
+
+    db = api.TVDB("B43FF87DE395DF56")
+    show = db.get_series(79349, "en")
+
+    # Later on, e.g. once a day
+    updates = db.sync()
+"""
+
+import json
+import logging
+import os
+
+from pytvdbapi import error
+from pytvdbapi._compat import make_bytes
+from pytvdbapi.scheduler import Priority
+from pytvdbapi.urls import time as server_time, updates as updates_url, series, actors, banners, episode
+from pytvdbapi.utils import write_file
+from pytvdbapi.xmlhelpers import generate_tree
+
+__all__ = ['Updates', 'Synchronizer', 'parse_updates']
+
+logger = logging.getLogger(__name__)
+
+
+class Updates(object):
+    """
+    :param time: The server time the updates are valid up to
+    :param series_ids: The ids of the series changed
+    :param episode_ids: The ids of the episodes changed
+
+    The changes reported by the server. The ids are available as the
+    *series* and *episodes* sets.
+    """
+
+    def __init__(self, time, series_ids=(), episode_ids=()):
+        self.time = time
+        self.series = frozenset(series_ids)
+        self.episodes = frozenset(episode_ids)
+
+    def __len__(self):
+        return len(self.series) + len(self.episodes)
+
+    def __repr__(self):
+        return u"<Updates - {0} series, {1} episodes>".format(len(self.series), len(self.episodes))
+
+
+def parse_updates(etree):
+    """
+    :param etree: An element tree holding the updates feed
+    :return: An :class:`Updates` instance
+    :raise: :class:`pytvdbapi.error.BadData`
+    """
+    time = etree.find('Time')
+    if time is None:
+        message = etree.find('Error')
+        raise error.BadData(u"Bad updates data received: {0}".format(
+            message.text if message is not None else u""))
+
+    try:
+        return Updates(int(time.text),
+                       (int(e.text) for e in etree.findall('Series')),
+                       (int(e.text) for e in etree.findall('Episode')))
+    except (TypeError, ValueError):
+        raise error.BadData(u"Bad updates data received")
+
+
+class Synchronizer(object):
+    """
+    :param api: The :class:`pytvdbapi.api.TVDB` instance to synchronize
+    :param path: The file to store the time of the last synchronization in.
+        Defaults to *updates.json* in the *cache_dir* of *api*.
+
+    Keeps the cached data and the shows loaded through *api* up to date. The
+    first synchronization only records the current server time, the following
+    ones process the changes made since the previous synchronization.
+
+    .. note:: `thetvdb.com <http://thetvdb.com>`_ only provides the changes
+        made during the last 30 days. If the last synchronization is older
+        than that, clear the cache and use :func:`reset`.
+    """
+
+    def __init__(self, api, path=None):
+        self.api = api
+        self.path = path if path is not None else os.path.join(api.config['cache_dir'], u'updates.json')
+
+    @property
+    def last_time(self):
+        """The server time of the last synchronization, or None"""
+        try:
+            with open(self.path, 'r') as handle:
+                return json.load(handle)['time']
+        except (IOError, OSError, ValueError, KeyError):
+            return None
+
+    def _save(self, time):
+        """Stores *time* as the time of the last synchronization"""
+        write_file(self.path, make_bytes(json.dumps({'time': time})))
+
+    def reset(self):
+        """
+        Forgets the time of the last synchronization.
+        """
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def check(self):
+        """
+        :return: An :class:`Updates` instance with the changes made since the last synchronization
+        :raise: :class:`pytvdbapi.error.BadData`
+
+        Asks the server for the changes without applying them.
+        """
+        last = self.last_time
+        if last is None:
+            url = server_time
+        else:
+            url = updates_url.format(time=last)
+
+        logger.debug(u"Checking for updates since {0}".format(last))
+        with self.api.tracer.span('sync', url=url):
+            return parse_updates(generate_tree(self.api.loader.load(url, False, Priority.BULK)))
+
+    def invalidate(self, updates, languages=None):
+        """
+        :param updates: The :class:`Updates` to apply
+        :param languages: The language abbreviations to invalidate the data for, defaults to all languages
+
+        Removes the cached data, and the data in the store of *api*, for the
+        changed series and episodes, so the next load fetches the data from the
+        server. The full data of the series holding a changed episode is removed
+        as well, as far as the series is known from the store or the loaded shows.
+        """
+        from pytvdbapi.api import __LANGUAGES__  # Imported here to avoid a circular import
+
+        languages = languages if languages is not None else list(__LANGUAGES__.keys())
+        context = {'api_key': self.api.config['api_key']}
+        series_ids = set(updates.series) | self._episode_series(updates.episodes)
+
+        urls = set()
+        for mirror in self.api.mirrors:
+            context['mirror'] = mirror.url
+
+            for series_id in series_ids:
+                context['seriesid'] = series_id
+                urls.update((actors.format(**context), banners.format(**context)))
+                urls.update(series.format(language=language, **context) for language in languages)
+
+            for episode_id in updates.episodes:
+                context['episodeid'] = episode_id
+                urls.update(episode.format(language=language, **context) for language in languages)
+
+        logger.debug(u"Invalidating {0} cached urls".format(len(urls)))
+        for url in urls:
+            self.api.loader.invalidate(url)
+
+        if self.api.store is not None:
+            for series_id in series_ids:
+                self.api.store.delete_series(series_id)
+            for episode_id in updates.episodes:
+                self.api.store.delete_episode(episode_id)
+
+        if updates.series:
+            self.api.search_buffer.clear()
+
+    def _episode_series(self, episode_ids):
+        """
+        :return: A set with the ids of the known series holding any of the episodes in *episode_ids*
+        """
+        if not episode_ids:
+            return set()
+
+        series_ids = set()
+        if self.api.store is not None:
+            series_ids.update(self.api.store.episode_series(episode_ids))
+
+        for show in self.api.shows():
+            if any(_episode.id in episode_ids for season in show.seasons.values() for _episode in season):
+                series_ids.add(show.id)
+
+        return series_ids
+
+    def refresh(self, updates):
+        """
+        :param updates: The :class:`Updates` to apply
+        :return: The list of :class:`pytvdbapi.api.Show` instances reloaded
+
+        Reloads the shows created by the api that are affected by *updates*.
+        Only shows with their full data loaded are reloaded, the others load
+        the up to date data when first used.
+        """
+        refreshed = list()
+
+        for show in self.api.shows():
+            if not show.seasons:
+                continue
+
+            changed = show.id in updates.series or any(
+                _episode.id in updates.episodes for season in show.seasons.values() for _episode in season)
+
+            if changed:
+                show.update()
+                refreshed.append(show)
+
+        logger.debug(u"Refreshed {0} shows".format(len(refreshed)))
+        return refreshed
+
+    def sync(self, refresh=True, languages=None):
+        """
+        :param refresh: If True, the affected shows are reloaded, see :func:`refresh`
+        :param languages: The languages to invalidate the data for, see :func:`invalidate`
+        :return: An :class:`Updates` instance with the changes applied
+
+        Checks for changes, removes the outdated data from the cache and reloads
+        the affected shows. The time of the synchronization is stored only once
+        all changes have been applied.
+        """
+        updates = self.check()
+
+        if self.last_time is not None:
+            self.invalidate(updates, languages)
+            if refresh:
+                self.refresh(updates)
+
+        self._save(updates.time)
+        return updates
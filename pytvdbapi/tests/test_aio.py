@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2011 - 2014 Björn Larsson
+
+# This file is part of pytvdbapi.
+#
+# pytvdbapi is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pytvdbapi is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pytvdbapi.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import absolute_import, print_function
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+from pytvdbapi import error
+from pytvdbapi.cache import RecordCache
+from pytvdbapi.store import Store
+from pytvdbapi.tests import basetest
+from pytvdbapi.tests.utils import series_loader, API_KEY
+
+try:
+    import asyncio
+    from pytvdbapi.aio import AsyncTVDB, AsyncLoader
+except (ImportError, SyntaxError):
+    asyncio = None
+
+# asyncio support requires Python 3.5, only collect the tests if available
+TestCase = basetest.pytvdbapiTest if asyncio is not None else object
+
+
+class TestAsyncTVDB(TestCase):
+    def setUp(self):
+        super(TestAsyncTVDB, self).setUp()
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.loader = series_loader()
+
+    def tearDown(self):
+        super(TestAsyncTVDB, self).tearDown()
+        asyncio.set_event_loop(None)
+        self.loop.close()
+
+    def _api(self, **kwargs):
+        api = AsyncTVDB(API_KEY, loader=AsyncLoader(self.loader, max_workers=4), **kwargs)
+        self.addCleanup(api.close)
+        return api
+
+    def test_search(self):
+        """It should be possible to await a search"""
+        result = self.loop.run_until_complete(self._api().search("Test Show", "en"))
+
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0].SeriesName, "Test Show")
+
+    def test_get_series(self):
+        """It should be possible to await several series concurrently"""
+        api = self._api()
+        shows = self.loop.run_until_complete(
+            asyncio.gather(*[api.get_series(1000, "en") for _ in range(5)]))
+
+        for show in shows:
+            self.assertEqual(len(show), 3)
+            self.assertEqual(show[1][3].EpisodeName, "Trois")
+
+    def test_invalid_series_id(self):
+        """A missing series should raise TVDBIdError"""
+        self.assertRaises(error.TVDBIdError, self.loop.run_until_complete,
+                          self._api().get_series(1, "en"))
+
+    def test_get_episode(self):
+        """It should be possible to await a single episode"""
+        episode = self.loop.run_until_complete(self._api().get_episode("en", episodeid=5102))
+
+        self.assertEqual(episode.EpisodeName, "The Second One")
+        self.assertEqual(episode.season, None)
+
+    def test_extras(self):
+        """Actors and banners should be loaded without blocking if configured"""
+        show = self.loop.run_until_complete(
+            self._api(actors=True, banners=True).get_series(1000, "en"))
+
+        self.assertEqual(len(show.actor_objects), 2)
+        self.assertEqual(len(show.banner_objects), 2)
+
+    def test_update(self):
+        """It should be possible to await the full data set of a show from a search"""
+        api = self._api()
+        show = self.loop.run_until_complete(api.search("Test Show", "en"))[0]
+        self.loop.run_until_complete(api.update(show))
+
+        self.assertEqual(show.Status, "Continuing")
+        self.assertEqual(len(show.seasons), 3)
+
+        self.loop.run_until_complete(api.load_actors(show))
+        self.assertEqual(show.actor_objects[0].Name, "Alice Actor")
+
+    def test_record_cache(self):
+        """The record cache should be used for the full series data"""
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path, True)
+
+        api = self._api(record_cache=RecordCache(path))
+        cold = self.loop.run_until_complete(api.get_series(1000, "en"))
+        warm = self.loop.run_until_complete(api.get_series(1000, "en"))
+
+        self.assertEqual(len(os.listdir(path)), 1)
+        self.assertEqual(warm[2][2].EpisodeName, cold[2][2].EpisodeName)
+
+    def test_store(self):
+        """A stored series should be loaded without any requests"""
+        api = self._api(store=Store(), actors=True)
+        self.loop.run_until_complete(api.get_series(1000, "en"))
+        self.loader.requests = list()
+
+        show = self.loop.run_until_complete(api.get_series(1000, "en"))
+        episode = self.loop.run_until_complete(api.get_episode("en", episodeid=5103))
+
+        self.assertEqual(self.loader.requests, [])
+        self.assertEqual(len(show.actor_objects), 2)
+        self.assertEqual(episode.EpisodeName, "Trois")
+
+    def test_worker_threads(self):
+        """The parsing and the store accesses should not run on the event loop thread"""
+        api = self._api(store=Store())
+        threads = set()
+
+        def record(func):
+            def _wrapper(*args, **kwargs):
+                threads.add(threading.current_thread())
+                return func(*args, **kwargs)
+            return _wrapper
+
+        api.tvdb._parse = record(api.tvdb._parse)
+        api.tvdb.store.load_series = record(api.tvdb.store.load_series)
+        api.tvdb.store.save_series = record(api.tvdb.store.save_series)
+        self.loop.run_until_complete(api.get_series(1000, "en"))
+        self.loop.run_until_complete(api.get_series(1000, "en"))
+
+        self.assertTrue(threads)
+        self.assertNotIn(threading.current_thread(), threads)
+
+    def test_update_worker_thread(self):
+        """The full data of an updated show should not be set on the event loop thread"""
+        api = self._api()
+        show = self.loop.run_until_complete(api.search("Test Show", "en"))[0]
+        threads = list()
+
+        original = show._set_data
+        show._set_data = lambda data: threads.append(threading.current_thread()) or original(data)
+        self.loop.run_until_complete(api.update(show))
+
+        self.assertEqual(len(threads), 1)
+        self.assertNotEqual(threads[0], threading.current_thread())
+        self.assertEqual(len(show.seasons), 3)
+
+
+if __name__ == "__main__":
+    sys.exit(unittest.main())
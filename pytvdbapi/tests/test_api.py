@@ -19,16 +19,21 @@
 
 from __future__ import absolute_import, print_function
 
+import os
 import sys
 import unittest
 import datetime
+import shutil
+import tempfile
 from io import StringIO
 
 import pytvdbapi
 from pytvdbapi import error
 from pytvdbapi.api import TVDB, Episode, Show
-from pytvdbapi.xmlhelpers import generate_tree
+from pytvdbapi.cache import RecordCache
+from pytvdbapi.xmlhelpers import generate_tree, EtreeParser
 from pytvdbapi.tests import basetest
+from pytvdbapi.tests.utils import series_loader
 from pytvdbapi._compat import make_unicode
 
 
@@ -40,6 +45,16 @@ def _load_show(show):
     return search[0]
 
 
+class PidParser(EtreeParser):
+    """A parser recording the id of the process parsing the data"""
+
+    def parse(self, xml_data, elements, lazy=False, fields=None):
+        result = super(PidParser, self).parse(xml_data, elements, lazy, fields)
+        for record in result['Series']:
+            record['ParsedBy'] = os.getpid()
+        return result
+
+
 class TestApi(basetest.pytvdbapiTest):
     """
     These tests involve loading data from a remote server. This is far from
@@ -952,5 +967,286 @@ class TestFilterSeason(unittest.TestCase):
         eps = self.season.filter(key=Key())
         self.assertEqual(len(eps), 6)
 
+
+class TestGetMany(unittest.TestCase):
+    def setUp(self):
+        self.api = TVDB("B43FF87DE395DF56", loader=series_loader())
+
+    def test_get_series_many(self):
+        """It should be possible to fetch several shows concurrently"""
+        shows = list(self.api.get_series_many([1000] * 10, "en", max_workers=3))
+
+        self.assertEqual(len(shows), 10)
+        for show in shows:
+            self.assertEqual(show.SeriesName, "Test Show")
+
+    def test_as_completed(self):
+        """It should be possible to get the shows as they are completed"""
+        shows = list(self.api.get_series_many([1000] * 5, "en", ordered=False))
+        self.assertEqual(len(shows), 5)
+
+    def test_errors(self):
+        """Errors should be raised, or returned if return_exceptions is True"""
+        self.assertRaises(error.TVDBIdError, list, self.api.get_series_many([1000, 1], "en"))
+
+        result = list(self.api.get_series_many([1, 1000], "en", return_exceptions=True))
+        self.assertEqual(type(result[0]), error.TVDBIdError)
+        self.assertEqual(type(result[1]), Show)
+
+    def test_get_episodes_many(self):
+        """It should be possible to fetch several episodes concurrently"""
+        episodes = list(self.api.get_episodes_many([5102, {'episodeid': 5102}], "en"))
+
+        self.assertEqual(len(episodes), 2)
+        for episode in episodes:
+            self.assertEqual(episode.EpisodeName, "The Second One")
+
+
+class TestProjection(unittest.TestCase):
+    def setUp(self):
+        self.api = TVDB("B43FF87DE395DF56", loader=series_loader())
+
+    def test_fields(self):
+        """Only the requested fields, and the required ones, should be loaded"""
+        show = self.api.get_series(1000, "en", fields=['FirstAired'],
+                                   episode_fields=['EpisodeName', 'FirstAired'])
+
+        self.assertEqual(show.SeriesName, "Test Show")
+        self.assertTrue(isinstance(show.FirstAired, datetime.date))
+        self.assertRaises(error.TVDBAttributeError, getattr, show, 'Overview')
+
+        episode = show[1][2]
+        self.assertEqual(episode.EpisodeName, "The Second One")
+        self.assertEqual(episode.FirstAired, datetime.date(2010, 1, 12))
+        self.assertEqual(sorted(episode.data.keys()),
+                         ['EpisodeName', 'EpisodeNumber', 'FirstAired', 'SeasonNumber', 'id'])
+
+    def test_no_episodes(self):
+        """Without episodes the show should have no seasons, and not load them on access"""
+        show = self.api.get_series(1000, "en", episodes=False)
+        self.assertEqual(show.SeriesName, "Test Show")
+
+        calls, original = list(), self.api._series_data
+        self.api._series_data = lambda *args, **kwargs: calls.append(args) or original(*args, **kwargs)
+        self.assertEqual(len(show), 0)
+        self.assertEqual(list(show), [])
+        self.assertEqual(len(calls), 0)
+
+    def test_update(self):
+        """The projection should be kept when the show is updated"""
+        show = self.api.get_series(1000, "en", episode_fields=['EpisodeName'])
+        show.update()
+        self.assertRaises(error.TVDBAttributeError, getattr, show[1][2], 'Overview')
+
+    def test_record_cache(self):
+        """A projected show should not be written to the record cache"""
+        path = tempfile.mkdtemp()
+        try:
+            api = TVDB("B43FF87DE395DF56", loader=series_loader(), record_cache=RecordCache(path))
+            api.get_series(1000, "en", fields=['FirstAired'])
+            self.assertTrue(hasattr(api.get_series(1000, "en"), 'Overview'))
+        finally:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+class TestCompact(unittest.TestCase):
+    def _shows(self, **kwargs):
+        """:return: The test show loaded with and without compact records"""
+        return [TVDB("B43FF87DE395DF56", loader=series_loader(), actors=True, banners=True, compact=compact,
+                     **kwargs).get_series(1000, "en") for compact in (False, True)]
+
+    def test_same_data(self):
+        """The compact objects should have the same attributes"""
+        for kwargs in ({}, {'lazy': True}, {'record_cache': True, 'cache_dir': tempfile.mkdtemp()}):
+            default, compact = self._shows(**kwargs)
+            shutil.rmtree(kwargs.get('cache_dir', u""), ignore_errors=True)
+
+            self.assertEqual(dict(compact.data.items()), dict(default.data.items()))
+            self.assertEqual(compact.SeriesName, default.SeriesName)
+            for season in default:
+                for episode in season:
+                    other = compact[season.season_number][episode.EpisodeNumber]
+                    self.assertEqual(dict(other.data.items()), dict(episode.data.items()))
+                    self.assertEqual(dir(other), dir(episode))
+
+            self.assertEqual(compact.actor_objects[0].image_url, default.actor_objects[0].image_url)
+            self.assertEqual(compact.banner_objects[0].banner_url, default.banner_objects[0].banner_url)
+
+    def test_ignore_case(self):
+        """Compact objects should support case insensitive attributes"""
+        default, compact = self._shows(ignore_case=True)
+        self.assertEqual(compact.seriesname, default.seriesname)
+        self.assertEqual(compact[1][2].EPISODENAME, u"The Second One")
+        self.assertRaises(error.TVDBAttributeError, getattr, compact[1][2], 'Missing')
+
+
+class TestPickle(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def test_configurations(self):
+        """Shows and episodes should be possible to pickle in all configurations"""
+        import pickle
+
+        for kwargs in ({}, {'lazy': True}, {'compact': True}, {'store': ":memory:"}, {'metrics': True},
+                       {'record_cache': True}, {'actors': True, 'banners': True}):
+            api = TVDB("B43FF87DE395DF56", loader=series_loader(), cache_dir=self.path, **kwargs)
+            show = api.get_series(1000, "en")
+
+            loaded = pickle.loads(pickle.dumps(show))
+            self.assertEqual(loaded.SeriesName, show.SeriesName)
+            self.assertEqual(len(loaded), len(show))
+            self.assertEqual(loaded[1][2].EpisodeName, u"The Second One")
+            self.assertEqual(pickle.loads(pickle.dumps(show[1][2])).FirstAired, datetime.date(2010, 1, 12))
+
+            self.assertTrue(loaded in loaded.api.shows())
+            self.assertEqual(loaded.api.get_series(1000, "en").SeriesName, show.SeriesName)
+
+    def test_store(self):
+        """A store kept in memory should keep its data when pickled"""
+        import pickle
+
+        api = TVDB("B43FF87DE395DF56", loader=series_loader(), cache_dir=self.path, store=":memory:")
+        api.get_series(1000, "en")
+
+        store = pickle.loads(pickle.dumps(api)).store
+        self.assertFalse(store is api.store)
+        self.assertEqual(store.load_series(1000, "en")['Series'][0]['SeriesName'], u"Test Show")
+
+    def test_loader(self):
+        """A TVDB instance with the default loader should be possible to pickle"""
+        import pickle
+
+        api = TVDB("B43FF87DE395DF56", cache_dir=self.path, rate_limit=2, burst=4, cache_size=1024)
+        loaded = pickle.loads(pickle.dumps(api))
+
+        self.assertEqual(loaded.loader.scheduler.rate, 2)
+        self.assertEqual(loaded.loader.scheduler.burst, 4)
+        self.assertEqual(loaded.loader.cache_path.max_size, 1024)
+
+
+class TestInterned(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def _api(self, **kwargs):
+        return TVDB("B43FF87DE395DF56", loader=series_loader(), cache_dir=self.path, **kwargs)
+
+    def _assertShared(self, first, second):
+        self.assertTrue(first.SeriesName is second.SeriesName)
+        self.assertTrue(first[1][1].Language is second[1][2].Language)
+        self.assertTrue(first[1][1].Language is second[1][1].Language)
+
+    def test_record_cache(self):
+        """The values of the shows loaded from the record cache should be interned"""
+        cold = self._api(record_cache=True).get_series(1000, "en")
+        warm = self._api(record_cache=True).get_series(1000, "en")
+        self._assertShared(cold, warm)
+
+    def test_store(self):
+        """The values of the shows loaded from the store should be interned"""
+        api = self._api(store=":memory:")
+        cold = api.get_series(1000, "en")
+        stored = self._api(store=api.store).get_series(1000, "en")
+        self._assertShared(cold, stored)
+
+    def test_ingest_series(self):
+        """The values of the shows parsed in other processes should be interned"""
+        ingested = list(self._api().ingest_series([1000], "en", processes=1))[0]
+        self._assertShared(self._api().get_series(1000, "en"), ingested)
+
+
+class TestIngestSeries(unittest.TestCase):
+    def setUp(self):
+        self.api = TVDB("B43FF87DE395DF56", loader=series_loader(), parser=PidParser())
+
+    def test_ingest_series(self):
+        """The shows should be parsed in other processes and built in the calling process"""
+        shows = list(self.api.ingest_series([1000] * 4, "en", processes=2, max_workers=2))
+
+        self.assertEqual(len(shows), 4)
+        expected = TVDB("B43FF87DE395DF56", loader=series_loader()).get_series(1000, "en")
+        for show in shows:
+            self.assertEqual(type(show), Show)
+            self.assertNotEqual(show.ParsedBy, os.getpid())
+            self.assertEqual(show.SeriesName, expected.SeriesName)
+            self.assertEqual(len(show), len(expected))
+            self.assertEqual(show[1][2].FirstAired, expected[1][2].FirstAired)
+            self.assertEqual(show[1][2].season, show[1])
+
+    def test_lazy(self):
+        """The unconverted data should be converted in the calling process"""
+        api = TVDB("B43FF87DE395DF56", loader=series_loader(), lazy=True)
+        show = list(api.ingest_series([1000], "en", processes=1))[0]
+        self.assertEqual(show[1][2].FirstAired, datetime.date(2010, 1, 12))
+
+    def test_errors(self):
+        """Unknown ids should raise TVDBIdError, or return it if return_exceptions is True"""
+        self.assertRaises(error.TVDBIdError, list, self.api.ingest_series([1], "en", processes=1))
+
+        result = list(self.api.ingest_series([1, 1000], "en", processes=1, return_exceptions=True))
+        self.assertEqual(type(result[0]), error.TVDBIdError)
+        self.assertEqual(type(result[1]), Show)
+
+    def test_record_cache(self):
+        """The parsed data should be kept in the record cache"""
+        path = tempfile.mkdtemp()
+        try:
+            api = TVDB("B43FF87DE395DF56", loader=series_loader(), record_cache=RecordCache(path))
+            cold = list(api.ingest_series([1000], "en", processes=1))[0]
+
+            api.parser.parse = None  # A warm load should not parse
+            warm = list(api.ingest_series([1000], "en", processes=1))[0]
+            self.assertEqual(warm.SeriesName, cold.SeriesName)
+        finally:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+class TestRecordCache(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.cache = RecordCache(self.path)
+        self.api = TVDB("B43FF87DE395DF56", loader=series_loader(), record_cache=self.cache)
+
+    def tearDown(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def test_warm_load(self):
+        """A warm load should use the cached data instead of parsing the XML"""
+        cold = self.api.get_series(1000, "en")
+
+        calls, original = list(), self.api.parser.parse
+        self.api.parser.parse = lambda *args: calls.append(args) or original(*args)
+        try:
+            warm = self.api.get_series(1000, "en")
+        finally:
+            self.api.parser.parse = original
+
+        self.assertEqual(len(calls), 0)
+        self.assertEqual(warm.SeriesName, cold.SeriesName)
+        self.assertEqual(len(warm), len(cold))
+        self.assertEqual(warm[1][2].EpisodeName, "The Second One")
+        self.assertEqual(warm[1][2].FirstAired, cold[1][2].FirstAired)
+
+    def test_changed_data(self):
+        """Changed data should be parsed again"""
+        self.api.get_series(1000, "en")
+
+        url = list(u for u in self.api.loader.content if u.endswith('all/en.zip'))[0]
+        self.cache.set(url, u"sha1:outdated", {'Series': [{'SeriesName': u"Old"}], 'Episode': []})
+
+        self.assertEqual(self.api.get_series(1000, "en").SeriesName, "Test Show")
+
+    def test_disabled(self):
+        """The record cache should not be used by default"""
+        self.assertEqual(TVDB("B43FF87DE395DF56", loader=series_loader()).record_cache, None)
+
+
 if __name__ == "__main__":
     sys.exit(unittest.main())
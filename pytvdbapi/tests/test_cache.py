@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2011 - 2014 Björn Larsson
+
+# This file is part of pytvdbapi.
+#
+# pytvdbapi is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pytvdbapi is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pytvdbapi.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import absolute_import, print_function
+
+import datetime
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+from pytvdbapi import error
+from pytvdbapi.cache import BoundedFileCache, RecordCache
+
+
+class TestBoundedFileCache(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def _files(self):
+        return [name for _, _, files in os.walk(self.path) for name in files]
+
+    def test_get_set_delete(self):
+        """It should be possible to store, load and remove values"""
+        cache = BoundedFileCache(self.path)
+
+        self.assertEqual(cache.get(u"http://example.com/a"), None)
+
+        cache.set(u"http://example.com/a", b"<Data>a</Data>")
+        self.assertEqual(cache.get(u"http://example.com/a"), b"<Data>a</Data>")
+        self.assertEqual(len(cache), 1)
+
+        cache.delete(u"http://example.com/a")
+        self.assertEqual(cache.get(u"http://example.com/a"), None)
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.size, 0)
+
+    def test_compression(self):
+        """Compressed entries should use less space than the data stored"""
+        data = b"<Data>" + b"<Episode>Some text</Episode>" * 1000 + b"</Data>"
+
+        cache = BoundedFileCache(self.path)
+        cache.set(u"key", data)
+        self.assertTrue(cache.size < len(data) / 10)
+        self.assertEqual(cache.get(u"key"), data)
+
+        raw = BoundedFileCache(tempfile.mkdtemp(), compress=False)
+        try:
+            raw.set(u"key", data)
+            self.assertTrue(raw.size > len(data))
+            self.assertEqual(raw.get(u"key"), data)
+        finally:
+            shutil.rmtree(raw.path, ignore_errors=True)
+
+    def test_sharding(self):
+        """The entries should be stored in hashed sub directories"""
+        cache = BoundedFileCache(self.path)
+        cache.set(u"key", b"value")
+
+        for root, _, files in os.walk(self.path):
+            if files:
+                name = files[0]
+                self.assertEqual(root, os.path.join(self.path, name[:2], name[2:4]))
+
+    def test_eviction(self):
+        """The least recently used entries should be evicted when the cache is full"""
+        cache = BoundedFileCache(self.path, max_size=250, compress=False)
+
+        for key in (u"a", u"b", u"c"):
+            cache.set(key, b"x" * 99)
+
+        self.assertEqual(cache.get(u"a"), None)
+        self.assertEqual(len(cache), 2)
+
+        cache.get(u"b")  # b is now more recently used than c
+        cache.set(u"d", b"x" * 99)
+
+        self.assertEqual(cache.get(u"c"), None)
+        self.assertEqual(cache.get(u"b"), b"x" * 99)
+        self.assertEqual(cache.get(u"d"), b"x" * 99)
+        self.assertEqual(len(self._files()), 2)
+        self.assertTrue(cache.size <= 250)
+
+    def test_persistence(self):
+        """A new instance should pick up the entries already stored"""
+        cache = BoundedFileCache(self.path, max_size=250, compress=False)
+        cache.set(u"a", b"x" * 99)
+        time.sleep(0.01)
+        cache.set(u"b", b"x" * 99)
+
+        cache = BoundedFileCache(self.path, max_size=250, compress=False)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.size, 200)
+
+        cache.set(u"c", b"x" * 99)
+        self.assertEqual(cache.get(u"a"), None)
+        self.assertEqual(cache.get(u"b"), b"x" * 99)
+
+    def test_invalid_size(self):
+        """It should not be possible to use a negative size"""
+        self.assertRaises(error.TVDBValueError, BoundedFileCache, self.path, -1)
+
+
+class TestRecordCache(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.cache = RecordCache(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def test_get_set_delete(self):
+        """The stored data should be returned for the same validator"""
+        records = {'Series': [{'id': 1, 'FirstAired': datetime.date(2014, 1, 1), 'Genre': [u'Drama']}]}
+        url = u"http://thetvdb.com/api/KEY/series/1/all/en.zip"
+
+        self.assertEqual(self.cache.get(url, u"sha1:1"), None)
+
+        self.cache.set(url, u"sha1:1", records)
+        self.assertEqual(self.cache.get(url, u"sha1:1"), records)
+        self.assertEqual(self.cache.get(url, u"sha1:2"), None)
+
+        self.cache.delete(url)
+        self.assertEqual(self.cache.get(url, u"sha1:1"), None)
+
+    def test_mirrors(self):
+        """The same resource loaded from different mirrors should share the entry"""
+        self.cache.set(u"http://thetvdb.com/api/KEY/series/1/all/en.zip", u"etag:1", [1])
+        mirror = u"http://mirror.example.com/api/KEY/series/1/all/en.zip"
+        self.assertEqual(self.cache.get(mirror, u"etag:1"), [1])
+        self.assertEqual(self.cache.get(u"http://thetvdb.com/api/KEY/series/2/all/en.zip", u"etag:1"), None)
+
+    def test_corrupt_entry(self):
+        """A corrupt entry should be ignored"""
+        url = u"http://thetvdb.com/api/KEY/series/1/all/en.zip"
+        self.cache.set(url, u"etag:1", [1])
+
+        with open(self.cache._file(url), 'wb') as handle:  # pylint: disable=W0212
+            handle.write(b"garbage")
+
+        self.assertEqual(self.cache.get(url, u"etag:1"), None)
+
+
+if __name__ == "__main__":
+    sys.exit(unittest.main())
@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2011 - 2014 Björn Larsson
+
+# This file is part of pytvdbapi.
+#
+# pytvdbapi is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pytvdbapi is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pytvdbapi.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import absolute_import, print_function
+
+import datetime
+import pickle
+import sys
+import unittest
+
+from pytvdbapi import error
+from pytvdbapi.api import TVDB, Episode
+from pytvdbapi.columns import EpisodeTable, EpisodeRow, _TypedColumn
+from pytvdbapi.tests import basetest
+from pytvdbapi.tests.utils import series_loader, API_KEY
+from pytvdbapi.xmlhelpers import RawRecord
+
+
+class TestEpisodeTable(basetest.pytvdbapiTest):
+    def setUp(self):
+        super(TestEpisodeTable, self).setUp()
+        self.table = EpisodeTable()
+        self.table.append({'id': 1, 'Rating': 7.5, 'FirstAired': datetime.date(2010, 1, 2), 'Name': u"foo"})
+        self.table.append({'id': 2, 'Rating': u"", 'FirstAired': u"", 'Name': u"bar", 'Extra': [u"a"]})
+        self.table.append({'id': 3, 'Rating': 8.0})
+
+    def test_values(self):
+        """The values should be returned as added"""
+        self.assertEqual(len(self.table), 3)
+        self.assertEqual(self.table.value(0, 'FirstAired'), datetime.date(2010, 1, 2))
+        self.assertEqual(self.table.value(0, 'Rating'), 7.5)
+        self.assertEqual(self.table.value(1, 'Rating'), u"")
+        self.assertEqual(self.table.value(1, 'FirstAired'), u"")
+        self.assertEqual(self.table.value(1, 'Extra'), [u"a"])
+
+        self.assertRaises(KeyError, self.table.value, 0, 'Extra')
+        self.assertRaises(KeyError, self.table.value, 2, 'Name')
+        self.assertRaises(KeyError, self.table.value, 0, 'Missing')
+
+    def test_typed_columns(self):
+        """The numbers and dates should be kept in arrays"""
+        for field in ('id', 'Rating', 'FirstAired'):
+            self.assertEqual(type(self.table.columns[field]), _TypedColumn)
+        self.assertEqual(type(self.table.columns['Name']), list)
+
+    def test_mixed_types(self):
+        """A column should become a list when a value of another type is added"""
+        self.table.append({'id': u"unknown"})
+        self.assertEqual(type(self.table.columns['id']), list)
+        self.assertEqual(self.table.column('id'), [1, 2, 3, u"unknown"])
+
+        self.table.append({'id': 2 ** 70})
+        self.assertEqual(self.table.value(4, 'id'), 2 ** 70)
+
+    def test_blank_column(self):
+        """A column with only empty values should become typed on the first number"""
+        table = EpisodeTable()
+        table.append({'Rating': u""})
+        table.append({'id': 1})
+        table.append({'Rating': 7.5})
+
+        self.assertEqual(type(table.columns['Rating']), _TypedColumn)
+        self.assertEqual(table.value(0, 'Rating'), u"")
+        self.assertRaises(KeyError, table.value, 1, 'Rating')
+        self.assertEqual(table.value(2, 'Rating'), 7.5)
+
+    def test_scan(self):
+        """Scanning should give the values of the rows having the field"""
+        self.assertEqual(list(self.table.scan('Name')), [(0, u"foo"), (1, u"bar")])
+        self.assertEqual(list(self.table.scan('Missing')), [])
+        self.assertEqual(self.table.column('Name', default=u"-"), [u"foo", u"bar", u"-"])
+
+    def test_row(self):
+        """A row should behave as a dictionary of its fields"""
+        row = self.table.row(2)
+        self.assertEqual(dict(row.items()), {'id': 3, 'Rating': 8.0})
+        self.assertEqual(len(row), 2)
+        self.assertTrue('Rating' in row)
+
+        row['Name'] = u"baz"
+        self.assertEqual(self.table.value(2, 'Name'), u"baz")
+
+        row['New'] = 1
+        self.assertEqual(row['New'], 1)
+        self.assertRaises(KeyError, lambda: self.table.row(0)['New'])
+
+        del row['Name']
+        self.assertFalse('Name' in row)
+        self.assertFalse(hasattr(row, '__dict__'))
+
+    def test_ignore_case(self):
+        """The fields should be case insensitive if requested"""
+        table = EpisodeTable(ignore_case=True)
+        table.append({'EpisodeName': u"foo", 'Language': u"en", 'language': u"en"})
+        self.assertEqual(table.value(0, 'EPISODENAME'), u"foo")
+        self.assertEqual(sorted(table.row(0).keys()), ['episodename', 'language'])
+
+    def test_pickle(self):
+        """The missing values should survive pickling"""
+        table = pickle.loads(pickle.dumps(self.table, 2))
+
+        self.assertEqual(sorted(table.fields(2)), ['Rating', 'id'])
+        self.assertRaises(KeyError, table.value, 2, 'Name')
+        self.assertEqual(list(table.scan('Name')), [(0, u"foo"), (1, u"bar")])
+
+    def test_raw(self):
+        """The values of a raw record should be converted when added"""
+        self.table.append(RawRecord('Episode', {'Rating': u"7.8", 'IMDB_ID': u"0123"}))
+        self.assertEqual(self.table.value(3, 'Rating'), 7.8)
+        self.assertEqual(self.table.value(3, 'IMDB_ID'), u"0123")
+
+
+class TestColumnarShow(basetest.pytvdbapiTest):
+    def setUp(self):
+        super(TestColumnarShow, self).setUp()
+        self.default = TVDB(API_KEY, loader=series_loader()).get_series(1000, "en")
+        self.show = TVDB(API_KEY, loader=series_loader(), columnar=True).get_series(1000, "en")
+
+    def test_same_data(self):
+        """The episode views should have the same attributes as the episodes"""
+        self.assertEqual(len(self.show.episode_table), sum(len(season) for season in self.default))
+        self.assertEqual(self.default.episode_table, None)
+
+        for season in self.default:
+            self.assertEqual(len(self.show[season.season_number]), len(season))
+            for expected in season:
+                episode = self.show[season.season_number][expected.EpisodeNumber]
+                self.assertTrue(isinstance(episode.data, EpisodeRow))
+                self.assertTrue(episode.season is self.show[season.season_number])
+                self.assertEqual(dict(episode.data.items()), dict(expected.data.items()))
+                self.assertEqual(dir(episode), dir(expected))
+
+    def test_filter(self):
+        """Filtering on a field should give the same episodes with and without the table"""
+        for show in (self.show, self.default):
+            found = show.filter(lambda rating: rating > 7.0, field='Rating')
+            self.assertTrue(len(found) > 0)
+            self.assertTrue(all(type(episode) is Episode and episode.Rating > 7.0 for episode in found))
+
+        ids = [sorted(e.id for e in show.filter(lambda name: name.startswith(u"The"), field='EpisodeName'))
+               for show in (self.show, self.default)]
+        self.assertEqual(ids[0], ids[1])
+
+        episode = self.show.find(lambda name: name == u"The Second One", field='EpisodeName')
+        self.assertEqual(episode.FirstAired, datetime.date(2010, 1, 12))
+        self.assertEqual(self.show.find(lambda name: False, field='EpisodeName'), None)
+        self.assertEqual(self.show.filter(lambda value: True, field='Missing'), [])
+
+        self.assertRaises(error.TVDBTypeError, self.show.filter, lambda a, b: True, field='Rating')
+
+    def test_key_filter(self):
+        """Filtering on the episodes should work on the views"""
+        found = self.show.filter(lambda episode: episode.SeasonNumber == 1)
+        self.assertEqual(len(found), len(self.default[1]))
+
+    def test_identity(self):
+        """The same episode instance should be returned every time"""
+        episode = self.show[1][2]
+        episode.watched = True
+
+        self.assertTrue(self.show[1][2] is episode)
+        self.assertTrue(self.show[1][2].watched)
+        found = self.show.find(lambda name: name == u"The Second One", field='EpisodeName')
+        self.assertTrue(found is episode)
+
+    def test_append(self):
+        """Episodes appended to a season should be added to the table"""
+        season, size = self.show[1], len(self.show.episode_table)
+        episode = Episode({'id': 99, 'SeasonNumber': 1, 'EpisodeNumber': 99, 'EpisodeName': u"Extra"},
+                          season, self.show.config)
+        season.append(episode)
+
+        self.assertTrue(season[99] is episode)
+        self.assertTrue(isinstance(episode.data, EpisodeRow))
+        self.assertEqual(len(self.show.episode_table), size + 1)
+        self.assertTrue(self.show.find(lambda name: name == u"Extra", field='EpisodeName') is episode)
+
+        replacement = Episode(dict(episode.data.items(), EpisodeName=u"Replaced"), season, self.show.config)
+        season.append(replacement)
+        self.assertTrue(season[99] is replacement)
+        found = self.show.filter(lambda name: name in (u"Extra", u"Replaced"), field='EpisodeName')
+        self.assertEqual(found, [replacement])
+
+    def test_pickle(self):
+        """A columnar show should be possible to pickle with all protocols"""
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            show = pickle.loads(pickle.dumps(self.show, protocol))
+
+            self.assertEqual(show[1][2].EpisodeName, u"The Second One")
+            self.assertEqual(len(show.episode_table), len(self.show.episode_table))
+            self.assertEqual(dir(show[1][2]), dir(self.show[1][2]))
+            self.assertTrue(show[1][2].data.table is show.episode_table)
+
+    def test_update(self):
+        """Updating should rebuild the table and keep the seasons"""
+        season, table = self.show[1], self.show.episode_table
+        self.show.update()
+
+        self.assertFalse(self.show.episode_table is table)
+        self.assertTrue(self.show[1] is season)
+        self.assertEqual(season[2].EpisodeName, u"The Second One")
+        self.assertEqual(len(self.show.episode_table), len(table))
+
+
+if __name__ == "__main__":
+    sys.exit(unittest.main())
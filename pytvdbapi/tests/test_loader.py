@@ -19,14 +19,23 @@
 
 from __future__ import absolute_import, print_function
 
+import os
+import pickle
 import shutil
 import sys
 import tempfile
+import threading
+import time
 import unittest
+import zipfile
+from io import BytesIO
 
 from pytvdbapi import error
-from pytvdbapi.loader import Loader
+from pytvdbapi.api import TVDB
+from pytvdbapi.loader import (Loader, PooledLoader, RecordingLoader, ReplayLoader, canonical_url,
+                              response_validator)
 from pytvdbapi.tests import basetest
+from pytvdbapi.tests.utils import StaticLoader, series_loader, API_KEY
 
 
 class TestLoader(basetest.pytvdbapiTest):
@@ -71,6 +80,218 @@ class TestLoader(basetest.pytvdbapiTest):
 
         self.loader.load(url, cache=False)
 
+    def test_pickle(self):
+        """It should be possible to pickle and unpickle the loader"""
+        loader = pickle.loads(pickle.dumps(self.loader))
+
+        self.assertEqual(loader.cache_path, self.tmp)
+        self.assertFalse(loader._http_lock is self.loader._http_lock)
+        self.assertFalse(loader._http_lock.locked())
+
+
+class FakeHttp(object):
+    """A stand in for httplib2.Http recording the requests made through it"""
+
+    class Response(dict):
+        status = 200
+
+    def __init__(self, delay=0):
+        self.urls = list()
+        self.delay = delay
+
+    def request(self, url, headers=None):
+        self.urls.append(url)
+        time.sleep(self.delay)
+        return self.Response({'content-type': 'text/xml'}), b'<Data />'
+
+
+class CountingPooledLoader(PooledLoader):
+    """A pooled loader handing out FakeHttp instances"""
+
+    def _create_http(self):
+        return FakeHttp()
+
+
+class TestBaseLoader(basetest.pytvdbapiTest):
+    def test_unpack_zip(self):
+        """The loader should unpack zip content into the named xml member"""
+        data = BytesIO()
+        zip_file = zipfile.ZipFile(data, 'w')
+        zip_file.writestr('en.xml', b'<Data />')
+        zip_file.close()
+
+        url = "http://thetvdb.com/api/key/series/1/all/en.zip"
+        loader = StaticLoader({url: ('application/zip', data.getvalue())})
+
+        self.assertEqual(loader.load(url).read(), b'<Data />')
+
+    def test_stream_zip(self):
+        """The unpacked zip content should be readable in chunks"""
+        loader = series_loader()
+        url = "http://thetvdb.com/api/{0}/series/1000/all/en.zip".format(API_KEY)
+
+        data, chunks = loader.load(url), list()
+        for chunk in iter(lambda: data.read(64), b''):
+            self.assertTrue(len(chunk) <= 64)
+            chunks.append(chunk)
+
+        self.assertTrue(len(chunks) > 1)
+        self.assertEqual(b''.join(chunks), loader.load(url).read())
+
+    def test_load_validated(self):
+        """The validator should identify the version of the loaded content"""
+        url = "http://thetvdb.com/api/key/mirrors.xml"
+        loader = StaticLoader({url: ('text/xml', b'<Mirrors />')})
+
+        validator, data = loader.load_validated(url)
+        self.assertEqual(data.read(), b'<Mirrors />')
+        self.assertEqual(validator, response_validator({}, b'<Mirrors />'))
+        self.assertNotEqual(validator, response_validator({}, b'<Mirrors></Mirrors>'))
+
+        self.assertEqual(response_validator({'etag': '"abc"'}, b''), u'etag:"abc"')
+
+    def test_listener(self):
+        """Listeners should be called with the outcome of each load"""
+        loader, events = series_loader(), list()
+        loader.add_listener(lambda *args: events.append(args))
+
+        loader.load("http://www.thetvdb.com/api/{0}/mirrors.xml".format(API_KEY))
+        self.assertRaises(error.TVDBNotFoundError, loader.load, "http://foo.bar")
+
+        self.assertEqual(len(events), 2)
+        self.assertEqual(events[0][2]['content-type'], 'text/xml')
+        self.assertTrue(events[0][3] > 0)
+        self.assertEqual(events[0][4], None)
+        self.assertEqual(type(events[1][4]), error.TVDBNotFoundError)
+
+    def test_plain_content(self):
+        """Non zip content should be returned as is"""
+        loader = StaticLoader({'http://foo.bar': ('text/xml', b'<Data />')})
+        self.assertEqual(loader.load('http://foo.bar').read(), b'<Data />')
+
+    def test_custom_loader(self):
+        """TVDB should use the loader passed with the loader keyword"""
+        loader = StaticLoader()
+        loader.add_file(u"http://www.thetvdb.com/api/B43FF87DE395DF56/mirrors.xml",
+                        os.path.join(self.path, "mirrors.xml"))
+
+        tmp = tempfile.mkdtemp()
+        try:
+            api = TVDB("B43FF87DE395DF56", loader=loader, cache_dir=tmp)
+
+            self.assertTrue(api.loader is loader)
+            self.assertEqual(len(api.mirrors), 1)
+            self.assertEqual(len(loader.requests), 1)
+        finally:
+            shutil.rmtree(tmp)
+
+
+class TestPooledLoader(basetest.pytvdbapiTest):
+    def setUp(self):
+        super(TestPooledLoader, self).setUp()
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        super(TestPooledLoader, self).tearDown()
+        shutil.rmtree(self.tmp)
+
+    def test_reuse_connection(self):
+        """Sequential requests should reuse the same connection object"""
+        loader = CountingPooledLoader(self.tmp, pool_size=4)
+
+        for _ in range(10):
+            loader.load("http://foo.bar")
+
+        self.assertEqual(loader._created, 1)
+        self.assertEqual(len(loader.http.urls), 10)
+
+    def test_pool_size(self):
+        """The pool should never grow above pool_size"""
+        loader = CountingPooledLoader(self.tmp, pool_size=2)
+
+        threads = [threading.Thread(target=loader.load, args=("http://foo.bar",)) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertTrue(loader._created <= 2)
+        self.assertEqual(loader._pool.qsize(), loader._created)
+
+    def test_invalid_pool_size(self):
+        """A pool size less than 1 should raise TVDBValueError"""
+        self.assertRaises(error.TVDBValueError, PooledLoader, self.tmp, pool_size=0)
+
+    def test_pickle(self):
+        """An unpickled loader should start with a pool holding its connection object"""
+        loader = pickle.loads(pickle.dumps(PooledLoader(self.tmp, pool_size=2)))
+
+        self.assertEqual(loader.pool_size, 2)
+        self.assertEqual(loader._created, 1)
+        self.assertTrue(loader._acquire() is loader.http)
+
+    def test_coalesce_requests(self):
+        """Concurrent requests for the same url should only hit the network once"""
+        loader = CountingPooledLoader(self.tmp, pool_size=4)
+        loader.http.delay = 0.2
+
+        results = list()
+        threads = [threading.Thread(target=lambda: results.append(loader.load("http://FOO.bar/a#b").read()))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [b'<Data />'] * 8)
+        self.assertEqual(loader._created, 1)
+        self.assertEqual(len(loader.http.urls), 1)
+
+    def test_canonical_url(self):
+        """The canonical url should ignore the case of the host and any fragment"""
+        self.assertEqual(canonical_url("HTTP://TheTVDB.com/api/Foo?a=B#c"), "http://thetvdb.com/api/Foo?a=B")
+
+
+class TestRecordReplay(basetest.pytvdbapiTest):
+    def setUp(self):
+        super(TestRecordReplay, self).setUp()
+        self.tmp = tempfile.mkdtemp()
+        self.corpus = os.path.join(self.tmp, "corpus")
+
+    def tearDown(self):
+        super(TestRecordReplay, self).tearDown()
+        shutil.rmtree(self.tmp)
+
+    def _record(self):
+        """Record the test show into the corpus"""
+        api = TVDB(API_KEY, loader=RecordingLoader(series_loader(), self.corpus), actors=True)
+        api.search("Test Show", "en")[0].update()
+        self.assertRaises(error.TVDBIdError, api.get_series, 1, "en")
+
+    def test_replay(self):
+        """The recorded responses should be replayed without the original loader"""
+        self._record()
+
+        api = TVDB(API_KEY, loader=ReplayLoader(self.corpus), actors=True)
+        show = api.search("Test Show", "en")[0]
+
+        self.assertEqual(len(show), 3)
+        self.assertEqual(show[1][3].EpisodeName, "Trois")
+        self.assertEqual(len(show.actor_objects), 2)
+
+    def test_replay_not_found(self):
+        """Recorded not found responses should be replayed"""
+        self._record()
+
+        api = TVDB(API_KEY, loader=ReplayLoader(self.corpus))
+        self.assertRaises(error.TVDBIdError, api.get_series, 1, "en")
+
+    def test_missing_url(self):
+        """Urls not in the corpus should raise ConnectionError"""
+        self._record()
+
+        self.assertRaises(error.ConnectionError, ReplayLoader(self.corpus).load, "http://foo.bar")
+
 
 if __name__ == "__main__":
     sys.exit(unittest.main())
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2011 - 2014 Björn Larsson
+
+# This file is part of pytvdbapi.
+#
+# pytvdbapi is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pytvdbapi is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pytvdbapi.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import absolute_import, print_function
+
+import sys
+import unittest
+from io import StringIO
+
+from pytvdbapi.__main__ import main, prefetch, read_shows
+from pytvdbapi.api import TVDB
+from pytvdbapi.tests.utils import series_loader, API_KEY
+
+ACTORS_URL = u"http://thetvdb.com/api/{0}/series/1000/actors.xml".format(API_KEY)
+SERIES_URL = u"http://thetvdb.com/api/{0}/series/1000/all/en.zip".format(API_KEY)
+
+
+class TestPrefetch(unittest.TestCase):
+    def setUp(self):
+        self.loader = series_loader()
+        self.api = TVDB(API_KEY, loader=self.loader)
+        self.loader.requests = list()
+
+    def test_read_shows(self):
+        """Empty lines and comments should be ignored"""
+        lines = [u"1000\n", u"\n", u"# A comment\n", u"  Test Show  \n", u"tt0012345"]
+        self.assertEqual(read_shows(lines), [u"1000", u"Test Show", u"tt0012345"])
+
+    def test_prefetch(self):
+        """The shows should be loaded by id and by name"""
+        out = StringIO()
+        result = prefetch(self.api, [u"1000", u"Test Show"], u"en", workers=2, out=out)
+
+        self.assertEqual(result.loaded, 2)
+        self.assertEqual(result.failed, [])
+        self.assertTrue(result.bytes > 0)
+        self.assertEqual(self.loader.requests.count(ACTORS_URL), 2)
+        self.assertEqual(self.loader.requests.count(SERIES_URL), 2)
+
+        self.assertEqual(len(out.getvalue().splitlines()), 2)
+        self.assertTrue(u"Loaded 2 shows, 0 failed" in result.summary())
+
+    def test_failures(self):
+        """Shows failing to load should be reported"""
+        result = prefetch(self.api, [u"1", u"No Such Show", u"1000"], u"en", actors=False, banners=False)
+
+        self.assertEqual(result.loaded, 1)
+        self.assertEqual(sorted(r for r, _ in result.failed), [u"1", u"No Such Show"])
+        self.assertEqual(self.loader.requests.count(ACTORS_URL), 0)
+
+    def test_unexpected_error(self):
+        """Any error loading a show should be reported without stopping the run"""
+        get_series = self.api.get_series
+
+        def _get_series(series_id, *args, **kwargs):
+            if series_id == u"2":
+                raise ValueError("Broken")
+            return get_series(series_id, *args, **kwargs)
+
+        self.api.get_series = _get_series
+        result = prefetch(self.api, [u"2", u"1000"], u"en", actors=False, banners=False)
+
+        self.assertEqual(result.loaded, 1)
+        self.assertEqual([r for r, _ in result.failed], [u"2"])
+        self.assertTrue(isinstance(result.failed[0][1], ValueError))
+
+    def test_stored_imdb_id(self):
+        """A show found in the store by IMDB id should not be loaded again"""
+        api = TVDB(API_KEY, loader=self.loader, store=":memory:")
+        api.get_series(1000, "en")
+        self.loader.requests = list()
+
+        result = prefetch(api, [u"tt0012345"], u"en", actors=False, banners=False)
+
+        self.assertEqual(result.loaded, 1)
+        self.assertEqual(self.loader.requests, [])
+
+    def test_missing_api_key(self):
+        """The command should require an API key"""
+        stderr, sys.stderr = sys.stderr, StringIO()
+        try:
+            self.assertEqual(main(['prefetch', '--api-key', '']), 2)
+        finally:
+            sys.stderr = stderr
+
+
+if __name__ == "__main__":
+    sys.exit(unittest.main())
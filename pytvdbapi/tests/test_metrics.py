@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2011 - 2014 Björn Larsson
+
+# This file is part of pytvdbapi.
+#
+# pytvdbapi is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pytvdbapi is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pytvdbapi.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import absolute_import, print_function
+
+import shutil
+import sys
+import tempfile
+import unittest
+
+from pytvdbapi import error, urls
+from pytvdbapi.api import TVDB
+from pytvdbapi.metrics import Histogram, Metrics, template_name
+from pytvdbapi.tests import basetest
+from pytvdbapi.tests.utils import series_loader, API_KEY
+from pytvdbapi.tracing import Span, Tracer
+
+
+def finished(name, duration, parent=None, **attributes):
+    """
+    :return: A closed span open for *duration* seconds
+    """
+    span = Span(Tracer(), name, parent, attributes)
+    span.start, span.end = 0.0, duration
+    return span
+
+
+class TestHistogram(basetest.pytvdbapiTest):
+    def test_empty(self):
+        """An empty histogram should have no percentiles"""
+        self.assertEqual(Histogram().percentile(0.5), None)
+
+    def test_percentile(self):
+        """The percentiles should be interpolated within the buckets"""
+        histogram = Histogram(buckets=(1.0, 2.0, 3.0))
+        for value in (0.5, 1.5, 1.5, 2.5):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.counts, [1, 2, 1, 0])
+        self.assertEqual(histogram.count, 4)
+        self.assertAlmostEqual(histogram.sum, 6.0)
+        self.assertAlmostEqual(histogram.percentile(0.5), 1.5)
+        self.assertAlmostEqual(histogram.percentile(1.0), 2.5)
+
+    def test_overflow(self):
+        """Values above all bounds should be interpolated up to the largest value observed"""
+        histogram = Histogram(buckets=(1.0,))
+        histogram.observe(5.0)
+        self.assertAlmostEqual(histogram.percentile(0.5), 3.0)
+        self.assertAlmostEqual(histogram.percentile(1.0), 5.0)
+
+
+class TestMetrics(basetest.pytvdbapiTest):
+    def setUp(self):
+        super(TestMetrics, self).setUp()
+        self.metrics = Metrics()
+        self.url = urls.series.format(mirror=u"http://thetvdb.com", api_key=API_KEY, seriesid=1000,
+                                      language=u"en")
+
+    def test_template_name(self):
+        """Urls should be mapped to the name of the template they were created from"""
+        context = {'mirror': u"http://thetvdb.com", 'api_key': API_KEY, 'seriesid': 1, 'episodeid': 2,
+                   'language': u"en", 'series': u"House", 'seasonnumber': 1, 'episodenumber': 2,
+                   'absolutenumber': 3, 'imdbid': u"0773262", 'zap2itid': u"EP00000001",
+                   'airdate': u"2010-01-01", 'time': 1}
+
+        for name in ('mirrors', 'search', 'series', 'episode', 'actors', 'banners', 'default_order',
+                     'dvd_order', 'absolute_order', 'imdbid', 'zap2itid', 'airdate', 'updates', 'time'):
+            self.assertEqual(template_name(getattr(urls, name).format(**context)), name)
+
+        self.assertEqual(template_name(u"http://foo.bar"), u"other")
+
+    def _load(self, duration, **attributes):
+        self.metrics.finish(finished('load', duration, url=self.url, **attributes))
+
+    def test_loads(self):
+        """The outcome of the loads should be counted"""
+        self._load(0.2, size=100, source=u"network")
+        self._load(0.001, size=100, source=u"cache")
+        self._load(0.1, size=100, source=u"revalidated")
+        self._load(1.0, error=error.ConnectionError(u"Failed"))
+
+        series = self.metrics.snapshot()['series']
+        self.assertEqual(series['requests'], 4)
+        self.assertEqual(series['errors'], 1)
+        self.assertEqual(series['cache_hits'], 1)
+        self.assertEqual(series['not_modified'], 1)
+        self.assertEqual(series['bytes'], 300)
+        self.assertEqual(series['latency']['count'], 2)
+        self.assertAlmostEqual(series['latency']['sum'], 0.3)
+
+    def test_stages(self):
+        """The time spent in the processing stages should be recorded for the url of the enclosing span"""
+        parent = finished('get_series', 1.0, url=self.url)
+        self.metrics.finish(finished('parse_xml', 0.1, parent, element=u"Episode", count=10))
+        self.metrics.finish(finished('populate_data', 0.1, parent))
+        self.metrics.observe(self.url, 'build', 0.5)
+
+        series = self.metrics.snapshot()['series']
+        self.assertEqual(series['parse_xml']['count'], 1)
+        self.assertEqual(series['build']['count'], 1)
+        self.assertEqual(series['generate_tree']['count'], 0)
+        self.assertAlmostEqual(series['parse_xml']['sum'], 0.1)
+
+    def test_reset(self):
+        """Reset should discard the collected metrics"""
+        self._load(0.2, size=100, source=u"network")
+        self.metrics.reset()
+        self.assertEqual(self.metrics.snapshot(), {})
+
+    def test_prometheus(self):
+        """The metrics should be available in the Prometheus text format"""
+        self._load(0.02, size=100, source=u"network")
+        text = self.metrics.prometheus()
+
+        self.assertTrue(u'pytvdbapi_requests_total{endpoint="series"} 1\n' in text)
+        self.assertTrue(u'pytvdbapi_bytes_total{endpoint="series"} 100\n' in text)
+        self.assertTrue(u'pytvdbapi_latency_seconds_bucket{endpoint="series",le="0.01"} 0\n' in text)
+        self.assertTrue(u'pytvdbapi_latency_seconds_bucket{endpoint="series",le="0.025"} 1\n' in text)
+        self.assertTrue(u'pytvdbapi_latency_seconds_bucket{endpoint="series",le="+Inf"} 1\n' in text)
+        self.assertTrue(u'pytvdbapi_latency_seconds_count{endpoint="series"} 1\n' in text)
+        self.assertTrue(
+            u'pytvdbapi_stage_seconds_count{endpoint="series",stage="parse_xml"} 0\n' in text)
+
+
+class TestMetricsApi(basetest.pytvdbapiTest):
+    def setUp(self):
+        super(TestMetricsApi, self).setUp()
+        self.tmp = tempfile.mkdtemp()
+        self.api = TVDB(API_KEY, loader=series_loader(), cache_dir=self.tmp, metrics=True)
+
+    def tearDown(self):
+        super(TestMetricsApi, self).tearDown()
+        shutil.rmtree(self.tmp)
+
+    def test_disabled(self):
+        """No metrics should be collected by default"""
+        api = TVDB(API_KEY, loader=series_loader(), cache_dir=self.tmp)
+        self.assertEqual(api.metrics, None)
+
+    def test_get_series(self):
+        """Loading a show should record the load and all the processing stages"""
+        show = self.api.get_series(1000, "en")
+        show.load_actors()
+
+        snapshot = self.api.metrics.snapshot()
+        self.assertEqual(snapshot['mirrors']['requests'], 1)
+
+        for name in ('series', 'actors'):
+            self.assertEqual(snapshot[name]['requests'], 1)
+            self.assertTrue(snapshot[name]['bytes'] > 0)
+
+        # The series data is streamed
+        self.assertEqual(snapshot['series']['iterparse']['count'], 1)
+        self.assertEqual(snapshot['series']['parse_xml']['count'], 0)
+
+        self.assertEqual(snapshot['actors']['generate_tree']['count'], 0)
+        self.assertEqual(snapshot['actors']['parse_xml']['count'], 1)
+        self.assertEqual(snapshot['actors']['build']['count'], 1)
+
+    def test_get_episode(self):
+        """Loading an episode should record the processing stages"""
+        self.api.get_episode("en", episodeid=5102)
+
+        episode = self.api.metrics.snapshot()['episode']
+        self.assertEqual(episode['requests'], 1)
+        self.assertEqual(episode['build']['count'], 1)
+
+    def test_search(self):
+        """Searching should record the processing stages"""
+        self.api.search("Test Show", "en")
+
+        search = self.api.metrics.snapshot()['search']
+        self.assertEqual(search['parse_xml']['count'], 1)
+        self.assertEqual(search['build']['count'], 1)
+
+
+if __name__ == "__main__":
+    sys.exit(unittest.main())
@@ -23,10 +23,15 @@ from __future__ import absolute_import, print_function
 import sys
 import unittest
 import os
+import shutil
+import tempfile
+import time
 from io import BytesIO
 
 from pytvdbapi import xmlhelpers, mirror, error
+from pytvdbapi.api import TVDB
 from pytvdbapi.tests import basetest
+from pytvdbapi.tests.utils import StaticLoader, API_KEY
 
 
 class TestMirror(basetest.pytvdbapiTest):
@@ -80,5 +85,162 @@ class TestMirror(basetest.pytvdbapiTest):
         self.assertEqual(m.__repr__(), repr)
 
 
+MIRRORS = b"""<?xml version="1.0" encoding="UTF-8" ?>
+<Mirrors>
+  <Mirror><id>1</id><mirrorpath>http://one.tvdb</mirrorpath><typemask>7</typemask></Mirror>
+  <Mirror><id>2</id><mirrorpath>http://two.tvdb</mirrorpath><typemask>7</typemask></Mirror>
+  <Mirror><id>3</id><mirrorpath>http://three.tvdb</mirrorpath><typemask>2</typemask></Mirror>
+</Mirrors>
+"""
+
+
+class TestMirrorSelection(basetest.pytvdbapiTest):
+    def setUp(self):
+        super(TestMirrorSelection, self).setUp()
+        self.mirrors = mirror.MirrorList(xmlhelpers.generate_tree(BytesIO(MIRRORS)))
+
+    def _url(self, type_mask):
+        return self.mirrors.get_mirror(type_mask).url
+
+    def test_type_mask(self):
+        """Only mirrors matching the type mask should be returned"""
+        self.mirrors.record("http://three.tvdb/api", 0.001)
+        self.mirrors.record("http://one.tvdb/api", 1.0)
+        self.mirrors.record("http://two.tvdb/api", 1.0)
+
+        self.assertEqual(self._url(mirror.TypeMask.BANNER), "http://three.tvdb")
+        self.assertNotEqual(self._url(mirror.TypeMask.XML), "http://three.tvdb")
+
+    def test_prefer_fastest(self):
+        """The mirror with the lowest latency should be preferred"""
+        self.mirrors.record("http://one.tvdb/api/foo.xml", 0.5)
+        self.mirrors.record("http://two.tvdb/api/foo.xml", 0.1)
+
+        self.assertEqual(self._url(mirror.TypeMask.XML), "http://two.tvdb")
+
+        for _ in range(20):
+            self.mirrors.record("http://two.tvdb/api/foo.xml", 1.0)
+
+        self.assertEqual(self._url(mirror.TypeMask.XML), "http://one.tvdb")
+
+    def test_failover(self):
+        """A failing mirror should be replaced by a healthy one"""
+        self.mirrors.record("http://one.tvdb/api/foo.xml", 0.1)
+        self.mirrors.record("http://two.tvdb/api/foo.xml", 0.5)
+        self.assertEqual(self._url(mirror.TypeMask.XML), "http://one.tvdb")
+
+        for _ in range(5):
+            self.mirrors.record("http://one.tvdb/api/foo.xml", 0.1, failed=True)
+
+        self.assertEqual(self._url(mirror.TypeMask.XML), "http://two.tvdb")
+
+    def test_all_unhealthy(self):
+        """If all mirrors fail, the one with the lowest error rate should be used"""
+        for _ in range(5):
+            self.mirrors.record("http://one.tvdb/api/foo.xml", 0.1, failed=True)
+        for _ in range(10):
+            self.mirrors.record("http://two.tvdb/api/foo.xml", 0.1, failed=True)
+
+        self.assertEqual(self._url(mirror.TypeMask.XML), "http://one.tvdb")
+
+    def test_recovery(self):
+        """A failing mirror should be used again once its error rate has decayed"""
+        self.mirrors.record("http://one.tvdb/api/foo.xml", 0.1)
+        self.mirrors.record("http://two.tvdb/api/foo.xml", 0.5)
+        for _ in range(5):
+            self.mirrors.record("http://one.tvdb/api/foo.xml", 0.1, failed=True)
+        self.assertEqual(self._url(mirror.TypeMask.XML), "http://two.tvdb")
+
+        failing = [m for m in self.mirrors if m.url == "http://one.tvdb"][0]
+        failing.updated -= 2 * self.mirrors.error_half_life
+        self.assertEqual(self._url(mirror.TypeMask.XML), "http://one.tvdb")
+
+    def test_unknown_url(self):
+        """Urls not belonging to a mirror should be ignored"""
+        self.mirrors.record("http://www.thetvdb.com/api/mirrors.xml", 0.1, failed=True)
+
+        for m in self.mirrors:
+            self.assertEqual(m.error_rate, 0.0)
+            self.assertEqual(m.latency, None)
+
+
+class UnreachableLoader(StaticLoader):
+    """A loader failing to connect to the server"""
+
+    def fetch(self, url, cache=True):
+        self.requests.append(url)
+        raise error.ConnectionError(u"Unable to connect")
+
+
+class TestMirrorDiscovery(basetest.pytvdbapiTest):
+    def setUp(self):
+        super(TestMirrorDiscovery, self).setUp()
+        self.tmp = tempfile.mkdtemp()
+        self.url = u"http://www.thetvdb.com/api/{0}/mirrors.xml".format(API_KEY)
+
+    def tearDown(self):
+        super(TestMirrorDiscovery, self).tearDown()
+        shutil.rmtree(self.tmp)
+
+    def _api(self, loader=None, **kwargs):
+        if loader is None:
+            loader = StaticLoader()
+            loader.add_file(self.url, os.path.join(self.path, "mirrors.xml"))
+        return TVDB(API_KEY, cache_dir=self.tmp, loader=loader, **kwargs)
+
+    def _expire(self):
+        past = time.time() - 2 * 24 * 60 * 60
+        os.utime(os.path.join(self.tmp, u"mirrors.xml"), (past, past))
+
+    def test_lazy(self):
+        """The mirrors should be loaded once, when first used"""
+        api = self._api()
+        self.assertEqual(api.loader.requests, [])
+
+        self.assertEqual(len(api.mirrors), 1)
+        self.assertTrue(api.mirrors is api.mirrors)
+        self.assertEqual(api.loader.requests, [self.url])
+
+    def test_persisted(self):
+        """A new instance sharing the cache directory should reuse the stored mirrors"""
+        self.assertEqual(len(self._api().mirrors), 1)
+
+        api = self._api()
+        self.assertEqual(len(api.mirrors), 1)
+        self.assertEqual(api.loader.requests, [])
+
+    def test_expired(self):
+        """The mirrors should be reloaded once the stored list is older than the ttl"""
+        self.assertEqual(len(self._api().mirrors), 1)
+        self._expire()
+
+        api = self._api()
+        self.assertEqual(len(api.mirrors), 1)
+        self.assertEqual(api.loader.requests, [self.url])
+
+    def test_expired_unreachable(self):
+        """An expired list should be used if the server can not be reached"""
+        self.assertEqual(len(self._api().mirrors), 1)
+        self._expire()
+
+        api = self._api(UnreachableLoader())
+        self.assertEqual(len(api.mirrors), 1)
+        self.assertEqual(len(api.loader.requests), 1)
+
+    def test_unreachable(self):
+        """Without a stored list, failing to reach the server should raise an error"""
+        api = self._api(UnreachableLoader())
+        self.assertRaises(error.ConnectionError, lambda: api.mirrors)
+
+    def test_no_ttl(self):
+        """With a ttl of 0 the mirrors should not be stored"""
+        self.assertEqual(len(self._api(mirror_ttl=0).mirrors), 1)
+        self.assertFalse(os.path.exists(os.path.join(self.tmp, u"mirrors.xml")))
+
+        api = self._api(mirror_ttl=0)
+        self.assertEqual(len(api.mirrors), 1)
+        self.assertEqual(api.loader.requests, [self.url])
+
+
 if __name__ == "__main__":
     sys.exit(unittest.main())
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2011 - 2014 Björn Larsson
+
+# This file is part of pytvdbapi.
+#
+# pytvdbapi is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pytvdbapi is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pytvdbapi.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import absolute_import, print_function
+
+import sys
+import threading
+import time
+import unittest
+
+from pytvdbapi import error
+from pytvdbapi.loader import current_priority
+from pytvdbapi.scheduler import Priority, RequestScheduler
+from pytvdbapi.tests.utils import series_loader
+
+
+class TestRequestScheduler(unittest.TestCase):
+    def test_burst(self):
+        """A full burst should be allowed without waiting"""
+        scheduler = RequestScheduler(1, burst=5)
+
+        start = time.time()
+        for _ in range(5):
+            scheduler.acquire()
+
+        self.assertTrue(time.time() - start < 0.5)
+
+    def test_rate(self):
+        """Requests above the burst should be limited to the rate"""
+        scheduler = RequestScheduler(50, burst=1)
+
+        start = time.time()
+        for _ in range(6):
+            scheduler.acquire()
+
+        self.assertTrue(time.time() - start >= 0.09)
+
+    def test_priority(self):
+        """Waiting requests should be served in priority order"""
+        scheduler, order = RequestScheduler(10, burst=1), list()
+        scheduler.acquire()
+
+        def _acquire(priority):
+            scheduler.acquire(priority)
+            order.append(priority)
+
+        threads = list()
+        for priority in (Priority.BULK, Priority.BULK, Priority.INTERACTIVE):
+            threads.append(threading.Thread(target=_acquire, args=(priority,)))
+            threads[-1].start()
+            time.sleep(0.01)
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(order, [Priority.INTERACTIVE, Priority.BULK, Priority.BULK])
+
+    def test_invalid_arguments(self):
+        """Invalid rate or burst should raise TVDBValueError"""
+        self.assertRaises(error.TVDBValueError, RequestScheduler, 0)
+        self.assertRaises(error.TVDBValueError, RequestScheduler, 1, 0)
+
+    def test_loader_priority(self):
+        """The priority passed to load should be available while fetching"""
+        loader, priorities = series_loader(), list()
+        fetch = loader.fetch
+        loader.fetch = lambda url, cache=True: priorities.append(current_priority()) or fetch(url, cache)
+
+        url = "http://www.thetvdb.com/api/B43FF87DE395DF56/mirrors.xml"
+        loader.load(url, priority=Priority.INTERACTIVE)
+        loader.load(url)
+
+        self.assertEqual(priorities, [Priority.INTERACTIVE, Priority.NORMAL])
+
+
+if __name__ == "__main__":
+    sys.exit(unittest.main())
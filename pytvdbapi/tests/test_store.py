@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2011 - 2014 Björn Larsson
+
+# This file is part of pytvdbapi.
+#
+# pytvdbapi is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pytvdbapi is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pytvdbapi.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import absolute_import, print_function
+
+import datetime
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from pytvdbapi import error
+from pytvdbapi.api import TVDB
+from pytvdbapi.store import Store
+from pytvdbapi.tests.utils import series_loader, API_KEY, DATA_PATH
+from pytvdbapi.xmlhelpers import generate_tree, parse_series
+
+SERIES_URL = u"http://thetvdb.com/api/{0}/series/1000/all/en.zip".format(API_KEY)
+
+
+def _series_data():
+    """
+    :return: The parsed data of the Test Show
+    """
+    with open(os.path.join(DATA_PATH, "series", "en.xml"), 'rb') as handle:
+        return parse_series(generate_tree(handle))
+
+
+class TestStore(unittest.TestCase):
+    def setUp(self):
+        self.store = Store()
+        self.store.save_series(u"en", _series_data())
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_load_series(self):
+        """The stored series should be found by tvdb and imdb id"""
+        data = self.store.load_series(1000, u"en")
+
+        self.assertEqual(data['Series'][0]['SeriesName'], u"Test Show")
+        self.assertEqual([e['id'] for e in data['Episode']], [5001, 5101, 5102, 5103, 5201, 5202])
+        self.assertEqual(data['Actor'], None)
+
+        self.assertEqual(self.store.load_series(u"0012345", u"en", 'imdb')['Series'][0]['id'], 1000)
+        self.assertEqual(self.store.load_series(1000, u"de"), None)
+        self.assertEqual(self.store.load_series(1001, u"en"), None)
+        self.assertRaises(error.TVDBValueError, self.store.load_series, 1000, u"en", 'foo')
+
+    def test_load_episode(self):
+        """The stored episodes should be found using all methods"""
+        def _name(data):
+            return data['EpisodeName'] if data else None
+
+        self.assertEqual(_name(self.store.load_episode(u"en", episodeid=5102)), u"The Second One")
+        self.assertEqual(_name(self.store.load_episode(
+            u"en", "default", seriesid=1000, seasonnumber=1, episodenumber=3)), u"Trois")
+        self.assertEqual(_name(self.store.load_episode(
+            u"en", "dvd", seriesid=u"1000", seasonnumber=u"2", episodenumber=u"1")), u"Return")
+        self.assertEqual(_name(self.store.load_episode(
+            u"en", "absolute", seriesid=1000, absolutenumber=5)), u"Föllow-up")
+
+        self.assertEqual(self.store.load_episode(u"en", "default", seriesid=1000, seasonnumber=1), None)
+        self.assertEqual(self.store.load_episode(u"en", "foo", seriesid=1000), None)
+
+    def test_load_episode_by_air_date(self):
+        """The stored episodes should be found by air date"""
+        data = self.store.load_episode_by_air_date(1000, u"en", datetime.date(2010, 1, 12))
+        self.assertEqual(data['id'], 5102)
+        self.assertEqual(self.store.load_episode_by_air_date(1000, u"en", datetime.date(2000, 1, 1)), None)
+
+    def test_extras(self):
+        """It should be possible to store actors and banners"""
+        self.store.save_extras(1000, 'Actor', [{'Name': u"Alice Actor"}])
+
+        self.assertEqual(self.store.load_extras(1000, 'Actor'), [{'Name': u"Alice Actor"}])
+        self.assertEqual(self.store.load_series(1000, u"en")['Actor'], [{'Name': u"Alice Actor"}])
+        self.assertEqual(self.store.load_extras(1000, 'Banner'), None)
+
+    def test_delete(self):
+        """It should be possible to remove a series or an episode"""
+        self.store.delete_episode(5102)
+        self.assertEqual(self.store.load_episode(u"en", episodeid=5102), None)
+        self.assertEqual(len(self.store.load_series(1000, u"en")['Episode']), 5)
+
+        self.store.delete_series(1000)
+        self.assertEqual(self.store.load_series(1000, u"en"), None)
+        self.assertEqual(self.store.load_episode(u"en", episodeid=5101), None)
+
+    def test_episode_series(self):
+        """The series of stored episodes should be found"""
+        self.assertEqual(self.store.episode_series([5102, 9999]), set([1000]))
+        self.assertEqual(self.store.episode_series([9999]), set())
+
+    def test_persistence(self):
+        """The data should be kept in the database file"""
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path, True)
+
+        store = Store(os.path.join(path, "shows.db"))
+        store.save_series(u"en", _series_data())
+        store.close()
+
+        store = Store(os.path.join(path, "shows.db"))
+        self.assertEqual(len(store.load_series(1000, u"en")['Episode']), 6)
+        store.close()
+
+
+class TestStoreApi(unittest.TestCase):
+    def setUp(self):
+        self.loader = series_loader()
+        self.api = TVDB(API_KEY, loader=self.loader, store=Store(), actors=True)
+
+    def test_get_series(self):
+        """A stored series should be loaded without any requests"""
+        cold = self.api.get_series(1000, "en")
+        self.loader.requests = list()
+
+        warm = self.api.get_series(1000, "en")
+        self.assertEqual(self.loader.requests, [])
+
+        self.assertEqual(len(warm), len(cold))
+        self.assertEqual(warm[1][2].EpisodeName, "The Second One")
+        self.assertEqual(len(warm.actor_objects), 2)
+
+        self.api.get_series(1000, "en", cache=False)
+        self.assertEqual(self.loader.requests.count(SERIES_URL), 1)
+
+    def test_get_episode(self):
+        """Episodes of stored series should be loaded without any requests"""
+        self.api.get_series(1000, "en")
+        self.loader.requests = list()
+
+        episode = self.api.get_episode("en", "absolute", seriesid=1000, absolutenumber=3)
+        self.assertEqual(episode.EpisodeName, "Trois")
+
+        episode = self.api.get_episode_by_air_date(1000, "en", datetime.date(2011, 1, 4))
+        self.assertEqual(episode.EpisodeName, "Return")
+        self.assertEqual(self.loader.requests, [])
+
+    def test_save_episode(self):
+        """Episodes loaded from the server should be stored"""
+        self.api.get_episode("en", episodeid=5102)
+        self.loader.requests = list()
+
+        self.assertEqual(self.api.get_episode("en", episodeid=5102).EpisodeName, "The Second One")
+        self.assertEqual(self.loader.requests, [])
+
+    def test_store_path(self):
+        """It should be possible to provide the path of the database"""
+        api = TVDB(API_KEY, loader=self.loader, store=u":memory:")
+        self.assertTrue(isinstance(api.store, Store))
+
+
+if __name__ == "__main__":
+    sys.exit(unittest.main())
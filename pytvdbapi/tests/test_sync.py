@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2011 - 2014 Björn Larsson
+
+# This file is part of pytvdbapi.
+#
+# pytvdbapi is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pytvdbapi is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pytvdbapi.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import absolute_import, print_function
+
+import gc
+import shutil
+import sys
+import tempfile
+import unittest
+
+import httplib2
+
+from pytvdbapi import error
+from pytvdbapi.api import TVDB
+from pytvdbapi.loader import Loader
+from pytvdbapi.sync import Synchronizer
+from pytvdbapi.tests.utils import series_loader, API_KEY
+
+TIME_URL = u"http://www.thetvdb.com/api/Updates.php?type=none"
+UPDATES_URL = u"http://www.thetvdb.com/api/Updates.php?type=all&time=100"
+SERIES_URL = u"http://thetvdb.com/api/{0}/series/1000/all/en.zip".format(API_KEY)
+
+
+class TestSync(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+        self.loader = series_loader()
+        self.loader.invalidated = list()
+        self.loader.invalidate = self.loader.invalidated.append
+
+        self.loader.content[TIME_URL] = ('text/xml', b'<Items><Time>100</Time></Items>')
+        self.loader.content[UPDATES_URL] = (
+            'text/xml', b'<Items><Time>200</Time><Series>1000</Series><Episode>9999</Episode></Items>')
+
+        self.api = TVDB(API_KEY, cache_dir=self.path, loader=self.loader)
+
+    def tearDown(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def test_first_sync(self):
+        """The first sync should only record the server time"""
+        self.assertEqual(self.api.synchronizer.last_time, None)
+
+        updates = self.api.sync()
+
+        self.assertEqual(updates.time, 100)
+        self.assertEqual(self.api.synchronizer.last_time, 100)
+        self.assertEqual(self.loader.invalidated, [])
+
+    def test_invalidate(self):
+        """The cached data of the changed series and episodes should be removed"""
+        self.api.sync()
+        updates = self.api.sync(languages=['en'])
+
+        self.assertEqual(updates.series, frozenset([1000]))
+        self.assertEqual(updates.episodes, frozenset([9999]))
+        self.assertEqual(self.api.synchronizer.last_time, 200)
+
+        self.assertTrue(SERIES_URL in self.loader.invalidated)
+        self.assertTrue(u"http://thetvdb.com/api/{0}/series/1000/actors.xml".format(API_KEY)
+                        in self.loader.invalidated)
+        self.assertTrue(u"http://thetvdb.com/api/{0}/episodes/9999/en.xml".format(API_KEY)
+                        in self.loader.invalidated)
+        self.assertEqual(len(self.loader.invalidated), 4)
+
+    def test_changed_episode(self):
+        """A changed episode should invalidate the full data of its series"""
+        api = TVDB(API_KEY, cache_dir=self.path, loader=self.loader, store=":memory:")
+        api.sync()
+
+        episode_id = api.get_series(1000, "en")[1][2].id
+        self.loader.content[UPDATES_URL] = (
+            'text/xml', u"<Items><Time>200</Time><Episode>{0}</Episode></Items>".format(episode_id).encode())
+
+        api.sync(refresh=False, languages=['en'])
+
+        self.assertTrue(SERIES_URL in self.loader.invalidated)
+        self.assertEqual(api.store.load_series(1000, "en"), None)
+
+    def test_saved_time(self):
+        """The time of the last sync should be stored in the state file"""
+        synchronizer = Synchronizer(self.api, self.path + "/sync/state.json")
+        synchronizer.sync()
+
+        self.assertEqual(Synchronizer(self.api, self.path + "/sync/state.json").last_time, 100)
+
+    def test_refresh(self):
+        """Only the loaded shows affected by the changes should be reloaded"""
+        self.api.sync()
+
+        show = self.api.get_series(1000, "en")
+        self.api.search("Test Show", "en")
+        self.loader.requests = list()
+
+        self.api.sync(languages=['en'])
+
+        self.assertEqual(self.loader.requests.count(SERIES_URL), 1)
+        self.assertEqual(len(show), 3)
+        self.assertEqual(len(self.api.search_buffer), 0)
+
+    def test_no_refresh(self):
+        """It should be possible to only invalidate the cached data"""
+        self.api.sync()
+        self.api.get_series(1000, "en")
+        self.loader.requests = list()
+
+        self.api.sync(refresh=False, languages=['en'])
+        self.assertEqual(self.loader.requests.count(SERIES_URL), 0)
+
+    def test_tracked_shows(self):
+        """Shows no longer in use should not be tracked"""
+        show = self.api.get_series(1000, "en")
+        self.assertEqual(self.api.shows(), [show])
+
+        del show
+        gc.collect()
+        self.assertEqual(self.api.shows(), [])
+
+    def test_bad_data(self):
+        """An error from the server should raise BadData"""
+        self.loader.content[TIME_URL] = ('text/xml', b'<Items><Error>Too old</Error></Items>')
+        self.assertRaises(error.BadData, self.api.sync)
+        self.assertEqual(self.api.synchronizer.last_time, None)
+
+    def test_reset(self):
+        """It should be possible to forget the last sync"""
+        synchronizer = Synchronizer(self.api, self.path + "/state.json")
+        synchronizer.sync()
+        self.assertEqual(synchronizer.last_time, 100)
+
+        synchronizer.reset()
+        self.assertEqual(synchronizer.last_time, None)
+
+
+class TestLoaderInvalidate(unittest.TestCase):
+    def test_invalidate(self):
+        """Invalidating an url should remove it from the http cache"""
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path, True)
+
+        url = u"http://thetvdb.com/api/key/series/1/all/en.zip"
+        loader = Loader(path)
+        key = httplib2.urlnorm(url)[-1]
+
+        loader.http.cache.set(key, b"data")
+        loader.invalidate(url)
+        self.assertEqual(loader.http.cache.get(key), None)
+
+
+if __name__ == "__main__":
+    sys.exit(unittest.main())
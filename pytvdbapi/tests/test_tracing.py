@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2011 - 2014 Björn Larsson
+
+# This file is part of pytvdbapi.
+#
+# pytvdbapi is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pytvdbapi is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pytvdbapi.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import absolute_import, print_function
+
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+from pytvdbapi import error, tracing
+from pytvdbapi.api import TVDB
+from pytvdbapi.tests import basetest
+from pytvdbapi.tests.utils import series_loader, API_KEY
+
+
+class Recorder(tracing.Hook):
+    """A hook keeping the spans reported"""
+
+    def __init__(self):
+        self.started, self.finished = list(), list()
+
+    def start(self, span):
+        self.started.append(span)
+
+    def finish(self, span):
+        self.finished.append(span)
+
+    def named(self, name):
+        """:return: The finished spans called *name*"""
+        return [s for s in self.finished if s.name == name]
+
+
+class FailingHook(tracing.Hook):
+    def finish(self, span):
+        raise ValueError(u"Failed")
+
+
+class TestTracer(basetest.pytvdbapiTest):
+    def setUp(self):
+        super(TestTracer, self).setUp()
+        self.tracer, self.recorder = tracing.Tracer(), Recorder()
+        self.tracer.add_hook(self.recorder)
+
+    def test_no_hooks(self):
+        """Without hooks no spans should be created"""
+        self.assertTrue(tracing.Tracer().span('foo') is tracing.NULL_SPAN)
+        self.assertTrue(tracing.span('foo') is tracing.NULL_SPAN)
+
+    def test_nesting(self):
+        """Spans opened within a span should be its children"""
+        with self.tracer.span('outer', url=u"http://foo.bar") as outer:
+            self.assertTrue(tracing.current() is outer)
+            with tracing.span('inner', count=2) as inner:
+                self.assertTrue(tracing.current() is inner)
+
+        self.assertEqual(tracing.current(), None)
+        self.assertEqual([s.name for s in self.recorder.started], ['outer', 'inner'])
+        self.assertEqual([s.name for s in self.recorder.finished], ['inner', 'outer'])
+
+        self.assertTrue(inner.parent is outer)
+        self.assertTrue(inner.root() is outer)
+        self.assertEqual(inner.lookup('url'), u"http://foo.bar")
+        self.assertEqual(inner.lookup('count'), 2)
+        self.assertEqual(inner.lookup('missing', 1), 1)
+        self.assertTrue(outer.duration >= inner.duration >= 0)
+
+    def test_error(self):
+        """The exception raised within a span should be kept in the span"""
+        def _fail():
+            with self.tracer.span('fail'):
+                raise error.BadData(u"Bad")
+
+        self.assertRaises(error.BadData, _fail)
+        self.assertEqual(type(self.recorder.finished[0].attributes['error']), error.BadData)
+
+    def test_failing_hook(self):
+        """A failing hook should not affect the traced work"""
+        self.tracer.add_hook(FailingHook())
+        with self.tracer.span('foo'):
+            pass
+        self.assertEqual(len(self.recorder.finished), 1)
+
+    def test_remove_hook(self):
+        """A removed hook should no longer receive the spans"""
+        self.tracer.remove_hook(self.recorder)
+        self.assertTrue(self.tracer.span('foo') is tracing.NULL_SPAN)
+
+    def test_bind(self):
+        """A bound function run in another thread should open its spans within the caller span"""
+        def _work():
+            with tracing.span('work'):
+                pass
+
+        with self.tracer.span('outer') as outer:
+            thread = threading.Thread(target=tracing.bind(_work))
+            thread.start()
+            thread.join()
+
+        self.assertTrue(self.recorder.named('work')[0].parent is outer)
+
+
+class TestApiTracing(basetest.pytvdbapiTest):
+    def setUp(self):
+        super(TestApiTracing, self).setUp()
+        self.tmp = tempfile.mkdtemp()
+        self.recorder = Recorder()
+        self.api = TVDB(API_KEY, loader=series_loader(), cache_dir=self.tmp, actors=True)
+        self.api.tracer.add_hook(self.recorder)
+
+    def tearDown(self):
+        super(TestApiTracing, self).tearDown()
+        shutil.rmtree(self.tmp)
+
+    def test_get_series(self):
+        """Loading a show should report the load, parse and build spans within the get_series span"""
+        self.api.get_series(1000, "en")
+
+        root = self.recorder.named('get_series')[0]
+        self.assertTrue(root.attributes['url'].endswith(u"/series/1000/all/en.zip"))
+
+        loads = self.recorder.named('load')
+        self.assertEqual([s.attributes['url'].rsplit('/', 1)[-1] for s in loads],
+                         ['mirrors.xml', 'en.zip', 'actors.xml'])
+        self.assertEqual(loads[1].root(), root)
+        self.assertTrue(loads[1].attributes['size'] > 0)
+        self.assertEqual(loads[1].attributes['source'], u"network")
+
+        streamed = self.recorder.named('iterparse')[0]
+        self.assertEqual(streamed.parent, root)
+        self.assertTrue(streamed.attributes['count'] > 1)
+
+        trees = self.recorder.named('generate_tree')
+        self.assertEqual([s.attributes['element'] for s in trees], [u"Mirrors"])
+
+        parsed = self.recorder.named('parse_xml')[-1]
+        built = self.recorder.named('build')[-1]
+        self.assertEqual(parsed.attributes['element'], u"Actor")
+        self.assertEqual(built.attributes['count'], parsed.attributes['count'])
+
+        actors = self.recorder.named('load_actors')[0]
+        self.assertTrue(actors.parent is root)
+
+    def test_update(self):
+        """Updating a show should be reported as a populate_data span"""
+        show = self.api.get_series(1000, "en")
+        del self.recorder.finished[:]
+
+        show.update()
+
+        populate = self.recorder.named('populate_data')[0]
+        self.assertEqual(populate.attributes['seriesid'], 1000)
+        self.assertTrue(populate.attributes['url'].endswith(u"/series/1000/all/en.zip"))
+        self.assertTrue(populate.duration >= 0)
+
+        streamed = self.recorder.named('iterparse')[0]
+        self.assertEqual(streamed.lookup('url'), populate.attributes['url'])
+
+    def test_error(self):
+        """A failed load should be reported with the error"""
+        self.assertRaises(error.TVDBNotFoundError, self.api.get_episode, "en", episodeid=1)
+
+        load = self.recorder.named('load')[-1]
+        self.assertEqual(type(load.attributes['error']), error.TVDBNotFoundError)
+        self.assertEqual(load.parent.name, 'get_episode')
+
+
+if __name__ == "__main__":
+    sys.exit(unittest.main())
@@ -18,9 +18,12 @@
 # along with pytvdbapi.  If not, see <http://www.gnu.org/licenses/>.
 
 from __future__ import absolute_import, print_function
+import threading
+import time
 import unittest
 
-from pytvdbapi.utils import InsensitiveDictionary
+from pytvdbapi import error
+from pytvdbapi.utils import InsensitiveDictionary, InternTable, SingleFlight, concurrent_map
 
 
 class TestInsensitiveDictionary(unittest.TestCase):
@@ -200,6 +203,141 @@ class TestInsensitiveDictionary(unittest.TestCase):
         for i in d:
             self.assertTrue(i in keys)
 
+
+class TestConcurrentMap(unittest.TestCase):
+    """Test the concurrent map function"""
+
+    def test_ordered(self):
+        """The results should be returned in the same order as the items"""
+        result = concurrent_map(lambda x: (time.sleep(0.001 * (x % 3)), x)[1], range(20), max_workers=4)
+        self.assertEqual(list(result), list(range(20)))
+
+    def test_as_completed(self):
+        """All results should be returned when not ordered"""
+        result = concurrent_map(lambda x: x * 2, range(20), max_workers=4, ordered=False)
+        self.assertEqual(sorted(result), [x * 2 for x in range(20)])
+
+    def test_bounded(self):
+        """No more than max_workers calls should run at the same time"""
+        lock, state = threading.Lock(), {'running': 0, 'max': 0}
+
+        def _func(item):
+            with lock:
+                state['running'] += 1
+                state['max'] = max(state['max'], state['running'])
+            time.sleep(0.002)
+            with lock:
+                state['running'] -= 1
+            return item
+
+        list(concurrent_map(_func, range(30), max_workers=3))
+        self.assertTrue(state['max'] <= 3)
+
+    def test_exceptions(self):
+        """Exceptions should be raised unless return_exceptions is True"""
+        self.assertRaises(ZeroDivisionError, list, concurrent_map(lambda x: 1 / x, range(3)))
+
+        result = list(concurrent_map(lambda x: 1 / x, range(3), return_exceptions=True))
+        self.assertEqual(type(result[0]), ZeroDivisionError)
+
+    def test_invalid_workers(self):
+        """max_workers less than 1 should raise TVDBValueError"""
+        self.assertRaises(error.TVDBValueError, list, concurrent_map(len, [], max_workers=0))
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Test the call coalescing"""
+
+    def _run(self, func, count=5):
+        """Call func concurrently through a SingleFlight instance"""
+        flight, results = SingleFlight(), list()
+
+        def _call():
+            try:
+                results.append(flight.do('key', func))
+            except ValueError as _error:
+                results.append(_error)
+
+        threads = [threading.Thread(target=_call) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_shared_result(self):
+        """Concurrent calls should share the result of one call"""
+        calls = list()
+        results = self._run(lambda: (calls.append(1), time.sleep(0.2), 'value')[2])
+
+        self.assertEqual(results, ['value'] * 5)
+        self.assertEqual(len(calls), 1)
+
+    def test_shared_error(self):
+        """Concurrent calls should share the exception raised"""
+        def _func():
+            time.sleep(0.2)
+            raise ValueError("error")
+
+        results = self._run(_func)
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(isinstance(r, ValueError) for r in results))
+
+    def test_sequential_calls(self):
+        """Calls made after the previous finished should not be coalesced"""
+        flight, calls = SingleFlight(), list()
+
+        flight.do('key', calls.append, 1)
+        flight.do('key', calls.append, 2)
+        self.assertEqual(calls, [1, 2])
+
+
+
+class TestInternTable(unittest.TestCase):
+    def test_shared(self):
+        """Equal strings and integers should be replaced by a single instance"""
+        table = InternTable()
+        first, second = u"".join([u"Net", u"work"]), u"".join([u"Netw", u"ork"])
+        self.assertFalse(first is second)
+        self.assertTrue(table.intern(first) is first)
+        self.assertTrue(table.intern(second) is first)
+        self.assertTrue(table.intern(int("123456")) is table.intern(int("123456")))
+
+    def test_types(self):
+        """Equal values of different types should not be mixed"""
+        table = InternTable()
+        table.intern(1)
+        self.assertEqual(type(table.intern(1.0)), float)
+        self.assertEqual(type(table.intern(True)), bool)
+
+    def test_list(self):
+        """The list entries should be interned in place"""
+        table = InternTable()
+        name = table.intern(u"".join([u"Dra", u"ma"]))
+        values = [u"".join([u"Dr", u"ama"]), u"Crime"]
+
+        self.assertTrue(table.intern(values) is values)
+        self.assertTrue(values[0] is name)
+
+    def test_bounded(self):
+        """The table should be emptied when full and skip long strings"""
+        table = InternTable(max_size=10, max_length=5)
+        for value in range(1000, 1015):
+            table.intern(value)
+        self.assertTrue(len(table) <= 10)
+
+        table.intern(u"Too long")
+        self.assertEqual(len(table), 4)
+
+        table.clear()
+        self.assertEqual(len(table), 0)
+
+    def test_disabled(self):
+        """Nothing should be interned with a max_size of 0"""
+        table = InternTable(max_size=0)
+        table.intern(u"foo")
+        self.assertEqual(len(table), 0)
+
 if __name__ == "__main__":
     import sys
     sys.exit(unittest.main())
@@ -0,0 +1,419 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2011 - 2014 Björn Larsson
+
+# This file is part of pytvdbapi.
+#
+# pytvdbapi is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pytvdbapi is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pytvdbapi.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import absolute_import, print_function
+
+import datetime
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import unittest
+from io import BytesIO
+
+from pytvdbapi import error
+from pytvdbapi.api import TVDB
+from pytvdbapi.tests import basetest
+from pytvdbapi.tests.utils import series_loader, API_KEY, DATA_PATH
+from pytvdbapi.store import Store
+from pytvdbapi.xmlhelpers import (generate_tree, iterparse_xml, parse_series, parse_xml, LazyDictionary,
+                                  RawRecord, EtreeParser, ExpatParser, LxmlParser, PARSERS,
+                                  get_parser, register_parser, INTERN_TABLE, CompactRecord, RecordLayout,
+                                  compact_records, make_record, intern_records)
+
+SERIES_PATH = os.path.join(DATA_PATH, "series", "en.xml")
+
+DATA = b"""<?xml version="1.0" encoding="UTF-8" ?>
+<Data>
+  <Series><id>1</id><Genre>|Drama|Crime|</Genre><FirstAired>2006-10-01</FirstAired></Series>
+  <Other><id>2</id></Other>
+  <Episode><id>3</id><Rating>7.5</Rating><EpisodeName></EpisodeName></Episode>
+</Data>"""
+
+
+class TestParseXml(basetest.pytvdbapiTest):
+    def test_conversion(self):
+        """The values should be converted into native types"""
+        series = parse_xml(generate_tree(BytesIO(DATA)), 'Series')[0]
+        self.assertEqual(series['id'], 1)
+        self.assertEqual(series['Genre'], [u"Drama", u"Crime"])
+        self.assertEqual(series['FirstAired'], datetime.date(2006, 10, 1))
+
+        episode = parse_xml(generate_tree(BytesIO(DATA)), 'Episode')[0]
+        self.assertEqual(episode['Rating'], 7.5)
+        self.assertEqual(episode['EpisodeName'], u"")
+
+    def test_schema(self):
+        """The known fields should be converted to their declared type"""
+        data = b"""<Data><Episode>
+            <id>0042</id><EpisodeName>1984</EpisodeName><IMDB_ID>0773262</IMDB_ID><Rating>7</Rating>
+            <GuestStars></GuestStars><Writer>|Jane Doe|</Writer><Director>Dee Rector</Director>
+            <SeasonNumber>unknown</SeasonNumber><FirstAired></FirstAired><Unknown>12</Unknown>
+        </Episode></Data>"""
+        episode = parse_xml(generate_tree(BytesIO(data)), 'Episode')[0]
+
+        self.assertEqual(episode['id'], 42)
+        self.assertEqual(episode['EpisodeName'], u"1984")
+        self.assertEqual(episode['IMDB_ID'], u"0773262")
+        self.assertEqual(episode['Rating'], 7.0)
+        self.assertEqual(type(episode['Rating']), float)
+        self.assertEqual(episode['GuestStars'], [])
+        self.assertEqual(episode['Writer'], [u"Jane Doe"])
+        self.assertEqual(episode['Director'], [u"Dee Rector"])
+        self.assertEqual(episode['SeasonNumber'], u"unknown")
+        self.assertEqual(episode['FirstAired'], u"")
+        self.assertEqual(episode['Unknown'], 12)
+
+
+class TestIterparseXml(basetest.pytvdbapiTest):
+    def test_records(self):
+        """The requested elements should be returned in document order"""
+        records = list(iterparse_xml(BytesIO(DATA), ('Series', 'Episode')))
+        self.assertEqual([element for element, _ in records], ['Series', 'Episode'])
+        self.assertEqual(records[0][1]['Genre'], [u"Drama", u"Crime"])
+        self.assertEqual(records[1][1]['Rating'], 7.5)
+
+    def test_same_as_parse_xml(self):
+        """The streamed data should be the same as the data parsed from the tree"""
+        with open(SERIES_PATH, 'rb') as handle:
+            expected = parse_series(generate_tree(handle))
+
+        with open(SERIES_PATH, 'rb') as handle:
+            streamed = dict((element, list()) for element in ('Series', 'Episode'))
+            for element, data in iterparse_xml(handle, ('Series', 'Episode')):
+                streamed[element].append(data)
+
+        self.assertEqual(streamed, expected)
+
+    def test_lazy(self):
+        """The elements should be converted one at a time"""
+        records = iterparse_xml(BytesIO(DATA), ('Series', 'Episode'))
+        element, data = next(records)
+        self.assertEqual(element, 'Series')
+        self.assertEqual(data['id'], 1)
+
+    def test_bad_data(self):
+        """Bad XML data should raise BadData"""
+        records = iterparse_xml(BytesIO(b"<Data><Series>"), ('Series',))
+        self.assertRaises(error.BadData, list, records)
+
+
+class TestLazyDictionary(basetest.pytvdbapiTest):
+    def setUp(self):
+        super(TestLazyDictionary, self).setUp()
+        self.raw = parse_xml(generate_tree(BytesIO(DATA)), 'Series', lazy=True)[0]
+
+    def test_raw(self):
+        """The lazily parsed data should hold the unconverted text"""
+        self.assertTrue(isinstance(self.raw, RawRecord))
+        self.assertEqual(self.raw.element, 'Series')
+        self.assertEqual(self.raw['Genre'], u"|Drama|Crime|")
+
+    def test_convert_on_access(self):
+        """The values should be converted when accessed and the result kept"""
+        data = LazyDictionary(self.raw)
+        self.assertEqual(data._data['id'], u"1")
+
+        self.assertEqual(data['id'], 1)
+        self.assertEqual(data._data['id'], 1)
+        self.assertTrue(data['Genre'] is data['Genre'])
+        self.assertEqual(data['FirstAired'], datetime.date(2006, 10, 1))
+
+    def test_ignore_case(self):
+        """The keys should be case insensitive if configured"""
+        data = LazyDictionary(self.raw, ignore_case=True)
+        self.assertEqual(data['genre'], [u"Drama", u"Crime"])
+        self.assertEqual(data['GENRE'], [u"Drama", u"Crime"])
+
+    def test_items(self):
+        """All values should be converted when listing the items"""
+        data = LazyDictionary(self.raw)
+        self.assertEqual(dict(data.items()), parse_xml(generate_tree(BytesIO(DATA)), 'Series')[0])
+
+    def test_set(self):
+        """A value set should not be converted"""
+        data = LazyDictionary(self.raw)
+        data['id'] = u"2"
+        data.update_record({'Genre': u"|Comedy|"})
+        self.assertEqual(data['id'], u"2")
+        self.assertEqual(data['Genre'], u"|Comedy|")
+
+    def test_pickle(self):
+        """The unconverted values should survive pickling"""
+        data = pickle.loads(pickle.dumps(LazyDictionary(self.raw), 2))
+        self.assertEqual(data['Genre'], [u"Drama", u"Crime"])
+
+        raw = pickle.loads(pickle.dumps(self.raw, 2))
+        self.assertEqual(raw.element, 'Series')
+
+    def test_clashing_fields(self):
+        """Fields with the same case insensitive name should be converted by their own type"""
+        raw = RawRecord('Series', [('SeriesID', u"0034"), ('seriesid', u"12")])
+        self.assertEqual(LazyDictionary(raw, ignore_case=True)['SeriesID'], 12)
+
+        raw = RawRecord('Series', [('seriesid', u"12"), ('SeriesID', u"0034")])
+        self.assertEqual(LazyDictionary(raw, ignore_case=True)['seriesid'], u"0034")
+
+    def test_make_record(self):
+        """Only unconverted data should be kept in a LazyDictionary"""
+        self.assertTrue(isinstance(make_record(self.raw), LazyDictionary))
+        self.assertFalse(isinstance(make_record({'id': 1}), LazyDictionary))
+        self.assertTrue(isinstance(make_record({'id': 1}, lazy=True), LazyDictionary))
+        self.assertEqual(make_record({'Id': 1}, ignore_case=True)['ID'], 1)
+
+
+class TestCompactRecord(basetest.pytvdbapiTest):
+    def setUp(self):
+        super(TestCompactRecord, self).setUp()
+        rows = [{'id': 1, 'Name': u"foo"}, {'id': 2, 'Name': u"bar"}]
+        self.first, self.second = compact_records(rows)
+
+    def test_mapping(self):
+        """The record should behave as the dictionary it was built from"""
+        self.assertEqual(self.first['Name'], u"foo")
+        self.assertEqual(dict(self.first.items()), {'id': 1, 'Name': u"foo"})
+        self.assertEqual(sorted(self.first.keys()), ['Name', 'id'])
+        self.assertEqual(len(self.first), 2)
+        self.assertTrue('id' in self.first)
+        self.assertEqual(self.first.get('missing'), None)
+        self.assertRaises(KeyError, lambda: self.first['name'])
+
+    def test_shared_layout(self):
+        """Records with the same keys should share the layout, also after adding the same key"""
+        self.assertTrue(self.first._layout is self.second._layout)
+
+        self.first['url'], self.second['url'] = u"a", u"b"
+        self.assertTrue(self.first._layout is self.second._layout)
+        self.assertEqual(self.second['url'], u"b")
+
+        del self.first['url']
+        self.assertEqual(dict(self.first.items()), {'id': 1, 'Name': u"foo"})
+        self.assertFalse(hasattr(self.first, '__dict__'))
+
+    def test_ignore_case(self):
+        """The keys should be case insensitive if requested"""
+        record = make_record({'Name': u"foo", 'id': 1}, ignore_case=True, compact=True)
+        self.assertEqual(record['NAME'], u"foo")
+        self.assertEqual(sorted(record.keys()), ['id', 'name'])
+
+        record = make_record({'Language': u"en", 'language': u"en"}, ignore_case=True, compact=True)
+        self.assertEqual(record.keys(), ['language'])
+        self.assertEqual(RecordLayout.get(['Language', 'language'], True), None)
+
+    def test_raw(self):
+        """The values of a raw record should be converted when built"""
+        record = make_record(RawRecord('Episode', {'Rating': u"7.5", 'IMDB_ID': u"123"}), compact=True)
+        self.assertEqual(record['Rating'], 7.5)
+        self.assertEqual(record['IMDB_ID'], u"123")
+
+    def test_update_record(self):
+        """Updating should add and replace the values"""
+        self.first.update_record({'Name': u"baz", 'Extra': 1})
+        self.assertEqual(dict(self.first.items()), {'id': 1, 'Name': u"baz", 'Extra': 1})
+
+        self.first.clear()
+        self.assertEqual(len(self.first), 0)
+
+    def test_pickle(self):
+        """A pickled record should share the layout when loaded"""
+        loaded = pickle.loads(pickle.dumps(self.first))
+        self.assertEqual(loaded, self.first)
+        self.assertTrue(loaded._layout is self.second._layout)
+
+
+class TestParsers(basetest.pytvdbapiTest):
+    def _parsers(self):
+        """:return: Instances of all available backends"""
+        return [parser() for parser in PARSERS if parser.available()] + [ExpatParser(chunk_size=7)]
+
+    def test_same_data(self):
+        """All backends should return the same data as parse_xml"""
+        with open(SERIES_PATH, 'rb') as handle:
+            expected = parse_series(generate_tree(handle))
+
+        for parser in self._parsers():
+            with open(SERIES_PATH, 'rb') as handle:
+                self.assertEqual(parser.parse(handle, ('Series', 'Episode')), expected)
+
+            with open(SERIES_PATH, 'rb') as handle:
+                lazy = parser.parse(handle, ('Series', 'Episode'), lazy=True)
+            self.assertTrue(isinstance(lazy['Episode'][0], RawRecord))
+            self.assertEqual(dict(LazyDictionary(lazy['Episode'][0]).items()), expected['Episode'][0])
+
+    def test_fields(self):
+        """Only the requested fields should be kept"""
+        fields = {'Series': ('id', 'FirstAired'), 'Episode': None}
+        for parser in self._parsers():
+            for lazy in (False, True):
+                result = parser.parse(BytesIO(DATA), ('Series', 'Episode'), lazy, fields)
+                self.assertEqual(sorted(result['Series'][0].keys()), ['FirstAired', 'id'])
+                self.assertEqual(sorted(result['Episode'][0].keys()), ['EpisodeName', 'Rating', 'id'])
+
+        self.assertEqual(parse_xml(generate_tree(BytesIO(DATA)), 'Series', fields=['Genre']),
+                         [{'Genre': [u"Drama", u"Crime"]}])
+
+    def test_interned(self):
+        """The values repeated across the records should be shared"""
+        for parser in self._parsers():
+            for lazy in (False, True):
+                with open(SERIES_PATH, 'rb') as handle:
+                    episodes = [LazyDictionary(record) for record in
+                                parser.parse(handle, ('Episode',), lazy)['Episode']]
+
+                self.assertEqual(episodes[0]['Language'], episodes[1]['Language'])
+                self.assertTrue(episodes[0]['Language'] is episodes[1]['Language'])
+                self.assertTrue(episodes[0]['seriesid'] is episodes[1]['seriesid'])
+
+        self.assertTrue(len(INTERN_TABLE) > 0)
+
+    def test_intern_records(self):
+        """Deserialized records should share the values of the parsed ones"""
+        with open(SERIES_PATH, 'rb') as handle:
+            parsed = get_parser(u"etree").parse(handle, ('Episode',))['Episode'][0]
+        loaded = intern_records(pickle.loads(pickle.dumps([parsed, RawRecord('Episode', parsed)], 2)))
+
+        def _key(record):
+            return [key for key in record if key == 'EpisodeName'][0]
+
+        for record in loaded:
+            self.assertEqual(record, parsed)
+            self.assertTrue(record['Language'] is parsed['Language'])
+            self.assertTrue(_key(record) is _key(parsed))
+        self.assertEqual(loaded[1].element, 'Episode')
+
+    def test_missing_elements(self):
+        """Elements not found should give empty lists"""
+        for parser in self._parsers():
+            self.assertEqual(parser.parse(BytesIO(DATA), ('Error', 'Episode'))['Error'], [])
+
+    def test_bad_data(self):
+        """Bad XML data should raise BadData"""
+        for parser in self._parsers():
+            for data in (b"", b"<Data><Series>", b"<Data></Series>"):
+                self.assertRaises(error.BadData, parser.parse, BytesIO(data), ('Series',))
+
+    def test_get_parser(self):
+        """The preferred available backend should be used by default"""
+        preferred = LxmlParser if LxmlParser.available() else EtreeParser
+        self.assertEqual(type(get_parser()), preferred)
+        self.assertEqual(type(get_parser(u"auto")), preferred)
+        self.assertEqual(type(get_parser(u"etree")), EtreeParser)
+        self.assertEqual(type(get_parser(u"expat")), ExpatParser)
+
+        parser = ExpatParser()
+        self.assertTrue(get_parser(parser) is parser)
+        self.assertRaises(error.TVDBValueError, get_parser, u"foo")
+
+        if not LxmlParser.available():
+            self.assertRaises(error.TVDBValueError, get_parser, u"lxml")
+
+    def test_register(self):
+        """A registered backend should be selectable by name"""
+        class Custom(EtreeParser):
+            name = u"custom"
+
+        original = list(PARSERS)
+        try:
+            register_parser(Custom)
+            self.assertEqual(type(get_parser(u"custom")), Custom)
+            self.assertNotEqual(type(get_parser()), Custom)
+
+            register_parser(Custom, preferred=True)
+            self.assertEqual(type(get_parser()), Custom)
+        finally:
+            PARSERS[:] = original
+
+    def test_api_parser(self):
+        """The backend used by the API should be selectable"""
+        tmp = tempfile.mkdtemp()
+        try:
+            for name in (u"etree", u"expat"):
+                api = TVDB(API_KEY, loader=series_loader(), cache_dir=tmp, parser=name, actors=True)
+                self.assertEqual(api.parser.name, name)
+
+                show = api.get_series(1000, "en")
+                self.assertEqual(show.actor_objects[0].Name, u"Alice Actor")
+                self.assertEqual(api.get_episode("en", episodeid=5102).EpisodeName, u"The Second One")
+                self.assertEqual(api.search("Test Show", "en")[0].SeriesName, u"Test Show")
+        finally:
+            shutil.rmtree(tmp)
+
+
+class TestStreamedShow(basetest.pytvdbapiTest):
+    def setUp(self):
+        super(TestStreamedShow, self).setUp()
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        super(TestStreamedShow, self).tearDown()
+        shutil.rmtree(self.tmp)
+
+    def test_streamed_show(self):
+        """A show created from the streamed data should equal one created from the parsed tree"""
+        streamed = TVDB(API_KEY, loader=series_loader(), cache_dir=self.tmp).get_series(1000, "en")
+        parsed = TVDB(API_KEY, loader=series_loader(), cache_dir=self.tmp,
+                      record_cache=True).get_series(1000, "en")
+
+        self.assertEqual(streamed.SeriesName, parsed.SeriesName)
+        self.assertEqual(sorted(streamed.seasons), sorted(parsed.seasons))
+        for season in parsed:
+            self.assertEqual([e.id for e in streamed[season.season_number]], [e.id for e in season])
+
+    def test_update(self):
+        """Updating a show should stream the series data"""
+        show = TVDB(API_KEY, loader=series_loader(), cache_dir=self.tmp).get_series(1000, "en")
+        count = len(show[1])
+
+        show.update()
+        self.assertEqual(len(show[1]), count)
+
+    def test_lazy(self):
+        """A show loaded lazily should have the same attributes as one converted directly"""
+        lazy = TVDB(API_KEY, loader=series_loader(), cache_dir=self.tmp, lazy=True,
+                    actors=True, banners=True).get_series(1000, "en")
+        converted = TVDB(API_KEY, loader=series_loader(), cache_dir=self.tmp,
+                         actors=True, banners=True).get_series(1000, "en")
+
+        episode = lazy[1][1]
+        self.assertEqual(episode.data._data['Rating'], u"7.8")
+        self.assertEqual(episode.Rating, 7.8)
+
+        self.assertEqual(dict(lazy.data.items()), dict(converted.data.items()))
+        for season in converted:
+            for expected in season:
+                episode = lazy[season.season_number][expected.EpisodeNumber]
+                self.assertEqual(dict(episode.data.items()), dict(expected.data.items()))
+
+        self.assertEqual(lazy.actor_objects[0].SortOrder, converted.actor_objects[0].SortOrder)
+        self.assertEqual(lazy.banner_objects[0].Rating, converted.banner_objects[0].Rating)
+
+    def test_lazy_store(self):
+        """Lazily parsed data should be written to and read from the store"""
+        store = Store()
+        api = TVDB(API_KEY, loader=series_loader(), cache_dir=self.tmp, lazy=True, store=store)
+        api.get_series(1000, "en")
+
+        api = TVDB(API_KEY, loader=series_loader(), cache_dir=self.tmp, store=store)
+        episode = api.get_episode_by_air_date(1000, "en", datetime.date(2010, 1, 12))
+        self.assertEqual(episode.FirstAired, datetime.date(2010, 1, 12))
+
+
+if __name__ == "__main__":
+    sys.exit(unittest.main())
@@ -17,13 +17,25 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with pytvdbapi.  If not, see <http://www.gnu.org/licenses/>.
 
-__all__ = ['file_loader']
+__all__ = ['file_loader', 'StaticLoader', 'series_loader', 'API_KEY']
 
 # pylint: disable W0622
 try:
     from io import open  # For Py 2.6 - 2.7
 except ImportError:
     pass
+
+import os
+import zipfile
+from io import BytesIO
+
+from pytvdbapi import error
+from pytvdbapi.loader import BaseLoader
+
+#: The API key used by the tests
+API_KEY = "B43FF87DE395DF56"
+
+DATA_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "data"))
 # pylint: enable W0622
 
 
@@ -41,3 +53,59 @@ def file_loader(_file):
         handle.close()
 
     return data
+
+
+class StaticLoader(BaseLoader):
+    """
+    A loader serving pre defined content without touching the network.
+
+    :param content: A dictionary mapping an url to a tuple *(content_type, data)*
+    """
+
+    def __init__(self, content=None):
+        self.content = content or dict()
+        self.requests = list()
+
+    def add_file(self, url, path, content_type='text/xml'):
+        """Serve the content of the file at *path* for *url*"""
+        with open(path, mode='rb') as handle:
+            self.content[url] = (content_type, handle.read())
+
+    def fetch(self, url, cache=True):
+        self.requests.append(url)
+        try:
+            content_type, data = self.content[url]
+        except KeyError:
+            raise error.TVDBNotFoundError(u"Data not found")
+        return {'content-type': content_type}, data
+
+
+def series_loader(api_key=API_KEY):
+    """
+    :return: A :class:`StaticLoader` serving the mirror list and the data for
+        the *Test Show* (id 1000) found in the data directory.
+    """
+    loader = StaticLoader()
+    series_path = os.path.join(DATA_PATH, "series")
+    context = {'api_key': api_key, 'mirror': u"http://thetvdb.com"}
+
+    loader.add_file(u"http://www.thetvdb.com/api/{api_key}/mirrors.xml".format(**context),
+                    os.path.join(DATA_PATH, "mirrors.xml"))
+    loader.add_file(u"http://www.thetvdb.com/api/GetSeries.php?seriesname=Test%20Show&language=en",
+                    os.path.join(series_path, "search.xml"))
+    loader.add_file(u"{mirror}/api/{api_key}/series/1000/actors.xml".format(**context),
+                    os.path.join(series_path, "actors.xml"))
+    loader.add_file(u"{mirror}/api/{api_key}/series/1000/banners.xml".format(**context),
+                    os.path.join(series_path, "banners.xml"))
+    loader.add_file(u"{mirror}/api/{api_key}/episodes/5102/en.xml".format(**context),
+                    os.path.join(series_path, "episode.xml"))
+
+    data = BytesIO()
+    zip_file = zipfile.ZipFile(data, 'w')
+    zip_file.write(os.path.join(series_path, "en.xml"), "en.xml")
+    zip_file.close()
+
+    loader.content[u"{mirror}/api/{api_key}/series/1000/all/en.zip".format(**context)] = (
+        'application/zip', data.getvalue())
+
+    return loader
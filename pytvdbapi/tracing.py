@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2011 - 2014 Björn Larsson
+
+# This file is part of pytvdbapi.
+#
+# pytvdbapi is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pytvdbapi is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with pytvdbapi.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+.. versionadded:: 0.6
+
+A module providing hooks for tracing the work done by the API.
+
+The work is described by nested :class:`Span` instances. Each call made
+through a :class:`pytvdbapi.api.TVDB` instance, such as *get_series*, opens a
+span carrying the url loaded and within it the following spans are opened:
+
+* **load** around each load made by the loader, with the *url*, the *size* of the
+  response in bytes and its *source*, *cache*, *revalidated* or *network*.
+* **generate_tree** around the building of an element tree, used for the list
+  of mirrors and the updates, with the root *element* name and the *count* of
+  elements directly below it.
+* **parse_xml** around the parsing of a response into dictionaries, with the
+  name of the first *element* parsed and the *count* of elements found, see
+  :class:`pytvdbapi.xmlhelpers.Parser`.
+* **populate_data** around :func:`pytvdbapi.api.Show.update` and the initial
+  loading of the show data.
+* **build** around the creation of the objects, with the *element* name and the
+  *count* of objects created.
+* **iterparse** around the creation of the episodes from the streamed series
+  data, see :func:`pytvdbapi.xmlhelpers.Parser.iterparse`. The parsing is
+  interleaved with the creation of the objects, so this span replaces the
+  *generate_tree*, *parse_xml* and *build* spans.
+
+A span that fails has the exception in its *error* attribute. The spans are
+reported to the :class:`Hook` instances added to the *tracer* of the API::
+
+    from pytvdbapi import api, tracing
+
+    class SlowLoads(tracing.Hook):
+        def finish(self, span):
+            if span.name == 'load' and span.duration > 1.0:
+                print(span.root().name, span.attributes['url'], span.duration)
+
+    db = api.TVDB("B43FF87DE395DF56")
+    db.tracer.add_hook(SlowLoads())
+
+No spans are created as long as no hook is added, so the tracing costs
+nothing unless used.
+
+.. note:: Before Python 3.7 the current span is tracked per thread, the spans
+    of coroutines running concurrently in the same thread may then be given
+    the wrong parent.
+"""
+
+import logging
+import threading
+import time
+
+# pylint: disable=F0401
+try:
+    import contextvars
+except ImportError:
+    contextvars = None
+
+__all__ = ['Hook', 'Span', 'Tracer', 'NULL_SPAN', 'bind', 'current', 'span']
+
+logger = logging.getLogger(__name__)
+
+if contextvars is not None:
+    _current = contextvars.ContextVar('pytvdbapi_span', default=None)
+
+    def current():
+        """
+        :return: The innermost open :class:`Span` of the current context, or None
+        """
+        return _current.get()
+
+    def _set_current(value):
+        """Makes *value* the current span"""
+        _current.set(value)
+else:  # pragma: no cover
+    _state = threading.local()
+
+    def current():
+        """
+        :return: The innermost open :class:`Span` of the current thread, or None
+        """
+        return getattr(_state, 'span', None)
+
+    def _set_current(value):
+        """Makes *value* the current span"""
+        _state.span = value
+
+
+class Hook(object):
+    """
+    The interface of the objects receiving the spans, see :func:`Tracer.add_hook`.
+    """
+
+    def start(self, span):  # pylint: disable=W0613,R0201
+        """
+        :param span: The :class:`Span` opened
+        """
+        return None
+
+    def finish(self, span):  # pylint: disable=W0613,R0201
+        """
+        :param span: The :class:`Span` closed
+        """
+        return None
+
+
+class Span(object):
+    """
+    :param tracer: The :class:`Tracer` to report the span to
+    :param name: The name of the span
+    :param parent: The enclosing span or None
+    :param attributes: A dictionary with the attributes of the span
+
+    A timed unit of work, used as a context manager. While open, the span is
+    the current span and the spans opened within it are its children.
+    """
+
+    def __init__(self, tracer, name, parent=None, attributes=None):
+        self.tracer, self.name, self.parent = tracer, name, parent
+        self.attributes = attributes if attributes is not None else dict()
+        self.start = self.end = None
+        self._previous = None
+
+    def __repr__(self):
+        return u"<Span {0} {1}>".format(self.name, self.attributes)
+
+    @property
+    def duration(self):
+        """The time in seconds the span was open, None while still open"""
+        if self.end is None:
+            return None
+        return self.end - self.start
+
+    def set(self, **attributes):
+        """
+        :param attributes: The attributes to set on the span
+        """
+        self.attributes.update(attributes)
+
+    def lookup(self, key, default=None):
+        """
+        :param key: The attribute name
+        :param default: The value to return if no span has the attribute
+        :return: The value of the attribute *key* of the span or of its closest parent having it
+        """
+        span = self
+        while span is not None:
+            if key in span.attributes:
+                return span.attributes[key]
+            span = span.parent
+        return default
+
+    def root(self):
+        """
+        :return: The outermost span enclosing this span
+        """
+        span = self
+        while span.parent is not None:
+            span = span.parent
+        return span
+
+    def __enter__(self):
+        self._previous = current()
+        _set_current(self)
+
+        self.start = time.time()
+        self.tracer._report('start', self)  # pylint: disable=W0212
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.end = time.time()
+        if exc_value is not None:
+            self.attributes['error'] = exc_value
+
+        _set_current(self._previous)
+        self._previous = None
+
+        self.tracer._report('finish', self)  # pylint: disable=W0212
+        return False
+
+
+class _NullSpan(object):
+    """A span doing nothing, used when no hooks are added"""
+
+    attributes = dict()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def set(self, **attributes):
+        """Does nothing"""
+        pass
+
+
+#: The span returned when there is nothing to report the span to
+NULL_SPAN = _NullSpan()
+
+
+class Tracer(object):
+    """
+    Creates the spans and reports them to the added hooks.
+    """
+
+    def __init__(self):
+        self.hooks = ()
+
+    def add_hook(self, hook):
+        """
+        :param hook: A :class:`Hook` instance
+
+        Starts reporting the spans to *hook*. An exception raised by a hook is
+        logged and otherwise ignored.
+        """
+        self.hooks = tuple(self.hooks) + (hook,)
+
+    def remove_hook(self, hook):
+        """
+        :param hook: A :class:`Hook` added with :func:`add_hook`
+        """
+        self.hooks = tuple(h for h in self.hooks if h is not hook)
+
+    def span(self, name, **attributes):
+        """
+        :param name: The name of the span
+        :param attributes: The attributes of the span
+        :return: A new :class:`Span`, a child of the current span, or :data:`NULL_SPAN` if no
+            hooks are added
+        """
+        if not self.hooks:
+            return NULL_SPAN
+        return Span(self, name, current(), attributes)
+
+    def _report(self, event, span):
+        """Calls the *event* method of all hooks with *span*"""
+        for hook in self.hooks:
+            try:
+                getattr(hook, event)(span)
+            except Exception:  # pylint: disable=W0703
+                logger.exception(u"Tracing hook {0} failed".format(hook))
+
+
+def span(name, **attributes):
+    """
+    :param name: The name of the span
+    :param attributes: The attributes of the span
+    :return: A new :class:`Span`, a child of the current span, or :data:`NULL_SPAN` if
+        there is no current span
+
+    Creates a span reported to the same tracer as the current span.
+    """
+    parent = current()
+    if parent is None or not parent.tracer.hooks:
+        return NULL_SPAN
+    return Span(parent.tracer, name, parent, attributes)
+
+
+def bind(func):
+    """
+    :param func: A callable
+    :return: A callable calling *func* with the current span of the caller as the current span
+
+    Used to keep the spans opened by *func* linked to the caller when it is
+    run in another thread.
+    """
+    parent = current()
+    if parent is None:
+        return func
+
+    def _bound(*args, **kwargs):
+        """Calls *func* within the span of the caller"""
+        previous = current()
+        _set_current(parent)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _set_current(previous)
+
+    return _bound
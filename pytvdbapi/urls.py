@@ -26,6 +26,7 @@ URL configuration module. Store all URLs needed to access the backend service
 # URL templates used for loading the data from thetvdb.com
 mirrors = u"http://www.thetvdb.com/api/{api_key}/mirrors.xml"
 time = u"http://www.thetvdb.com/api/Updates.php?type=none"
+updates = u"http://www.thetvdb.com/api/Updates.php?type=all&time={time}"
 search = u"http://www.thetvdb.com/api/GetSeries.php?seriesname={series}&language={language}"
 series = u"{mirror}/api/{api_key}/series/{seriesid}/all/{language}.zip"
 episode = u"{mirror}/api/{api_key}/episodes/{episodeid}/{language}.xml"
@@ -23,13 +23,24 @@
 A module for utility functionality.
 """
 
+import os
+import tempfile
+import threading
 from functools import wraps
-from collections import MutableMapping
+from collections import MutableMapping, deque
 
-from pytvdbapi._compat import make_unicode, int_types
+# pylint: disable=F0401
+try:
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+except ImportError:  # pragma: no cover
+    ThreadPoolExecutor = None
 
+from pytvdbapi import error
+from pytvdbapi._compat import make_unicode, int_types, string_types
 
-__all__ = ['unicode_arguments', 'deprecate_episode_id', 'TransformedDictionary', 'InsensitiveDictionary']
+
+__all__ = ['unicode_arguments', 'deprecate_episode_id', 'concurrent_map', 'SingleFlight', 'InternTable',
+           'TransformedDictionary', 'InsensitiveDictionary', 'write_file']
 
 
 def unicode_arguments(func):
@@ -72,6 +83,211 @@ def deprecate_episode_id(func):
     return __wrapper__
 
 
+def _result(future, return_exceptions):
+    """
+    :return: The result of *future*, or the exception raised if *return_exceptions* is True
+    """
+    try:
+        return future.result()
+    except Exception as _error:  # pylint: disable=W0703
+        if return_exceptions:
+            return _error
+        raise
+
+
+def concurrent_map(func, iterable, max_workers=4, ordered=True, return_exceptions=False):
+    """
+    .. versionadded:: 0.6
+
+    :param func: The function to call for each item
+    :param iterable: The items to call *func* with
+    :param max_workers: The maximum number of worker threads to use
+    :param ordered: If True, the results are yielded in the same order as the items,
+        otherwise they are yielded as soon as they are available.
+    :param return_exceptions: If True, exceptions raised by *func* are yielded in place of
+        the result instead of being raised.
+    :raise: :exc:`pytvdbapi.error.PytvdbapiError` if concurrent.futures is not available
+
+    Calls *func* for each item in *iterable* using a pool of worker threads and
+    yields the results. At most two items per worker are scheduled at any given
+    time, so *iterable* can be arbitrarily large.
+
+    On Python 2.X this requires the *futures* package to be installed.
+    """
+    if ThreadPoolExecutor is None:  # pragma: no cover
+        raise error.PytvdbapiError(u"concurrent.futures is not available, install the futures package")
+    if max_workers < 1:
+        raise error.TVDBValueError(u"max_workers should be at least 1")
+
+    items = iter(iterable)
+    pending = deque()
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def _submit():
+        """Schedules the next item, returns False when there are no more items"""
+        try:
+            item = next(items)
+        except StopIteration:
+            return False
+
+        pending.append(executor.submit(func, item))
+        return True
+
+    try:
+        while len(pending) < 2 * max_workers and _submit():
+            pass
+
+        while pending:
+            if ordered:
+                done = [pending.popleft()]
+            else:
+                done = wait(pending, return_when=FIRST_COMPLETED).done
+                for future in done:
+                    pending.remove(future)
+
+            for future in done:
+                _submit()
+                yield _result(future, return_exceptions)
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def write_file(path, data):
+    """
+    :param path: The file to write
+    :param data: The bytes to write
+
+    Writes *data* to a temporary file that is then moved to *path*, so a reader
+    never sees a partially written file.
+    """
+    directory = os.path.dirname(path)
+    if not os.path.isdir(directory):
+        try:
+            os.makedirs(directory)
+        except OSError:  # Created by another thread or process
+            pass
+
+    handle, temporary = tempfile.mkstemp(dir=directory)
+    with os.fdopen(handle, 'wb') as _file:
+        _file.write(data)
+
+    if os.name == 'nt':  # pragma: no cover
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    os.rename(temporary, path)
+
+
+class _Call(object):
+    """The state of a single call managed by :class:`SingleFlight`"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value, self.error = None, None
+
+
+class SingleFlight(object):
+    """
+    .. versionadded:: 0.6
+
+    Coalesces concurrent calls sharing the same key. The first caller performs
+    the call while the callers arriving before it has finished wait for it and
+    share its result, or the exception it raised.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = dict()
+
+    def do(self, key, func, *args, **kwargs):
+        """
+        :param key: A hashable key identifying the call
+        :param func: The function to call
+        :return: The value returned by *func*, possibly from a call made by another thread
+
+        Calls *func* with the provided arguments unless a call with the same key
+        is already in flight, in which case its result is returned instead.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = func(*args, **kwargs)
+            return call.value
+        except Exception as _error:
+            call.error = _error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class InternTable(object):
+    """
+    .. versionadded:: 0.6
+
+    :param max_size: The maximum number of values kept per type, 0 disables the interning
+    :param max_length: The maximum length of the strings interned
+
+    Maps equal strings and integers to a single shared instance, so values
+    repeated across many records, such as network names, genres and ids, are
+    only kept in memory once. The entries of lists are interned in place.
+
+    The table is emptied when *max_size* values of a type have been added,
+    so the memory used by the table itself stays bounded. Strings longer than
+    *max_length*, such as overviews, rarely repeat and are not interned.
+    """
+
+    def __init__(self, max_size=50000, max_length=100):
+        self.max_size, self.max_length = max_size, max_length
+        self._tables = dict((kind, dict()) for kind in string_types + int_types)
+
+    def __len__(self):
+        return sum(len(table) for table in self._tables.values())
+
+    def intern(self, value):
+        """
+        :param value: A value
+        :return: The shared instance equal to *value*, or *value* itself if not interned
+        """
+        kind = type(value)
+        if kind is list:
+            for index, item in enumerate(value):
+                value[index] = self.intern(item)
+            return value
+
+        table = self._tables.get(kind)
+        if table is None or self.max_size <= 0:
+            return value
+        elif isinstance(value, string_types) and len(value) > self.max_length:
+            return value
+
+        shared = table.setdefault(value, value)
+        if len(table) > self.max_size:
+            table.clear()
+        return shared
+
+    def clear(self):
+        """
+        Removes all values from the table.
+        """
+        for table in self._tables.values():
+            table.clear()
+
+
 class TransformedDictionary(MutableMapping, object):
     """
     An abstract dictionary base class that support transformation
@@ -24,6 +24,7 @@ A helper module for parsing XML data.
 import datetime
 import logging
 import re
+from io import BytesIO
 
 # pylint: disable=E0611
 try:
@@ -38,15 +39,157 @@ except ImportError:
         # Python 2.6
         from xml.parsers.expat import ExpatError as ParseError
 
-from pytvdbapi import error
-from pytvdbapi._compat import make_unicode
+try:
+    from xml.parsers import expat
+except ImportError:  # pragma: no cover
+    expat = None
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
 
-__all__ = ['has_element', 'generate_tree', 'parse_xml']
+from pytvdbapi import error, tracing
+from pytvdbapi._compat import make_unicode, SlottedMutableMapping
+from pytvdbapi.utils import InsensitiveDictionary, InternTable
+
+__all__ = ['has_element', 'generate_tree', 'parse_xml', 'parse_series', 'iterparse_xml', 'SCHEMA',
+           'convert_field', 'RawRecord', 'LazyDictionary', 'Parser', 'EtreeParser', 'LxmlParser',
+           'ExpatParser', 'PARSERS', 'register_parser', 'get_parser', 'parse_data',
+           'INTERN_TABLE', 'intern_records', 'RecordLayout', 'CompactRecord', 'compact_records',
+           'make_record']
 
 # Module level logger object
 logger = logging.getLogger(__name__)
 
 
+_DATE = re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})$")
+_FLOAT = re.compile(r"^\d+\.\d+$")
+_INT = re.compile(r"^\d+$")
+
+
+def _guess(value):
+    """
+    :param value: The stripped text of an element
+    :return: *value* converted to the type it looks like, see :func:`parse_xml`
+    """
+    date = _DATE.match(value)
+    if date is not None:
+        try:
+            return datetime.date(*[int(part) for part in date.groups()])
+        except ValueError:
+            pass
+
+    if '|' in value:  # Split piped values into a list
+        return [s.strip() for s in value.strip("|").split("|")]
+    elif _FLOAT.match(value):
+        return float(value)
+    elif _INT.match(value):
+        return int(value)
+    return value
+
+
+def _typed(convert):
+    """
+    :param convert: A function converting the text of an element
+    :return: A converter applying *convert* to non empty values. Empty values
+        are kept as an empty string and values *convert* fails on are guessed.
+    """
+    def _converter(value):
+        """Converts *value* with the wrapped function"""
+        if not value:
+            return value
+
+        try:
+            return convert(value)
+        except ValueError:
+            return _guess(value)
+    return _converter
+
+
+def _text(value):
+    """:return: *value* unchanged"""
+    return value
+
+
+def _list(value):
+    """:return: The list of the pipe separated values in *value*, empty if *value* is empty"""
+    if not value:
+        return list()
+    return [s.strip() for s in value.strip("|").split("|")]
+
+
+def _parse_date(value):
+    """:return: The :class:`datetime.date` in *value* formatted as yyyy-mm-dd"""
+    date = _DATE.match(value)
+    if date is None:
+        raise ValueError(value)
+    return datetime.date(*[int(part) for part in date.groups()])
+
+
+def _parse_number(value):
+    """:return: *value* as an int, or as a float if it has a decimal point"""
+    return float(value) if '.' in value else int(value)
+
+
+_int, _float, _date, _number = _typed(int), _typed(float), _typed(_parse_date), _typed(_parse_number)
+
+#: The converters of the known fields of each element, the fields not listed
+#: are converted to the type they look like
+SCHEMA = {
+    'Series': {
+        'id': _int, 'seriesid': _int, 'SeriesID': _text, 'IMDB_ID': _text, 'zap2it_id': _text,
+        'SeriesName': _text, 'AliasNames': _list, 'Overview': _text, 'FirstAired': _date,
+        'Actors': _list, 'Genre': _list, 'Airs_DayOfWeek': _text, 'Airs_Time': _text,
+        'ContentRating': _text, 'Language': _text, 'language': _text, 'Network': _text,
+        'NetworkID': _text, 'Rating': _float, 'RatingCount': _int, 'Runtime': _int, 'Status': _text,
+        'added': _text, 'addedBy': _int, 'banner': _text, 'fanart': _text, 'poster': _text,
+        'lastupdated': _int, 'tms_wanted_old': _int},
+    'Episode': {
+        'id': _int, 'seriesid': _int, 'seasonid': _int, 'SeasonNumber': _int, 'EpisodeNumber': _int,
+        'EpisodeName': _text, 'Overview': _text, 'FirstAired': _date, 'Director': _list,
+        'Writer': _list, 'GuestStars': _list, 'IMDB_ID': _text, 'Language': _text, 'Rating': _float,
+        'RatingCount': _int, 'Combined_episodenumber': _number, 'Combined_season': _int,
+        'DVD_episodenumber': _number, 'DVD_season': _int, 'EpImgFlag': _int, 'absolute_number': _int,
+        'airsafter_season': _int, 'airsbefore_episode': _int, 'airsbefore_season': _int,
+        'filename': _text, 'lastupdated': _int, 'thumb_added': _text, 'thumb_height': _int,
+        'thumb_width': _int},
+    'Actor': {
+        'id': _int, 'Image': _text, 'Name': _text, 'Role': _text, 'SortOrder': _int},
+    'Banner': {
+        'id': _int, 'BannerPath': _text, 'BannerType': _text, 'BannerType2': _text, 'Colors': _list,
+        'Language': _text, 'Rating': _float, 'RatingCount': _int, 'Season': _int, 'SeriesName': _text,
+        'ThumbnailPath': _text, 'VignettePath': _text},
+    'Mirror': {
+        'id': _int, 'mirrorpath': _text, 'typemask': _int},
+}
+
+
+#: The table shared by the conversions to intern the tags and the values,
+#: see :class:`pytvdbapi.utils.InternTable`
+INTERN_TABLE = InternTable()
+
+
+def intern_records(records):
+    """
+    .. versionadded:: 0.6
+
+    :param records: A list of dictionaries or :class:`RawRecord` instances
+    :return: *records*, with their keys and values replaced in place by the
+        shared instances from :data:`INTERN_TABLE`
+
+    The parsers intern the data as it is parsed. Records deserialized or
+    parsed in another process are interned with this function instead.
+    """
+    intern = INTERN_TABLE.intern
+    for record in records:
+        if isinstance(record, dict):
+            items = [(intern(key), intern(value)) for key, value in record.items()]
+            record.clear()
+            record.update(items)
+    return records
+
+
 def has_element(etree, element):
     """
     :param etree: the element tree to check
@@ -66,23 +209,423 @@ def generate_tree(xml_data):
 
     Converts the xml data into an element tree
     """
+    with tracing.span('generate_tree') as span:
+        try:
+            tree = eTree.parse(xml_data)
+        except ParseError:
+            raise error.BadData(u"Bad XML data received")
+
+        root = tree.getroot()
+        span.set(element=root.tag, count=len(root))
+        return tree
+
+
+def convert_field(element, tag, value):
+    """
+    .. versionadded:: 0.6
+
+    :param element: The name of the element holding the field
+    :param tag: The name of the field
+    :param value: The stripped text of the field
+    :return: *value* converted as done by :func:`parse_xml`
+    """
+    return INTERN_TABLE.intern(SCHEMA.get(element, _NO_SCHEMA).get(tag, _guess)(value))
+
+
+class RawRecord(dict):
+    """
+    .. versionadded:: 0.6
+
+    :param element: The name of the element the data was parsed from
+
+    A dictionary holding the unconverted text of the fields of an element, as
+    returned by :func:`parse_xml` with *lazy* set to True.
+    """
+
+    def __init__(self, element, *args, **kwargs):
+        super(RawRecord, self).__init__(*args, **kwargs)
+        self.element = element
+
+
+class _LazyLayout(object):
+    """
+    The position and the converter of each field of the raw records parsed
+    from the same element with the same tags, shared by their
+    :class:`LazyDictionary` instances. Use :func:`_lazy_layout` to get one.
+    """
+
+    __slots__ = ('key', 'keys', 'fields')
+
+    #: The shared layouts by *(element, tags, ignore_case)*
+    _layouts = dict()
+
+    def __init__(self, key, keys, fields):
+        self.key, self.keys, self.fields = key, keys, fields
+
+    def __reduce__(self):
+        return _lazy_layout, self.key
+
+
+def _lazy_layout(element, tags, ignore_case):
+    """
+    :return: The shared :class:`_LazyLayout` mapping the transformed keys of *tags* to a
+        tuple *(bit, converter)*, or None if the transformed keys are not unique
+    """
+    key = (element, tags, ignore_case)
     try:
-        return eTree.parse(xml_data)
-    except ParseError:
-        raise error.BadData(u"Bad XML data received")
+        return _LazyLayout._layouts[key]
+    except KeyError:
+        pass
+
+    schema = SCHEMA.get(element, _NO_SCHEMA)
+    keys = tuple(INTERN_TABLE.intern(_transform(tag, ignore_case)) for tag in tags)
+    fields = dict((key, (1 << position, schema.get(tag, _guess)))
+                  for position, (key, tag) in enumerate(zip(keys, tags)))
 
+    layout = _LazyLayout(key, keys, fields) if len(fields) == len(tags) else None
+    return _LazyLayout._layouts.setdefault(key, layout)
 
-def parse_xml(etree, element):
+
+class LazyDictionary(InsensitiveDictionary):
+    """
+    .. versionadded:: 0.6
+
+    :param data: A dictionary or a :class:`RawRecord` with the initial data
+    :param ignore_case: If True, the keys are case insensitive
+
+    An :class:`pytvdbapi.utils.InsensitiveDictionary` converting the values
+    of a :class:`RawRecord` on first access, see :func:`convert_field`. The
+    converted value replaces the text, so each field is converted at most once.
+
+    Besides the values, only a layout shared by the records parsed with the
+    same fields and a bit mask of the fields not yet converted are kept.
+    """
+
+    def __init__(self, data=None, ignore_case=False):
+        self._layout, self._pending = None, 0
+        super(LazyDictionary, self).__init__(ignore_case=ignore_case)
+
+        if data is not None:
+            self.update_record(data)
+
+    def update_record(self, data):
+        """
+        :param data: A dictionary or a :class:`RawRecord`
+
+        Updates the dictionary with *data*, leaving the values of a :class:`RawRecord` unconverted.
+        """
+        element = getattr(data, 'element', None)
+        if element is None:
+            for tag, value in data.items():
+                self[tag] = value
+            return
+
+        layout = _lazy_layout(element, tuple(data), self.ignore_case)
+        if layout is None:  # The keys clash once transformed, convert the values now
+            for tag, value in data.items():
+                self[tag] = convert_field(element, tag, value)
+            return
+
+        if self._pending:  # Only the fields of one raw record can be pending
+            for key in list(self._data):
+                self[key] = self[key]
+
+        self._layout, self._pending = layout, (1 << len(layout.keys)) - 1
+        for key, value in zip(layout.keys, data.values()):
+            self._data[key] = value
+
+    def __getitem__(self, item):
+        key = self.__transform__(item)
+        value = self._data[key]
+
+        if self._pending:
+            field = self._layout.fields.get(key)
+            if field is not None and self._pending & field[0]:
+                self._pending &= ~field[0]
+                value = self._data[key] = INTERN_TABLE.intern(field[1](value))
+        return value
+
+    def __setitem__(self, key, value):
+        super(LazyDictionary, self).__setitem__(key, value)
+        self._done(key)
+
+    def __delitem__(self, key):
+        super(LazyDictionary, self).__delitem__(key)
+        self._done(key)
+
+    def _done(self, key):
+        """Marks the field *key* as converted"""
+        if self._pending:
+            field = self._layout.fields.get(self.__transform__(key))
+            if field is not None:
+                self._pending &= ~field[0]
+
+    def clear(self):
+        """
+        Clear the dictionary content, making its length 0
+        """
+        super(LazyDictionary, self).clear()
+        self._layout, self._pending = None, 0
+
+    def items(self):
+        """
+        :return: A list of all items in the dictionary, converted
+        """
+        return [(key, self[key]) for key in list(self._data)]
+
+    def values(self):
+        """
+        :return: A list of the values in the dictionary, converted
+        """
+        return [self[key] for key in list(self._data)]
+
+
+def _transform(key, ignore_case):
+    """:return: *key* as stored in a record, lower cased if *ignore_case* is True"""
+    if ignore_case:
+        try:
+            return key.lower()
+        except AttributeError:
+            return key
+    return key
+
+
+class RecordLayout(object):
+    """
+    .. versionadded:: 0.6
+
+    :param keys: A tuple of the keys, already transformed
+    :param ignore_case: If True, the keys are case insensitive
+
+    The keys of a :class:`CompactRecord` and their positions in its values.
+    The layouts are shared by all records with the same keys, use
+    :func:`get` rather than creating them directly. Adding a key to a record
+    moves it to the layout returned by :func:`extend`, which is also shared.
+    """
+
+    __slots__ = ('keys', 'index', 'ignore_case', '_children')
+
+    #: The shared layouts by *(keys, ignore_case)*
+    _layouts = dict()
+
+    def __init__(self, keys, ignore_case):
+        self.keys, self.ignore_case = keys, ignore_case
+        self.index = dict((key, position) for position, key in enumerate(keys))
+        self._children = dict()
+
+    @classmethod
+    def get(cls, keys, ignore_case=False):
+        """
+        :param keys: A sequence of the keys, possibly not transformed
+        :param ignore_case: If True, the keys are case insensitive
+        :return: The shared layout or None if the transformed keys are not unique
+        """
+        keys = tuple(keys)
+        try:
+            return cls._layouts[(keys, ignore_case)]
+        except KeyError:
+            pass
+
+        transformed = tuple(INTERN_TABLE.intern(_transform(key, ignore_case)) for key in keys)
+        layout = cls._layouts.get((transformed, ignore_case))
+        if layout is None:
+            layout = cls(transformed, ignore_case)
+            if len(layout.index) != len(transformed):
+                layout = None
+            layout = cls._layouts.setdefault((transformed, ignore_case), layout)
+        return cls._layouts.setdefault((keys, ignore_case), layout)
+
+    def extend(self, key):
+        """
+        :param key: A transformed key not in the layout
+        :return: The shared layout with *key* added last
+        """
+        try:
+            return self._children[key]
+        except KeyError:
+            return self._children.setdefault(key, RecordLayout.get(self.keys + (key,), self.ignore_case))
+
+
+class CompactRecord(SlottedMutableMapping):
+    """
+    .. versionadded:: 0.6
+
+    :param layout: The :class:`RecordLayout` of the record
+    :param values: A list of the values, in the order of the layout keys
+
+    A mapping with the same interface and *ignore_case* behaviour as
+    :class:`LazyDictionary`, storing only a list of the values. The keys
+    are kept in a :class:`RecordLayout` shared with all records having the
+    same keys, so a record of an episode takes about 350 bytes instead of
+    about 930 for a dictionary. Use :func:`compact_records` or :func:`make_record` to create records.
+
+    The values of a :class:`RawRecord` are converted when the record is
+    created, see :func:`convert_field`.
+    """
+
+    __slots__ = ('_layout', '_values')
+
+    def __init__(self, layout, values):
+        self._layout, self._values = layout, values
+
+    @property
+    def ignore_case(self):
+        """True if the keys are case insensitive"""
+        return self._layout.ignore_case
+
+    def __getitem__(self, item):
+        layout = self._layout
+        return self._values[layout.index[_transform(item, layout.ignore_case)]]
+
+    def __setitem__(self, key, value):
+        layout = self._layout
+        key = _transform(key, layout.ignore_case)
+        position = layout.index.get(key)
+        if position is None:
+            self._layout = layout.extend(INTERN_TABLE.intern(key))
+            self._values.append(value)
+        else:
+            self._values[position] = value
+
+    def __delitem__(self, key):
+        position = self._layout.index[_transform(key, self._layout.ignore_case)]
+        keys = self._layout.keys[:position] + self._layout.keys[position + 1:]
+        self._layout = RecordLayout.get(keys, self._layout.ignore_case)
+        del self._values[position]
+
+    def __contains__(self, item):
+        return _transform(item, self._layout.ignore_case) in self._layout.index
+
+    def __len__(self):
+        return len(self._values)
+
+    def __iter__(self):
+        return iter(self._layout.keys)
+
+    def __reduce__(self):
+        return _rebuild_record, (self._layout.keys, self._layout.ignore_case, self._values)
+
+    def keys(self):
+        """
+        :return: A list of the keys in the record
+        """
+        return list(self._layout.keys)
+
+    def items(self):
+        """
+        :return: A list of all items in the record
+        """
+        return list(zip(self._layout.keys, self._values))
+
+    def values(self):
+        """
+        :return: A list of the values in the record
+        """
+        return list(self._values)
+
+    def clear(self):
+        """
+        Clear the record content, making its length 0
+        """
+        self._layout, self._values = RecordLayout.get((), self._layout.ignore_case), list()
+
+    def update_record(self, data):
+        """
+        :param data: A dictionary or a :class:`RawRecord`
+
+        Updates the record with *data*, converting the values of a :class:`RawRecord`.
+        """
+        element = getattr(data, 'element', None)
+        for tag, value in data.items():
+            self[tag] = value if element is None else convert_field(element, tag, value)
+
+
+def _rebuild_record(keys, ignore_case, values):
+    """:return: A :class:`CompactRecord` sharing the layout of the records with the same keys"""
+    return CompactRecord(RecordLayout.get(keys, ignore_case), list(values))
+
+
+def compact_records(rows, ignore_case=False):
+    """
+    .. versionadded:: 0.6
+
+    :param rows: An iterable of dictionaries or :class:`RawRecord` instances, as
+        returned by the parsers
+    :param ignore_case: If True, the keys of the records are case insensitive
+    :return: A list of :class:`CompactRecord` instances holding the data of *rows*
+
+    Builds the records in bulk. The rows parsed from the same response share
+    the same keys, so the layout is looked up once for each distinct set of
+    keys and the values are copied directly into the records.
+    """
+    layouts, records = dict(), list()
+    for row in rows:
+        keys = tuple(row)
+        try:
+            layout = layouts[keys]
+        except KeyError:
+            layout = layouts[keys] = RecordLayout.get(keys, ignore_case)
+        records.append(_compact(row, layout, ignore_case))
+    return records
+
+
+def _compact(row, layout, ignore_case):
+    """
+    :param row: A dictionary or a :class:`RawRecord`
+    :param layout: The :class:`RecordLayout` for the keys of *row*, or None if they clash
+    :return: A :class:`CompactRecord` holding the data of *row*
+    """
+    element = getattr(row, 'element', None)
+    if layout is None:  # The keys clash once transformed, add them one at a time
+        record = CompactRecord(RecordLayout.get((), ignore_case), list())
+        record.update_record(row)
+        return record
+    elif element is None:
+        return CompactRecord(layout, list(row.values()))
+    return CompactRecord(layout, [convert_field(element, tag, value) for tag, value in row.items()])
+
+
+def make_record(data, ignore_case=False, compact=False, lazy=False):
+    """
+    .. versionadded:: 0.6
+
+    :param data: A dictionary, a :class:`RawRecord` or a :class:`CompactRecord`
+    :param ignore_case: If True, the keys of the record are case insensitive
+    :param compact: If True, a :class:`CompactRecord` is returned
+    :param lazy: If True, a :class:`LazyDictionary` is returned even if *data* is already converted,
+        so unconverted data can be added to it later
+    :return: The mapping holding *data* used by the objects created from the parsed data
+
+    A :class:`LazyDictionary` is returned for a :class:`RawRecord`, otherwise a
+    :class:`pytvdbapi.utils.InsensitiveDictionary`, unless *compact* is True. A
+    :class:`CompactRecord` with the requested *ignore_case* is returned unchanged.
+    """
+    if compact:
+        if isinstance(data, CompactRecord) and data.ignore_case == ignore_case:
+            return data
+        return _compact(data, RecordLayout.get(data, ignore_case), ignore_case)
+    elif lazy or isinstance(data, RawRecord):
+        return LazyDictionary(data, ignore_case=ignore_case)
+    return InsensitiveDictionary(data, ignore_case=ignore_case)
+
+
+def parse_xml(etree, element, lazy=False, fields=None):
     """
     :param etree:
     :param element:
+    :param lazy: If True, the values are not converted and :class:`RawRecord`
+        instances are returned, see :class:`LazyDictionary`
+    :param fields: A collection of the tag names to keep, the other tags are
+        skipped without being converted. All tags are kept if None.
     :return: A list of dictionaries containing the data of the format tag:value
 
     Parses the element tree for elements of type *element* and converts the
     data into a dictionary.
 
-    It will attempt to convert the data into native Python
-    types. The following conversions will be applied.
+    The fields known from :data:`SCHEMA` are converted to their declared
+    type. Empty values are kept as an empty string, except for the list
+    fields which are always lists. Other fields are converted to the native
+    Python type they look like, the following conversions will be applied.
 
       * yyyy-mm-dd will be converted into a datetime.date object.
       * Integers will be converted to int
@@ -90,35 +633,355 @@ def parse_xml(etree, element):
       * Lists separated by | will be converted into a list. Eg. |foo|bar|
       will be converted into ['foo', 'bar']. Note that even if there is only
       one element it will be converted into a one element list.
+
+    The tags and the values repeated across records are shared through
+    :data:`INTERN_TABLE`.
+
+    .. versionchanged:: 0.6
+        The known fields are converted using :data:`SCHEMA`. Added the *lazy* and *fields* parameters.
     """
 
+    with tracing.span('parse_xml', element=element) as span:
+        _list = _parse_xml(etree, element, lazy, fields)
+        span.set(count=len(_list))
+        return _list
+
+
+def _parse_xml(etree, element, lazy=False, fields=None):
+    """
+    :return: The list of dictionaries with the data of the *element* elements, see :func:`parse_xml`
+    """
     logger.debug(u"Parsing element tree for {0}".format(element))
 
-    _list = list()
-    for item in etree.findall(element):
-
-        data = dict()
-        for child in list(item):
-            tag, value = child.tag, make_unicode(child.text)
-
-            if value:
-                value = value.strip()
-            else:
-                value = u""
-
-            try:  # Try to format as a datetime object
-                value = datetime.datetime.strptime(value, "%Y-%m-%d").date()
-            except ValueError:
-                if '|' in value:  # Split piped values into a list
-                    value = value.strip("|").split("|")
-                    value = [s.strip() for s in value]
-                else:
-                    if re.match(r"^\d+\.\d+$", value):  # Convert float
-                        value = float(value)
-                    elif re.match(r"^\d+$", value):  # Convert integer
-                        value = int(value)
-
-            data[tag] = value
-        _list.append(data)
+    convert = _raw if lazy else _convert
+    keep = frozenset(fields) if fields is not None else None
+    _list = [convert(item, keep) for item in etree.findall(element)]
     logger.debug(u"Found {0} element(s)".format(len(_list)))
     return _list
+
+
+def _convert(item, keep=None):
+    """
+    :param item: An element
+    :param keep: A set of the tags to convert or None to convert all tags
+    :return: A dictionary with the converted data of the children of *item*, see :func:`parse_xml`
+    """
+    converters, intern = SCHEMA.get(item.tag, _NO_SCHEMA), INTERN_TABLE.intern
+
+    data = dict()
+    for child in item:
+        if keep is not None and child.tag not in keep:
+            continue
+        value = child.text
+        value = make_unicode(value).strip() if value else u""
+        data[intern(child.tag)] = intern(converters.get(child.tag, _guess)(value))
+    return data
+
+
+def _raw(item, keep=None):
+    """
+    :param item: An element
+    :param keep: A set of the tags to keep or None to keep all tags
+    :return: A :class:`RawRecord` with the stripped text of the children of *item*
+    """
+    data, intern = RawRecord(item.tag), INTERN_TABLE.intern
+    for child in item:
+        if keep is not None and child.tag not in keep:
+            continue
+        value = child.text
+        data[intern(child.tag)] = intern(make_unicode(value).strip()) if value else u""
+    return data
+
+
+_NO_SCHEMA = dict()
+
+
+def iterparse_xml(xml_data, elements, lazy=False, fields=None):
+    """
+    .. versionadded:: 0.6
+
+    :param xml_data: A file like object containing the xml data
+    :param elements: A sequence of the element names to convert
+    :param lazy: If True, the values are not converted, see :func:`parse_xml`
+    :param fields: A dictionary mapping element names to the collection of
+        tags to keep, see :func:`parse_xml`. The elements not in *fields* keep all tags.
+    :return: A generator of tuples *(element, data)* with the data of each of
+        the *elements* found directly below the root element, converted as by
+        :func:`parse_xml`, in document order
+    :raise: :class:`pytvdbapi.error.BadData`
+
+    Parses the xml data incrementally, discarding each element once it has
+    been converted, so no more than a single element is held in memory.
+    """
+    return _iterparse(eTree, ParseError, xml_data, elements, lazy, fields)
+
+
+def _projection(fields):
+    """
+    :param fields: A dictionary mapping element names to the collection of tags to keep, or None
+    :return: A dictionary mapping the element names to a frozenset of the tags to keep
+    """
+    if not fields:
+        return dict()
+    return dict((element, frozenset(tags)) for element, tags in fields.items() if tags is not None)
+
+
+def _iterparse(module, parse_error, xml_data, elements, lazy, fields=None):
+    """
+    :param module: The ElementTree compatible module to parse the data with
+    :param parse_error: The exception raised by *module* for bad data
+    :return: The generator described in :func:`iterparse_xml`
+    """
+    elements, depth, root = frozenset(elements), 0, None
+    convert, keep = _raw if lazy else _convert, _projection(fields)
+
+    try:
+        for event, item in module.iterparse(xml_data, events=('start', 'end')):
+            if event == 'start':
+                if root is None:
+                    root = item
+                depth += 1
+                continue
+
+            depth -= 1
+            if depth == 1:
+                if item.tag in elements:
+                    yield item.tag, convert(item, keep.get(item.tag))
+                root.clear()
+    except parse_error:
+        raise error.BadData(u"Bad XML data received")
+
+
+class Parser(object):
+    """
+    .. versionadded:: 0.6
+
+    The base class of the parser backends, turning the XML responses into the
+    dictionaries described in :func:`parse_xml`. Subclasses implement
+    :func:`iterparse` and are made available by :func:`register_parser`.
+    """
+
+    #: The name the backend is registered as
+    name = None
+
+    @classmethod
+    def available(cls):
+        """
+        :return: True if the backend can be used on this host
+        """
+        return True
+
+    def iterparse(self, xml_data, elements, lazy=False, fields=None):
+        """
+        :param xml_data: A file like object containing the xml data
+        :param elements: A sequence of the element names to convert
+        :param lazy: If True, the values are not converted, see :func:`parse_xml`
+        :param fields: The tags to keep for each element, see :func:`iterparse_xml`
+        :return: An iterator of tuples *(element, data)*, see :func:`iterparse_xml`
+        :raise: :class:`pytvdbapi.error.BadData`
+        """
+        raise NotImplementedError()
+
+    def parse(self, xml_data, elements, lazy=False, fields=None):
+        """
+        :param xml_data: A file like object containing the xml data
+        :param elements: A sequence of the element names to convert
+        :param lazy: If True, the values are not converted, see :func:`parse_xml`
+        :param fields: The tags to keep for each element, see :func:`iterparse_xml`
+        :return: A dictionary mapping each of *elements* to the list of the
+            converted elements found directly below the root element
+        :raise: :class:`pytvdbapi.error.BadData`
+        """
+        with tracing.span('parse_xml', element=elements[0]) as span:
+            result = dict((element, list()) for element in elements)
+            for element, data in self.iterparse(xml_data, elements, lazy, fields):
+                result[element].append(data)
+
+            span.set(count=sum(len(found) for found in result.values()))
+            return result
+
+
+class EtreeParser(Parser):
+    """
+    .. versionadded:: 0.6
+
+    The backend using :mod:`xml.etree.cElementTree`, or
+    :mod:`xml.etree.ElementTree` if not available, see :func:`iterparse_xml`.
+    """
+
+    name = u"etree"
+
+    def iterparse(self, xml_data, elements, lazy=False, fields=None):
+        return iterparse_xml(xml_data, elements, lazy, fields)
+
+
+class LxmlParser(Parser):
+    """
+    .. versionadded:: 0.6
+
+    The backend using lxml_, available if it is installed.
+
+    .. _lxml: http://lxml.de
+    """
+
+    name = u"lxml"
+
+    @classmethod
+    def available(cls):
+        return lxml_etree is not None
+
+    def iterparse(self, xml_data, elements, lazy=False, fields=None):
+        return _iterparse(lxml_etree, lxml_etree.XMLSyntaxError, xml_data, elements, lazy, fields)
+
+
+class ExpatParser(Parser):
+    """
+    .. versionadded:: 0.6
+
+    :param chunk_size: The number of bytes fed to the parser at a time
+
+    The backend building the dictionaries directly from the expat parser
+    events, without creating any intermediate element objects. It is slower
+    than the C implementation of ElementTree, so it is only used when requested.
+    """
+
+    name = u"expat"
+
+    def __init__(self, chunk_size=64 * 1024):
+        self.chunk_size = chunk_size
+
+    @classmethod
+    def available(cls):
+        return expat is not None
+
+    def iterparse(self, xml_data, elements, lazy=False, fields=None):
+        elements, done, projection = frozenset(elements), list(), _projection(fields)
+        intern = INTERN_TABLE.intern
+        state = {'depth': 0, 'record': None, 'converters': _NO_SCHEMA, 'keep': None, 'tag': None,
+                 'text': list()}
+
+        def _start(name, attributes):  # pylint: disable=W0613
+            """Starts a record at depth 2 and a field at depth 3"""
+            state['depth'] += 1
+            if state['depth'] == 2 and name in elements:
+                state['record'] = RawRecord(name) if lazy else dict()
+                state['converters'] = SCHEMA.get(name, _NO_SCHEMA)
+                state['keep'] = projection.get(name)
+                state['element'] = name
+            elif state['depth'] == 3 and state['record'] is not None:
+                if state['keep'] is None or name in state['keep']:  # The text of other tags is not collected
+                    state['tag'], state['text'] = name, list()
+
+        def _text(data):
+            """Collects the text of the current field"""
+            if state['tag'] is not None and state['depth'] == 3:
+                state['text'].append(data)
+
+        def _end(name):
+            """Completes the current field or record"""
+            if state['depth'] == 3 and state['tag'] is not None:
+                tag, value = intern(state['tag']), make_unicode(u"".join(state['text'])).strip()
+                state['record'][tag] = intern(value if lazy else state['converters'].get(tag, _guess)(value))
+                state['tag'] = None
+            elif state['depth'] == 2 and state['record'] is not None:
+                done.append((state['element'], state['record']))
+                state['record'] = None
+            state['depth'] -= 1
+
+        parser = expat.ParserCreate()
+        parser.buffer_text = True
+        parser.StartElementHandler, parser.EndElementHandler = _start, _end
+        parser.CharacterDataHandler = _text
+
+        try:
+            while True:
+                chunk = xml_data.read(self.chunk_size)
+                parser.Parse(chunk, not chunk)
+
+                for item in done:
+                    yield item
+                del done[:]
+
+                if not chunk:
+                    break
+        except expat.ExpatError:
+            raise error.BadData(u"Bad XML data received")
+
+
+#: The registered parser backends by name, in order of preference
+PARSERS = list()
+
+
+def register_parser(parser, preferred=False):
+    """
+    .. versionadded:: 0.6
+
+    :param parser: A :class:`Parser` subclass
+    :param preferred: If True, the backend is preferred over the ones already registered
+
+    Makes *parser* available to :func:`get_parser` by its name.
+    """
+    PARSERS[:] = [p for p in PARSERS if p.name != parser.name]
+    if preferred:
+        PARSERS.insert(0, parser)
+    else:
+        PARSERS.append(parser)
+
+
+for _parser in (LxmlParser, EtreeParser, ExpatParser):
+    register_parser(_parser)
+
+
+def get_parser(parser=None):
+    """
+    .. versionadded:: 0.6
+
+    :param parser: The name of a registered backend, a :class:`Parser`
+        instance or None to use the preferred backend available
+    :return: A :class:`Parser` instance
+    :raise: :class:`pytvdbapi.error.TVDBValueError`
+
+    The backends are preferred in the order *lxml*, *etree* and *expat*.
+    """
+    if isinstance(parser, Parser):
+        return parser
+
+    for candidate in PARSERS:
+        if parser in (None, u"auto") and candidate.available():
+            return candidate()
+        elif candidate.name == parser:
+            if not candidate.available():
+                raise error.TVDBValueError(u"The {0} parser is not available".format(parser))
+            return candidate()
+
+    raise error.TVDBValueError(u"Unknown parser {0}".format(parser))
+
+
+def parse_series(etree, lazy=False):
+    """
+    .. versionadded:: 0.6
+
+    :param etree: An element tree holding the full series data
+    :param lazy: If True, the values are not converted, see :func:`parse_xml`
+    :return: A dictionary mapping *Series* and *Episode* to the lists of
+        dictionaries returned by :func:`parse_xml` for those elements
+    """
+    return dict((element, parse_xml(etree, element, lazy)) for element in ('Series', 'Episode'))
+
+
+def parse_data(data, elements, lazy=False, parser=None, fields=None):
+    """
+    .. versionadded:: 0.6
+
+    :param data: The xml data as bytes
+    :param elements: A sequence of the element names to convert
+    :param lazy: If True, the values are not converted, see :func:`parse_xml`
+    :param parser: The parser backend to use, see :func:`get_parser`
+    :param fields: The tags to keep for each element, see :func:`iterparse_xml`
+    :return: The parsed elements, see :func:`Parser.parse`
+    :raise: :class:`pytvdbapi.error.BadData`
+
+    Parses *data* with the backend *parser*. Both the arguments and the result
+    can be pickled, so it can be used with a process pool.
+    """
+    return get_parser(parser).parse(BytesIO(data), elements, lazy, fields)
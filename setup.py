@@ -27,6 +27,8 @@ except ImportError:
 
 import sys
 
+from setuptools.command.build_py import build_py
+
 from pytvdbapi.__init__ import __NAME__, version
 
 # Make sure the user has an acceptable Python version
@@ -34,6 +36,15 @@ if sys.version_info < (2, 6):
     raise SystemExit("Your Python is too old. Only Python >= 2.6 is supported.")
 
 
+class BuildPy(build_py):
+    """Leaves out the implementation of pytvdbapi.aio, using Python 3.5 syntax, on older Pythons"""
+    def find_package_modules(self, package, package_dir):
+        modules = build_py.find_package_modules(self, package, package_dir)
+        if sys.version_info < (3, 5):
+            modules = [m for m in modules if (m[0], m[1]) != ('pytvdbapi', '_aio')]
+        return modules
+
+
 def get_description():
     try:
         return open("README.rst").read() + '\n' + open("CHANGES.txt").read()
@@ -52,10 +63,12 @@ setup(
     keywords="TVDB thetvdb.com API tv episodes",
     license="LGPLv3",
     packages=find_packages(),
+    cmdclass={'build_py': BuildPy},
     platforms=["any"],
     test_suite='pytvdbapi.tests',
     exclude_package_data={'': ['./MANIFEST.in']},
-    install_requires=['httplib2'],
+    install_requires=['httplib2', 'futures; python_version<"3"',
+                      'argparse; python_version<"2.7"'],
     classifiers=[f.strip() for f in """
     Development Status :: 4 - Beta
     Intended Audience :: Developers
@@ -67,6 +80,7 @@ setup(
     Programming Language :: Python :: 3
     Programming Language :: Python :: 3.3
     Programming Language :: Python :: 3.4
+    Programming Language :: Python :: 3.5
     Topic :: Software Development :: Libraries :: Python Modules
     Topic :: Utilities""".splitlines() if f.strip()],
 )